@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark do motor de disponibilidade.
+
+Mede a latência de uma consulta de unidades livres em função do tamanho do
+histórico de reservas do item. A maior parte do histórico está no passado,
+como acontece com itens alugados há anos.
+
+Uso: python benchmarks/availability_benchmark.py [--checks 2000]
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta
+
+import common  # noqa: F401  (configura sys.path)
+from common import summarize, timed, print_table
+
+from src.services.availability import ItemIntervalIndex
+
+HISTORY_SIZES = [100, 1_000, 10_000, 100_000]
+
+
+def build_history(size, now, rng):
+    """Gera reservas de 1 a 72h distribuídas nos últimos anos e próximos meses."""
+    intervals = []
+    span_hours = max(size * 6, 24 * 180)
+    for reservation_id in range(1, size + 1):
+        offset = rng.randint(-span_hours, 24 * 90)
+        start = now + timedelta(hours=offset)
+        end = start + timedelta(hours=rng.randint(1, 72))
+        intervals.append((reservation_id, start, end, rng.randint(1, 2)))
+    return intervals
+
+
+def run(checks, seed):
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 1)
+    rows = []
+
+    for size in HISTORY_SIZES:
+        history = build_history(size, now, rng)
+        index, build_seconds = timed(ItemIntervalIndex, history)
+
+        samples = []
+        for _ in range(checks):
+            start = now + timedelta(hours=rng.randint(0, 24 * 60))
+            end = start + timedelta(hours=rng.randint(1, 96))
+            _, elapsed = timed(index.booked_units, start, end)
+            samples.append(elapsed)
+
+        _, insert_seconds = timed(index.add, size + 1, now, now + timedelta(hours=4), 1)
+        stats = summarize(samples)
+        rows.append([
+            f"{size:,}",
+            f"{build_seconds * 1000:.1f}",
+            f"{insert_seconds * 1000:.4f}",
+            stats['mean_ms'],
+            stats['p50_ms'],
+            stats['p99_ms'],
+        ])
+
+    print("🚀 Availability check latency vs. reservation history size")
+    print_table(
+        ["history", "build_ms", "insert_ms", "check_mean_ms", "check_p50_ms", "check_p99_ms"],
+        rows
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--checks', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    run(args.checks, args.seed)
+
+
+if __name__ == "__main__":
+    main()
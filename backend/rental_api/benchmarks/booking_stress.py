@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Teste de estresse do caminho de reserva concorrente.
+
+Fase 1: N threads disputam o mesmo item (capacidade K) no mesmo período;
+        falha se mais de K reservas forem aceitas (overbooking).
+Fase 2: N threads reservam itens diferentes; mede reservas/s para mostrar
+        que o bloqueio é por item e não por tabela.
+
+Uso:
+    python benchmarks/booking_stress.py [--threads 32] [--capacity 5]
+    DATABASE_URL=postgresql://... python benchmarks/booking_stress.py --database-url $DATABASE_URL
+"""
+
+import argparse
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+from common import create_benchmark_app, register_tenant
+
+
+def create_fixture(client, headers, items, capacity):
+    item_ids = []
+    for number in range(items):
+        response = client.post('/api/rental/items', headers=headers, json={
+            'name': f'Stress Item {number}',
+            'daily_price': 50.00,
+            'total_quantity': capacity,
+        })
+        assert response.status_code == 201, response.get_data(as_text=True)
+        item_ids.append(response.get_json()['item']['id'])
+
+    response = client.post('/api/rental/customers', headers=headers, json={
+        'first_name': 'Stress', 'last_name': 'Customer', 'email': 'stress@example.com'
+    })
+    assert response.status_code == 201, response.get_data(as_text=True)
+    return item_ids, response.get_json()['customer']['id']
+
+
+def fire(app, headers, jobs, threads):
+    """Executa jobs (item_id, customer_id, start, end) em paralelo; retorna status e duração."""
+    statuses = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+    chunks = [jobs[i::threads] for i in range(threads)]
+
+    def worker(chunk):
+        client = app.test_client()
+        barrier.wait()
+        for item_id, customer_id, start, end in chunk:
+            response = client.post('/api/rental/reservations', headers=headers, json={
+                'item_id': item_id,
+                'customer_id': customer_id,
+                'start_date': start.isoformat(),
+                'end_date': end.isoformat(),
+                'quantity': 1,
+            })
+            with lock:
+                statuses.append(response.status_code)
+
+    workers = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return statuses, time.perf_counter() - started
+
+
+def count_booked(app, item_id, start, end):
+    from src.services import booking
+    with app.app_context():
+        return booking.booked_units(item_id, start, end)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--capacity', type=int, default=5)
+    parser.add_argument('--bookings-per-item', type=int, default=10)
+    parser.add_argument('--database-url')
+    args = parser.parse_args()
+
+    app = create_benchmark_app(args.database_url)
+    client = app.test_client()
+    headers = register_tenant(client, f'stress{int(time.time())}')
+    item_ids, customer_id = create_fixture(client, headers, args.threads + 1, args.capacity)
+    window_start = datetime(2030, 1, 1, 9)
+    window_end = window_start + timedelta(days=2)
+
+    print("🚀 Booking stress harness")
+    print(f"   database: {app.config['SQLALCHEMY_DATABASE_URI'].split('@')[-1]}")
+
+    # Fase 1: todos no mesmo item e período
+    contested = item_ids[0]
+    jobs = [(contested, customer_id, window_start, window_end)] * args.threads
+    statuses, elapsed = fire(app, headers, jobs, args.threads)
+    accepted = statuses.count(201)
+    rejected = statuses.count(400)
+    booked = count_booked(app, contested, window_start, window_end)
+    print(f"\n📌 Same item: {args.threads} parallel bookings, capacity {args.capacity}")
+    print(f"   accepted={accepted} rejected={rejected} other={len(statuses) - accepted - rejected}")
+    print(f"   booked units in DB={booked} ({len(statuses) / elapsed:.1f} bookings/s)")
+    oversold = booked > args.capacity or accepted > args.capacity
+
+    # Fase 2: cada thread em um item diferente, períodos sem sobreposição
+    jobs = []
+    for thread_number, item_id in enumerate(item_ids[1:]):
+        for slot in range(args.bookings_per_item):
+            start = window_start + timedelta(days=3 * slot)
+            jobs.append((item_id, customer_id, start, start + timedelta(days=1)))
+    jobs.sort(key=lambda job: (job[2], job[0]))
+    statuses, elapsed = fire(app, headers, jobs, args.threads)
+    print(f"\n📌 Distinct items: {len(jobs)} bookings over {args.threads} items")
+    print(f"   accepted={statuses.count(201)} of {len(jobs)} ({len(jobs) / elapsed:.1f} bookings/s)")
+
+    if oversold:
+        print("\n❌ Oversell detected")
+        sys.exit(1)
+    print("\n✅ Zero oversells")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Utilitários compartilhados pelos benchmarks do Rental SaaS.
+"""
+
+import os
+import sys
+import time
+
+# Permite importar o pacote src a partir de backend/rental_api
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def percentile(samples, pct):
+    """Percentil por interpolação linear (samples não precisa estar ordenado)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples):
+    """Resumo (em ms) de uma lista de latências em segundos."""
+    ms = [s * 1000 for s in samples]
+    return {
+        'count': len(ms),
+        'mean_ms': round(sum(ms) / len(ms), 4) if ms else 0.0,
+        'p50_ms': round(percentile(ms, 50), 4),
+        'p95_ms': round(percentile(ms, 95), 4),
+        'p99_ms': round(percentile(ms, 99), 4),
+    }
+
+
+def timed(fn, *args, **kwargs):
+    """Executa fn e retorna (resultado, segundos decorridos)."""
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def print_table(headers, rows):
+    """Imprime uma tabela simples alinhada à esquerda."""
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    line = "  ".join(str(h).ljust(w) for h, w in zip(headers, widths))
+    print(line)
+    print("-" * len(line))
+    for row in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
+
+
+def create_benchmark_app(database_url=None):
+    """Cria a aplicação apontando para um banco próprio do benchmark.
+
+    Sem database_url usa um arquivo SQLite temporário (bancos :memory: não são
+    compartilhados entre threads). Precisa ser chamado antes de qualquer
+    import de src.config, que lê DATABASE_URL na importação.
+    """
+    if not database_url:
+        import tempfile
+        handle, path = tempfile.mkstemp(prefix='rental_bench_', suffix='.db')
+        os.close(handle)
+        database_url = f"sqlite:///{path}"
+    os.environ['DATABASE_URL'] = database_url
+    # Os benchmarks medem a capacidade do servidor, não o limite por tenant
+    os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+    # Banco novo a cada execução: o schema é criado no boot, sem migrações
+    os.environ.setdefault('SCHEMA_AUTO_CREATE', 'true')
+
+    from src.main import create_app
+    return create_app('production')
+
+
+def register_tenant(client, subdomain, password='BenchPassword123!'):
+    """Registra um tenant com usuário admin e retorna os headers autenticados."""
+    response = client.post('/api/auth/register', json={
+        'username': f'admin_{subdomain}',
+        'email': f'admin@{subdomain}.example.com',
+        'password': password,
+        'tenant_name': f'Tenant {subdomain}',
+        'subdomain': subdomain,
+    })
+    assert response.status_code == 201, response.get_data(as_text=True)
+    return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
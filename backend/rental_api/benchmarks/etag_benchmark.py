@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark de GET condicional (ETag / If-None-Match).
+
+Reproduz a navegação do SPA (dashboard, itens, categorias, tenant, calendário)
+--navigations vezes, com uma escrita a cada --write-every navegações, e mede
+bytes trafegados (cabeçalhos + corpo) e CPU do servidor (thread_time entre
+before_request e after_request) em quatro modos:
+
+- sem validadores: o cliente sempre baixa o corpo inteiro;
+- ETag do corpo: cache de respostas desligado, ETag calculado sobre o corpo;
+- geração (cache local): ETag da geração do tenant, 304 sem executar a rota;
+- cache sem validadores: só o cache de respostas, para comparação.
+
+Uso: python benchmarks/etag_benchmark.py [--navigations 200] [--write-every 20]
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from flask import g
+
+from common import create_benchmark_app, register_tenant, print_table
+
+TRACE = [
+    "/api/rental/dashboard",
+    "/api/rental/items?page=1&per_page=20",
+    "/api/rental/categories",
+    "/api/rental/items?page=2&per_page=20",
+    "/api/tenants/",
+    "/api/rental/calendar?start_date=2030-01-01T00:00:00&end_date=2030-02-01T00:00:00",
+    "/api/rental/dashboard",
+]
+
+MODES = [
+    # (rótulo, RESPONSE_CACHE_BACKEND, envia If-None-Match)
+    ("no validators", '', False),
+    ("body ETag", '', True),
+    ("generation ETag", 'local', True),
+    ("cache, no validators", 'local', False),
+]
+
+
+def seed(app, tenant_id):
+    from src.models.user import db
+    from src.models.rental import Category, RentalItem, Customer, Reservation
+
+    with app.app_context():
+        categories = [Category(tenant_id=tenant_id, name=f"Categoria {n}") for n in range(10)]
+        db.session.add_all(categories)
+        db.session.flush()
+        items = [RentalItem(tenant_id=tenant_id, category_id=categories[n % 10].id, name=f"Item {n}",
+                            description="Benchmark item " * 8, daily_price=50, total_quantity=10)
+                 for n in range(200)]
+        customers = [Customer(tenant_id=tenant_id, first_name="Customer", last_name=str(n),
+                              email=f"customer{n}@example.com") for n in range(100)]
+        db.session.add_all(items + customers)
+        db.session.flush()
+        start = datetime(2030, 1, 1)
+        for n in range(300):
+            db.session.add(Reservation(
+                tenant_id=tenant_id, item_id=items[n % len(items)].id,
+                customer_id=customers[n % len(customers)].id, reservation_code=f"RES-E{n:06d}",
+                start_date=start + timedelta(hours=2 * n), end_date=start + timedelta(hours=2 * n + 24),
+                unit_price=50, total_price=50, final_amount=50
+            ))
+        db.session.commit()
+
+
+def wire_bytes(response):
+    headers = sum(len(f"{name}: {value}\r\n") for name, value in response.headers.items())
+    return headers + len(response.get_data())
+
+
+def replay(client, headers, navigations, write_every, conditional):
+    validators = {}
+    totals = {'requests': 0, 'not_modified': 0, 'bytes': 0}
+    for navigation in range(navigations):
+        if write_every and navigation and navigation % write_every == 0:
+            client.post('/api/rental/customers', json={
+                'first_name': 'Nav', 'last_name': str(navigation), 'email': f"nav{navigation}@example.com"
+            }, headers=headers)
+        for url in TRACE:
+            request_headers = dict(headers)
+            if conditional and url in validators:
+                request_headers['If-None-Match'] = validators[url]
+            response = client.get(url, headers=request_headers)
+            assert response.status_code in (200, 304), response.get_data(as_text=True)
+            if response.headers.get('ETag'):
+                validators[url] = response.headers['ETag']
+            totals['requests'] += 1
+            totals['not_modified'] += response.status_code == 304
+            totals['bytes'] += wire_bytes(response)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--navigations', type=int, default=200)
+    parser.add_argument('--write-every', type=int, default=20)
+    parser.add_argument('--database-url')
+    args = parser.parse_args()
+
+    app = create_benchmark_app(args.database_url)
+    server_cpu = [0.0]
+
+    @app.before_request
+    def start_cpu():
+        g.cpu_started = time.thread_time()
+
+    @app.after_request
+    def stop_cpu(response):
+        server_cpu[0] += time.thread_time() - g.cpu_started
+        return response
+
+    client = app.test_client()
+    headers = register_tenant(client, 'etag')
+    with app.app_context():
+        from src.models.tenant import Tenant
+        tenant_id = Tenant.query.filter_by(subdomain='etag').first().id
+    seed(app, tenant_id)
+
+    from src.services import response_cache
+
+    rows = []
+    baseline = None
+    for label, backend, conditional in MODES:
+        app.config['RESPONSE_CACHE_BACKEND'] = backend
+        response_cache.init_app(app)
+        server_cpu[0] = 0.0
+        totals = replay(client, headers, args.navigations, args.write_every, conditional)
+        baseline = baseline or (totals['bytes'], server_cpu[0])
+        rows.append([
+            label, totals['requests'], totals['not_modified'],
+            f"{totals['bytes'] / 1024:,.0f}", f"{100 * totals['bytes'] / baseline[0]:.1f}%",
+            f"{server_cpu[0] * 1000:,.0f}", f"{100 * server_cpu[0] / baseline[1]:.1f}%"
+        ])
+
+    print(f"🧭 {args.navigations} navigations x {len(TRACE)} GETs, one write every {args.write_every}")
+    print_table(["mode", "requests", "304s", "KiB", "bytes vs base", "server_cpu_ms", "cpu vs base"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Teste de carga com as jornadas do test_system.py.
+
+Cada usuário virtual (uma thread) registra o próprio tenant e roda em laço,
+por --duration segundos, jornadas sorteadas por peso entre os cenários do
+RentalSaaSTester (dashboard, cadastro de item, de cliente, reserva e
+configurações do tenant). A jornada de reserva é a do VirtualUser: sorteia
+item e cliente do tenant e usa um período novo a cada reserva, para que as
+reservas sejam criadas (201) em vez de esbarrar no estoque do mesmo item nas
+mesmas datas (400). Por padrão roda contra a aplicação em processo
+(SQLite temporário, ou --database-url para um Postgres local); com
+--base-url roda contra um servidor já no ar.
+
+Reporta vazão e p50/p95/p99 por endpoint e grava tudo em JSON (--output).
+Com --baseline compara com um JSON anterior e termina com código 1 se a
+vazão cair ou o p95 de algum endpoint subir mais que --tolerance.
+
+Uso:
+    python benchmarks/load_test.py [--users 8] [--duration 30] [--output load.json]
+    python benchmarks/load_test.py --baseline load.json --tolerance 0.2
+    python benchmarks/load_test.py --base-url http://localhost:5000/api
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from common import create_benchmark_app, summarize, print_table
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from test_system import RentalSaaSTester  # noqa: E402
+
+# (jornada, peso, cenários do VirtualUser/RentalSaaSTester em sequência)
+JOURNEYS = [
+    ('dashboard', 5, ['test_dashboard_data']),
+    ('add_item', 2, ['test_item_management']),
+    ('add_customer', 2, ['test_customer_management']),
+    ('book', 2, ['book_reservation']),
+    ('tenant_settings', 1, ['test_tenant_settings']),
+]
+
+_IDS = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_name(method, path):
+    """'GET /rental/items/42?x=1' -> 'GET /rental/items/<id>'."""
+    path = path.split('?', 1)[0]
+    return f"{method} {_IDS.sub('/<id>', path)}"
+
+
+class Recorder:
+    """Latências e status por endpoint, de todas as threads."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.lock = threading.Lock()
+
+    def record(self, endpoint, status, elapsed):
+        with self.lock:
+            self.latencies[endpoint].append(elapsed)
+            self.statuses[endpoint][status] += 1
+
+
+class _Response:
+    """Resposta do test client do Flask com a interface usada do requests."""
+
+    def __init__(self, response):
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.text = response.get_data(as_text=True)
+        self._response = response
+
+    def json(self):
+        return self._response.get_json()
+
+
+class TimedSession:
+    """Substitui o requests.Session do RentalSaaSTester, medindo cada chamada.
+
+    Com client (test client do Flask) as requisições ficam no processo; sem
+    ele vão por HTTP ao servidor em base_url.
+    """
+
+    def __init__(self, base_url, client=None):
+        self.base_url = base_url
+        self.client = client
+        self.headers = {}
+        self.recorder = None
+        if client is None:
+            import requests
+            self._http = requests.Session()
+
+    def request(self, method, url, json=None, **kwargs):
+        path = url[len(self.base_url):] if url.startswith(self.base_url) else url
+        started = time.perf_counter()
+        if self.client is not None:
+            response = _Response(self.client.open(url, method=method, json=json, headers=self.headers))
+        else:
+            response = self._http.request(method, url, json=json, headers=self.headers, timeout=60)
+        elapsed = time.perf_counter() - started
+        if self.recorder is not None:
+            self.recorder.record(endpoint_name(method, path), response.status_code, elapsed)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+
+class VirtualUser(RentalSaaSTester):
+    """RentalSaaSTester com tenant próprio e resultados guardados sem imprimir."""
+
+    def __init__(self, number, base_url, client=None):
+        super().__init__(base_url)
+        self.number = number
+        self.session = TimedSession(base_url, client)
+        self.bookings = 0
+
+    def log_test(self, test_name, success, message=""):
+        self.test_results.append({"test": test_name, "success": success, "message": message})
+
+    def setup(self):
+        subdomain = f"load{self.number}x{random.randrange(10 ** 6)}"
+        response = self.session.post(f"{self.base_url}/auth/register", json={
+            "username": f"admin_{subdomain}",
+            "email": f"admin@{subdomain}.example.com",
+            "password": "TestPassword123!",
+            "tenant_name": f"Load {subdomain}",
+            "subdomain": subdomain,
+        })
+        assert response.status_code == 201, response.text
+        self.session.headers['Authorization'] = f"Bearer {response.json()['access_token']}"
+        # Dados mínimos para as jornadas: categoria, item e cliente
+        for scenario in ('test_category_management', 'test_item_management', 'test_customer_management'):
+            assert getattr(self, scenario)(), self.test_results[-1]
+
+    def book_reservation(self):
+        """Reserva de item e cliente sorteados, num período que nenhuma reserva anterior usou."""
+        items = self.session.get(f"{self.base_url}/rental/items")
+        customers = self.session.get(f"{self.base_url}/rental/customers")
+        if items.status_code != 200 or customers.status_code != 200:
+            self.log_test("Reservation", False, "Could not get items or customers")
+            return False
+        items, customers = items.json().get('items', []), customers.json().get('customers', [])
+        if not items or not customers:
+            self.log_test("Reservation", False, "No items or customers available")
+            return False
+
+        # Períodos de 2 dias, um depois do outro: nunca disputam o estoque
+        start_date = datetime.now() + timedelta(days=1 + 3 * self.bookings)
+        self.bookings += 1
+        response = self.session.post(f"{self.base_url}/rental/reservations", json={
+            "item_id": random.choice(items)['id'],
+            "customer_id": random.choice(customers)['id'],
+            "start_date": start_date.isoformat(),
+            "end_date": (start_date + timedelta(days=2)).isoformat(),
+            "quantity": 1,
+            "notes": f"Load test {self.number}/{self.bookings}",
+        })
+        if response.status_code != 201:
+            self.log_test("Reservation", False, f"HTTP {response.status_code}: {response.text}")
+            return False
+        response = self.session.get(f"{self.base_url}/rental/reservations")
+        self.log_test("Reservation", response.status_code == 200, f"HTTP {response.status_code}")
+        return response.status_code == 200
+
+    def run(self, recorder, deadline, outcomes, lock):
+        self.session.recorder = recorder
+        names = [name for name, _, _ in JOURNEYS]
+        weights = [weight for _, weight, _ in JOURNEYS]
+        scenarios = {name: steps for name, _, steps in JOURNEYS}
+        while time.perf_counter() < deadline:
+            journey = random.choices(names, weights)[0]
+            ok = all(getattr(self, step)() for step in scenarios[journey])
+            with lock:
+                outcomes[journey][ok] += 1
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              timeout=5).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_load(args):
+    if args.base_url:
+        base_url, app, target = args.base_url.rstrip('/'), None, args.base_url
+    else:
+        app = create_benchmark_app(args.database_url)
+        base_url, target = '/api', os.environ['DATABASE_URL'].split('://', 1)[0]
+
+    users = [VirtualUser(number, base_url, app.test_client() if app else None) for number in range(args.users)]
+    for user in users:
+        user.setup()
+
+    recorder = Recorder()
+    outcomes = defaultdict(lambda: {True: 0, False: 0})
+    lock = threading.Lock()
+    started = time.perf_counter()
+    deadline = started + args.duration
+    threads = [threading.Thread(target=user.run, args=(recorder, deadline, outcomes, lock)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for endpoint, samples in sorted(recorder.latencies.items()):
+        stats = summarize(samples)
+        statuses = recorder.statuses[endpoint]
+        endpoints[endpoint] = {
+            'requests': len(samples),
+            'rps': round(len(samples) / elapsed, 2),
+            'errors': sum(count for status, count in statuses.items() if status >= 500),
+            'statuses': {str(status): count for status, count in sorted(statuses.items())},
+            **{key: stats[key] for key in ('mean_ms', 'p50_ms', 'p95_ms', 'p99_ms')},
+        }
+    total = sum(len(samples) for samples in recorder.latencies.values())
+    all_stats = summarize([value for samples in recorder.latencies.values() for value in samples])
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'target': target,
+            'users': args.users,
+            'duration_s': round(elapsed, 2),
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+        },
+        'totals': {
+            'requests': total,
+            'rps': round(total / elapsed, 2),
+            **{key: all_stats[key] for key in ('p50_ms', 'p95_ms', 'p99_ms')},
+        },
+        'journeys': {name: {'ok': result[True], 'failed': result[False]} for name, result in sorted(outcomes.items())},
+        'endpoints': endpoints,
+    }
+
+
+def compare(result, baseline, tolerance):
+    """Linhas da comparação e lista de regressões além da tolerância."""
+    rows, regressions = [], []
+    before, after = baseline['totals']['rps'], result['totals']['rps']
+    rows.append(['(total rps)', before, after, f"{(after - before) / before:+.0%}" if before else '-'])
+    if before and after < before * (1 - tolerance):
+        regressions.append(f"throughput {before} -> {after} rps")
+    for endpoint, stats in result['endpoints'].items():
+        old = baseline['endpoints'].get(endpoint)
+        if not old:
+            continue
+        change = (stats['p95_ms'] - old['p95_ms']) / old['p95_ms'] if old['p95_ms'] else 0
+        rows.append([f"{endpoint} p95_ms", old['p95_ms'], stats['p95_ms'], f"{change:+.0%}"])
+        if change > tolerance:
+            regressions.append(f"{endpoint} p95 {old['p95_ms']} -> {stats['p95_ms']} ms")
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database-url')
+    parser.add_argument('--base-url', help='Servidor já no ar (ex.: http://localhost:5000/api)')
+    parser.add_argument('--output', help='Arquivo JSON com o resultado')
+    parser.add_argument('--baseline', help='JSON de uma execução anterior para comparar')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    result = run_load(args)
+
+    meta, totals = result['meta'], result['totals']
+    print(f"🏋️  {meta['users']} virtual users, {meta['duration_s']:.0f}s against {meta['target']}: "
+          f"{totals['requests']} requests, {totals['rps']} req/s, p95 {totals['p95_ms']} ms")
+    print_table(["endpoint", "requests", "rps", "statuses", "p50_ms", "p95_ms", "p99_ms"], [
+        [endpoint, stats['requests'], stats['rps'], ' '.join(f"{s}:{c}" for s, c in stats['statuses'].items()),
+         stats['p50_ms'], stats['p95_ms'], stats['p99_ms']]
+        for endpoint, stats in result['endpoints'].items()
+    ])
+    print()
+    print_table(["journey", "ok", "failed"],
+                [[name, counts['ok'], counts['failed']] for name, counts in result['journeys'].items()])
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(result, handle, indent=2)
+        print(f"\n💾 Saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        rows, regressions = compare(result, baseline, args.tolerance)
+        print(f"\n📊 Compared with {args.baseline} (commit {baseline['meta'].get('commit')})")
+        print_table(["metric", "baseline", "current", "change"], rows)
+        if regressions:
+            print(f"\n❌ Regressions beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark de rajada de logins (troca de turno).
+
+Sobe gunicorn (1 worker, --threads threads) e dispara --logins clientes
+fazendo POST /api/auth/login em laço enquanto --readers clientes leem
+GET /api/rental/items. Compara o hash na thread da requisição sem limite
+(comportamento anterior) com o pool limitado de src/services/passwords.py,
+reportando latência dos logins, respostas 429 e latência das leituras.
+
+Uso: python benchmarks/login_burst_benchmark.py [--logins 32] [--readers 4] [--duration 10]
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from common import create_benchmark_app, register_tenant, summarize, print_table
+from wsgi_benchmark import wait_until_up, start_server, stop_server
+
+PASSWORD = 'BenchPassword123!'
+
+SETUPS = [
+    # (rótulo, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_DEPTH)
+    ("inline, unbounded", 0, 10_000),
+    ("pool 2 + queue 4", 2, 4),
+    ("pool 2 + queue 16", 2, 16),
+]
+
+
+def seed(database_url):
+    app = create_benchmark_app(database_url)
+    client = app.test_client()
+    headers = register_tenant(client, 'burst', password=PASSWORD)
+    for n in range(20):
+        client.post('/api/rental/items', json={'name': f"Item {n}", 'daily_price': 10}, headers=headers)
+    return headers['Authorization']
+
+
+def login_loop(args):
+    port, duration = args
+    body = json.dumps({'email': 'admin@burst.example.com', 'password': PASSWORD})
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    latencies, rejected, errors = [], 0, 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            connection.request('POST', '/api/auth/login', body=body, headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            continue
+        if response.status == 429:
+            rejected += 1
+            time.sleep(float(response.getheader('Retry-After', '1')))
+        elif response.status == 200:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors += 1
+    return 'login', latencies, rejected, errors
+
+
+def read_loop(args):
+    port, duration, authorization = args
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            connection.request('GET', '/api/rental/items?per_page=20', headers={'Authorization': authorization})
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            continue
+        if response.status == 200:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors += 1
+    return 'read', latencies, 0, errors
+
+
+def run_job(job):
+    kind, args = job
+    return login_loop(args) if kind == 'login' else read_loop(args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--logins', type=int, default=32)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--port', type=int, default=5098)
+    parser.add_argument('--database-url')
+    args = parser.parse_args()
+
+    authorization = seed(args.database_url)
+
+    rows = []
+    for label, workers, depth in SETUPS:
+        env = dict(os.environ, FLASK_ENV='production', GUNICORN_ACCESS_LOG='',
+                   PASSWORD_HASH_WORKERS=str(workers), PASSWORD_HASH_QUEUE_DEPTH=str(depth))
+        process = start_server([
+            sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'src.wsgi:app',
+            '--bind', f'127.0.0.1:{args.port}', '--workers', '1', '--threads', str(args.threads)
+        ], env)
+        try:
+            wait_until_up(args.port)
+            jobs = [('login', (args.port, args.duration))] * args.logins + \
+                   [('read', (args.port, args.duration, authorization))] * args.readers
+            with multiprocessing.Pool(len(jobs)) as pool:
+                results = pool.map(run_job, jobs)
+        finally:
+            stop_server(process)
+
+        logins = [value for kind, samples, _, _ in results if kind == 'login' for value in samples]
+        reads = [value for kind, samples, _, _ in results if kind == 'read' for value in samples]
+        rejected = sum(count for _, _, count, _ in results)
+        errors = sum(count for _, _, _, count in results)
+        login_stats, read_stats = summarize(logins), summarize(reads)
+        rows.append([label, len(logins), rejected, login_stats['p50_ms'], login_stats['p99_ms'],
+                     len(reads), read_stats['p50_ms'], read_stats['p99_ms'], errors])
+
+    print(f"🔐 {args.logins} login clients + {args.readers} readers, 1 worker x {args.threads} threads, "
+          f"{args.duration:.0f}s, {multiprocessing.cpu_count()} CPUs")
+    print_table(["setup", "logins", "429s", "login_p50_ms", "login_p99_ms",
+                 "reads", "read_p50_ms", "read_p99_ms", "errors"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca do usuário no login com --users usuários.
+
+Distribui os usuários em --tenants tenants e mede POST /api/auth/login para
+usuários sorteados, com o tenant informado no corpo, pelo Host, ou ausente
+(busca só pelo email, com e sem o índice ix_users_email, este último
+equivalente ao comportamento anterior). O hash de senha usa custo mínimo
+para isolar o custo da busca.
+
+Uso: python benchmarks/login_lookup_benchmark.py [--users 100000] [--tenants 1000] [--logins 500]
+"""
+
+import argparse
+import random
+
+from werkzeug.security import generate_password_hash
+
+from common import create_benchmark_app, summarize, timed, print_table
+
+PASSWORD = 'BenchPassword123!'
+CHEAP_METHOD = 'pbkdf2:sha256:1'
+
+
+def seed(app, users, tenants):
+    from src.models.user import db, User
+    from src.models.tenant import Tenant
+
+    password_hash = generate_password_hash(PASSWORD, CHEAP_METHOD)
+    with app.app_context():
+        db.session.execute(Tenant.__table__.insert(), [
+            {'name': f"Tenant {t}", 'subdomain': f"t{t}", 'schema_name': f"tenant_t{t}",
+             'is_active': True, 'permissions_version': 0}
+            for t in range(tenants)
+        ])
+        tenant_ids = [row[0] for row in db.session.query(Tenant.id).order_by(Tenant.id)]
+        per_tenant = users // tenants
+        batch = []
+        for n in range(users):
+            tenant = n // per_tenant % tenants
+            batch.append({'tenant_id': tenant_ids[tenant], 'username': f"user{n}",
+                          'email': f"user{n % per_tenant}@example.com", 'password_hash': password_hash,
+                          'role': 'user', 'is_active': True})
+            if len(batch) == 10_000:
+                db.session.execute(User.__table__.insert(), batch)
+                batch = []
+        if batch:
+            db.session.execute(User.__table__.insert(), batch)
+        db.session.commit()
+    return per_tenant
+
+
+def run(client, samples, mode):
+    latencies = []
+    for tenant, email in samples:
+        body = {'email': email, 'password': PASSWORD}
+        headers = {}
+        if mode == 'body':
+            body['tenant'] = f"t{tenant}"
+        elif mode == 'host':
+            headers['Host'] = f"t{tenant}.rentalsaas.test"
+        else:
+            # Emails repetem entre tenants: usa um email exclusivo do tenant 0
+            body['email'] = email.replace('@', '+solo@')
+        response, elapsed = timed(client.post, '/api/auth/login', json=body, headers=headers)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        latencies.append(elapsed)
+    return summarize(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=100_000)
+    parser.add_argument('--tenants', type=int, default=1000)
+    parser.add_argument('--logins', type=int, default=500)
+    parser.add_argument('--database-url')
+    args = parser.parse_args()
+
+    app = create_benchmark_app(args.database_url)
+    app.config['PASSWORD_HASH_METHOD'] = CHEAP_METHOD
+    from src.services import passwords
+    passwords.hasher.init_app(app)
+
+    per_tenant = seed(app, args.users, args.tenants)
+    client = app.test_client()
+
+    random.seed(42)
+    samples = [(random.randrange(args.tenants), f"user{random.randrange(per_tenant)}@example.com")
+               for _ in range(args.logins)]
+
+    # Usuários com email exclusivo (no tenant 0) para o login sem tenant
+    from src.models.user import db, User
+    with app.app_context():
+        first_tenant_id = db.session.query(User.tenant_id).order_by(User.id).first()[0]
+        solo = {email for _, email in samples}
+        db.session.execute(User.__table__.insert(), [
+            {'tenant_id': first_tenant_id, 'username': email.replace('@', '+solo@'),
+             'email': email.replace('@', '+solo@'),
+             'password_hash': generate_password_hash(PASSWORD, CHEAP_METHOD), 'role': 'user', 'is_active': True}
+            for email in solo
+        ])
+        db.session.commit()
+
+    rows = []
+    for label, mode in [("tenant in body", 'body'), ("tenant from Host", 'host'),
+                        ("email only, indexed", 'email')]:
+        stats = run(client, samples, mode)
+        rows.append([label, stats['p50_ms'], stats['p95_ms'], stats['p99_ms']])
+
+    with app.app_context():
+        db.session.execute(db.text("DROP INDEX ix_users_email"))
+        db.session.commit()
+    stats = run(client, samples, 'email')
+    rows.append(["email only, no index (before)", stats['p50_ms'], stats['p95_ms'], stats['p99_ms']])
+
+    print(f"🔑 {args.logins} logins, {args.users:,} users in {args.tenants:,} tenants")
+    print_table(["lookup", "p50_ms", "p95_ms", "p99_ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
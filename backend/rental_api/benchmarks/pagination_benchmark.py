@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark de paginação: OFFSET (page/per_page) vs. cursor (keyset).
+
+Mede a latência da primeira página e de uma página profunda para itens
+(ordenados por id) e reservas (ordenadas por start_date, id).
+
+Uso: python benchmarks/pagination_benchmark.py [--rows 100000] [--per-page 10]
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+from common import create_benchmark_app, register_tenant, summarize, timed, print_table
+
+
+def seed(app, tenant_id, rows):
+    from sqlalchemy import insert
+    from src.models.user import db
+    from src.models.rental import RentalItem, Customer, Reservation
+
+    with app.app_context():
+        customer = Customer(tenant_id=tenant_id, first_name="Page", last_name="Bench", email="page@example.com")
+        db.session.add(customer)
+        db.session.flush()
+        now = datetime.utcnow()
+
+        db.session.execute(insert(RentalItem), [
+            {'tenant_id': tenant_id, 'name': f"Item {n}", 'daily_price': 10, 'total_quantity': 1,
+             'is_active': True, 'created_at': now, 'updated_at': now}
+            for n in range(rows)
+        ])
+        first_item = db.session.query(RentalItem.id).filter_by(tenant_id=tenant_id).order_by(RentalItem.id).first()[0]
+
+        start = datetime(2020, 1, 1)
+        db.session.execute(insert(Reservation), [
+            {'tenant_id': tenant_id, 'item_id': first_item + n, 'customer_id': customer.id,
+             'reservation_code': f"RES-P{n:08d}", 'start_date': start + timedelta(minutes=37 * n),
+             'end_date': start + timedelta(minutes=37 * n + 60), 'quantity': 1, 'unit_price': 10,
+             'total_price': 10, 'final_amount': 10, 'status': 'completed',
+             'created_at': now, 'updated_at': now}
+            for n in range(rows)
+        ])
+        db.session.commit()
+
+
+def deep_cursor(app, tenant_id, endpoint, offset):
+    """Cursor equivalente à página profunda (valores da linha anterior a ela)."""
+    from src.models.user import db
+    from src.models.rental import RentalItem, Reservation
+    from src.services.pagination import encode_cursor
+
+    with app.app_context():
+        if endpoint == 'items':
+            row = db.session.query(RentalItem.id).filter_by(tenant_id=tenant_id).order_by(
+                RentalItem.id).offset(offset - 1).first()
+        else:
+            row = db.session.query(Reservation.start_date, Reservation.id).filter_by(tenant_id=tenant_id).order_by(
+                Reservation.start_date.desc(), Reservation.id.desc()).offset(offset - 1).first()
+        return encode_cursor(list(row))
+
+
+def measure(client, headers, url, repeat):
+    samples = []
+    for _ in range(repeat):
+        response, elapsed = timed(client.get, url, headers=headers)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        samples.append(elapsed)
+    return summarize(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--per-page', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--database-url')
+    args = parser.parse_args()
+
+    app = create_benchmark_app(args.database_url)
+    client = app.test_client()
+    headers = register_tenant(client, 'pagination')
+    tenant_id = 1
+    seed(app, tenant_id, args.rows)
+
+    deep_page = args.rows // args.per_page
+    fields = "fields=id,name,start_date,status"
+    rows = []
+    for endpoint in ('items', 'reservations'):
+        base = f"/api/rental/{endpoint}?{fields}"
+        cursor = deep_cursor(app, tenant_id, endpoint, (deep_page - 1) * args.per_page)
+        cases = [
+            ("offset", 1, f"{base}&page=1&per_page={args.per_page}"),
+            ("offset", deep_page, f"{base}&page={deep_page}&per_page={args.per_page}"),
+            ("cursor", 1, f"{base}&limit={args.per_page}"),
+            ("cursor", deep_page, f"{base}&limit={args.per_page}&cursor={cursor}"),
+        ]
+        for mode, page, url in cases:
+            stats = measure(client, headers, url, args.repeat)
+            rows.append([endpoint, mode, f"{page:,}", stats['p50_ms'], stats['p95_ms']])
+
+    print(f"🚀 Pagination latency ({args.rows:,} rows, {args.per_page} per page)")
+    print_table(["endpoint", "mode", "page", "p50_ms", "p95_ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark de justiça entre tenants com um tenant abusivo.
+
+Sobe gunicorn (1 worker, --threads threads) e dispara --noisy clientes de
+um mesmo tenant em laço contra GET /api/rental/reservations (uma integração
+descontrolada), enquanto --quiet tenants fazem --quiet-rate requisições/s
+cada. Compara o servidor sem limite (comportamento anterior) com o limite
+por tenant/usuário de src/services/rate_limit.py, reportando latência e
+sucesso dos tenants comportados e vazão/429 do abusivo.
+
+Uso: python benchmarks/rate_limit_benchmark.py [--noisy 24] [--quiet 4] [--duration 10]
+"""
+
+import argparse
+import http.client
+import multiprocessing
+import os
+import sys
+import time
+
+from common import create_benchmark_app, register_tenant, summarize, print_table
+from wsgi_benchmark import wait_until_up, start_server, stop_server
+
+PATH = '/api/rental/reservations?per_page=20'
+
+
+def seed(database_url, quiet):
+    app = create_benchmark_app(database_url)
+    client = app.test_client()
+    tokens = []
+    for subdomain in ['noisy'] + [f'quiet{n}' for n in range(quiet)]:
+        headers = register_tenant(client, subdomain)
+        item = client.post('/api/rental/items', json={'name': 'Item', 'daily_price': 10}, headers=headers).get_json()
+        customer = client.post('/api/rental/customers', json={
+            'first_name': 'Cliente', 'last_name': subdomain, 'email': f'cliente@{subdomain}.example.com'
+        }, headers=headers).get_json()
+        for day in range(1, 21):
+            client.post('/api/rental/reservations', json={
+                'item_id': item['item']['id'], 'customer_id': customer['customer']['id'],
+                'start_date': f'2030-01-{day:02d}T10:00:00', 'end_date': f'2030-01-{day:02d}T18:00:00'
+            }, headers=headers)
+        tokens.append(headers['Authorization'])
+    return tokens[0], tokens[1:]
+
+
+def client_loop(args):
+    kind, port, authorization, duration, interval = args
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    latencies, limited, errors = [], 0, 0
+    started_at = time.perf_counter()
+    deadline = started_at + duration
+    next_at = started_at
+    while time.perf_counter() < deadline:
+        if interval:
+            # Ritmo fixo: espera a próxima vaga em vez de disparar em laço
+            time.sleep(max(0.0, next_at - time.perf_counter()))
+            next_at += interval
+        started = time.perf_counter()
+        try:
+            connection.request('GET', PATH, headers={'Authorization': authorization})
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            continue
+        if response.status == 200:
+            latencies.append(time.perf_counter() - started)
+        elif response.status == 429:
+            limited += 1
+        else:
+            errors += 1
+    return kind, latencies, limited, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--noisy', type=int, default=24)
+    parser.add_argument('--quiet', type=int, default=4)
+    parser.add_argument('--quiet-rate', type=float, default=5.0)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--port', type=int, default=5097)
+    parser.add_argument('--database-url')
+    args = parser.parse_args()
+
+    noisy, quiet = seed(args.database_url, args.quiet)
+
+    rows = []
+    for label, enabled in [("no limit (before)", 'false'), ("per-tenant token bucket", 'true')]:
+        # Sem reciclagem do worker: com o limite as 429 passam de 1000 requisições em segundos
+        env = dict(os.environ, FLASK_ENV='production', GUNICORN_ACCESS_LOG='', GUNICORN_MAX_REQUESTS='0',
+                   RATE_LIMIT_ENABLED=enabled, RATE_LIMIT_BACKEND='local')
+        process = start_server([
+            sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'src.wsgi:app',
+            '--bind', f'127.0.0.1:{args.port}', '--workers', '1', '--threads', str(args.threads)
+        ], env)
+        try:
+            wait_until_up(args.port)
+            jobs = [('noisy', args.port, noisy, args.duration, 0)] * args.noisy + \
+                   [('quiet', args.port, token, args.duration, 1 / args.quiet_rate) for token in quiet]
+            with multiprocessing.Pool(len(jobs)) as pool:
+                results = pool.map(client_loop, jobs)
+        finally:
+            stop_server(process)
+
+        served = {kind: [value for k, samples, _, _ in results if k == kind for value in samples]
+                  for kind in ('noisy', 'quiet')}
+        limited = {kind: sum(count for k, _, count, _ in results if k == kind) for kind in ('noisy', 'quiet')}
+        errors = sum(count for _, _, _, count in results)
+        quiet_stats = summarize(served['quiet'])
+        expected = int(args.quiet * args.quiet_rate * args.duration)
+        rows.append([label, f"{len(served['noisy']) / args.duration:.0f}", limited['noisy'],
+                     f"{len(served['quiet'])}/{expected}", limited['quiet'],
+                     quiet_stats['p50_ms'], quiet_stats['p99_ms'], errors])
+
+    print(f"⚖️  {args.noisy} noisy clients (1 tenant) + {args.quiet} quiet tenants at {args.quiet_rate:g} req/s, "
+          f"1 worker x {args.threads} threads, {args.duration:.0f}s, {multiprocessing.cpu_count()} CPUs")
+    print_table(["setup", "noisy_ok_per_s", "noisy_429s", "quiet_ok", "quiet_429s",
+                 "quiet_p50_ms", "quiet_p99_ms", "errors"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark da verificação de tokens revogados.
+
+1. Taxa de falsos positivos do filtro de Bloom com --revoked jtis revogados,
+   medida com --probes jtis aleatórios não revogados, contra a taxa alvo.
+2. Custo por verificação: filtro de Bloom (src/services/revocation.py)
+   contra consultar o store (EXISTS) em toda requisição, com LocalRedis e,
+   se informado --redis-url, com um Redis de verdade.
+3. Latência de GET /api/auth/me sem verificação (comportamento anterior) e
+   com a lista de revogação ativa.
+
+Uso: python benchmarks/revocation_benchmark.py [--revoked 100000] [--probes 1000000] [--redis-url redis://localhost:6379/0]
+"""
+
+import argparse
+import time
+import uuid
+
+from common import create_benchmark_app, register_tenant, summarize, timed, print_table
+
+
+def false_positive_rate(revoked, probes, error_rate):
+    from src.utils.bloom import BloomFilter
+
+    bloom = BloomFilter(revoked, error_rate)
+    for _ in range(revoked):
+        bloom.add(str(uuid.uuid4()))
+    hits = sum(1 for _ in range(probes) if str(uuid.uuid4()) in bloom)
+    return bloom, hits / probes
+
+
+def per_check(label, store, jtis, checks):
+    from src.services.revocation import TokenBlocklist, KEY_PREFIX
+
+    blocklist = TokenBlocklist()
+    blocklist.store = store
+    blocklist.sync_interval = 3600
+    for jti in jtis:
+        blocklist.revoke(jti, time.time() + 3600)
+    blocklist._sync()
+
+    probes = [str(uuid.uuid4()) for _ in range(checks)]
+    rows = []
+    started = time.perf_counter()
+    for jti in probes:
+        store.exists(f'{KEY_PREFIX}:{jti}')
+    rows.append([label, "EXISTS per request", round((time.perf_counter() - started) / checks * 1e6, 2)])
+
+    started = time.perf_counter()
+    for jti in probes:
+        blocklist.is_revoked(jti)
+    rows.append([label, "bloom filter front", round((time.perf_counter() - started) / checks * 1e6, 2)])
+    return rows
+
+
+def me_latency(client, headers, requests):
+    latencies = []
+    for _ in range(requests):
+        response, elapsed = timed(client.get, '/api/auth/me', headers=headers)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        latencies.append(elapsed)
+    return summarize(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--revoked', type=int, default=100_000)
+    parser.add_argument('--probes', type=int, default=1_000_000)
+    parser.add_argument('--error-rate', type=float, default=0.001)
+    parser.add_argument('--checks', type=int, default=20_000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--redis-url')
+    parser.add_argument('--database-url')
+    args = parser.parse_args()
+
+    bloom, observed = false_positive_rate(args.revoked, args.probes, args.error_rate)
+    print(f"🌸 Bloom filter: {args.revoked:,} revoked jtis, {bloom.size / 8 / 1024:.0f} KiB, "
+          f"{bloom.hashes} hashes")
+    print_table(["target_fp_rate", "observed_fp_rate", "probes"],
+                [[args.error_rate, round(observed, 5), f"{args.probes:,}"]])
+    print()
+
+    from src.utils.cache import LocalRedis
+    revoked = [str(uuid.uuid4()) for _ in range(min(args.revoked, 10_000))]
+    rows = per_check("LocalRedis", LocalRedis(), revoked, args.checks)
+    if args.redis_url:
+        import redis
+        store = redis.Redis.from_url(args.redis_url)
+        rows += per_check("Redis", store, revoked, args.checks)
+    print(f"⏱️  Per-check overhead ({args.checks:,} non-revoked tokens)")
+    print_table(["store", "check", "us_per_check"], rows)
+    print()
+
+    app = create_benchmark_app(args.database_url)
+    client = app.test_client()
+    headers = register_tenant(client, 'revocation')
+    from src.services import revocation
+    for jti in revoked:
+        revocation.blocklist.revoke(jti, time.time() + 3600)
+
+    from flask_jwt_extended.default_callbacks import default_blocklist_callback
+    jwt = app.extensions['flask-jwt-extended']
+    rows = []
+    loader = jwt._token_in_blocklist_callback
+    jwt._token_in_blocklist_callback = default_blocklist_callback
+    stats = me_latency(client, headers, args.requests)
+    rows.append(["no revocation check (before)", stats['p50_ms'], stats['p95_ms'], stats['p99_ms']])
+    jwt._token_in_blocklist_callback = loader
+    stats = me_latency(client, headers, args.requests)
+    rows.append(["bloom filter front", stats['p50_ms'], stats['p95_ms'], stats['p99_ms']])
+
+    print(f"👤 GET /api/auth/me, {args.requests} requests, {len(revoked):,} revoked tokens")
+    print_table(["setup", "p50_ms", "p95_ms", "p99_ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca de itens: LIKE '%termo%' (implementação anterior) vs.
+índice de texto (FTS5 no SQLite, tsvector + pg_trgm no PostgreSQL).
+
+Gera --items itens distribuídos entre --tenants tenants com tamanhos
+desiguais (o tenant k recebe uma fatia proporcional a 1/k, como costuma ser
+em SaaS) e mede a sequência de termos de um type-ahead no maior tenant e em
+um tenant mediano. Os dois modos retornam a primeira página (10 itens) e o
+total, como GET /api/rental/items.
+
+Uso: python benchmarks/search_benchmark.py [--items 1000000] [--tenants 1000]
+"""
+
+import argparse
+import random
+from datetime import datetime
+
+from common import create_benchmark_app, register_tenant, summarize, timed, print_table
+
+NOUNS = ["Cadeira", "Mesa", "Tenda", "Projetor", "Caixa de som", "Toalha", "Andaime", "Betoneira",
+         "Gerador", "Microfone", "Tablado", "Ventilador", "Aquecedor", "Pufe", "Sofá", "Painel LED"]
+ADJECTIVES = ["branca", "preta", "dobrável", "redonda", "quadrada", "industrial", "infantil",
+              "premium", "vintage", "acrílico", "madeira", "inox", "portátil", "profissional"]
+TERMS = ["c", "ca", "cad", "cade", "cadeira", "cadeira bran", "mesa red", "profissional", "xyz"]
+
+
+def tenant_sizes(items, tenants):
+    """Itens por tenant, proporcionais a 1/k (soma exata = items)."""
+    weights = [1 / k for k in range(1, tenants + 1)]
+    total = sum(weights)
+    sizes = [int(items * weight / total) for weight in weights]
+    sizes[0] += items - sum(sizes)
+    return sizes
+
+
+def seed(app, items, tenants, batch_size=20_000):
+    from sqlalchemy import insert
+    from src.models.user import db
+    from src.models.tenant import Tenant
+    from src.models.rental import RentalItem
+
+    rng = random.Random(42)
+    with app.app_context():
+        first_tenant = Tenant.query.filter_by(subdomain='search').first().id
+        db.session.execute(insert(Tenant), [
+            {'name': f"Tenant {n}", 'subdomain': f"search{n}", 'schema_name': f"tenant_search{n}"}
+            for n in range(1, tenants)
+        ])
+        tenant_ids = [first_tenant] + [row[0] for row in db.session.query(Tenant.id).filter(
+            Tenant.id != first_tenant).order_by(Tenant.id)]
+
+        sizes = tenant_sizes(items, tenants)
+        owners = [tenant_id for tenant_id, size in zip(tenant_ids, sizes) for _ in range(size)]
+        rng.shuffle(owners)
+
+        now = datetime.utcnow()
+        for offset in range(0, items, batch_size):
+            db.session.execute(insert(RentalItem), [
+                {'tenant_id': owners[n],
+                 'name': f"{rng.choice(NOUNS)} {rng.choice(ADJECTIVES)} {n}",
+                 'description': f"{rng.choice(NOUNS)} {rng.choice(ADJECTIVES)} para eventos",
+                 'sku': f"SKU-{n:07d}", 'daily_price': 10, 'total_quantity': 1,
+                 'is_active': True, 'created_at': now, 'updated_at': now}
+                for n in range(offset, min(offset + batch_size, items))
+            ])
+        db.session.commit()
+
+        median = len(tenant_ids) // 2
+        return [(tenant_ids[0], sizes[0]), (tenant_ids[median], sizes[median])]
+
+
+def like_search(app, tenant_id, term):
+    """A consulta que GET /items fazia antes do índice de texto."""
+    from src.models.rental import RentalItem
+
+    with app.app_context():
+        query = RentalItem.query.filter_by(tenant_id=tenant_id).filter(
+            RentalItem.name.contains(term) | RentalItem.description.contains(term)
+        )
+        return query.paginate(page=1, per_page=10, error_out=False).total
+
+
+def index_search(app, tenant_id, term):
+    """A consulta atual de GET /items?search=."""
+    from src.models.rental import RentalItem
+    from src.services import search
+
+    with app.app_context():
+        query = search.apply(RentalItem.query.filter_by(tenant_id=tenant_id), RentalItem, tenant_id, term)
+        return query.paginate(page=1, per_page=10, error_out=False).total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=1_000_000)
+    parser.add_argument('--tenants', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--database-url')
+    args = parser.parse_args()
+
+    app = create_benchmark_app(args.database_url)
+    register_tenant(app.test_client(), 'search')
+    tenants, seconds = timed(seed, app, args.items, args.tenants)
+    print(f"Seeded {args.items:,} items over {args.tenants:,} tenants in {seconds:.1f}s")
+
+    rows = []
+    for tenant_id, size in tenants:
+        for term in TERMS:
+            like_samples, index_samples = [], []
+            for _ in range(args.repeat):
+                like_hits, elapsed = timed(like_search, app, tenant_id, term)
+                like_samples.append(elapsed)
+                index_hits, elapsed = timed(index_search, app, tenant_id, term)
+                index_samples.append(elapsed)
+            like_stats, index_stats = summarize(like_samples), summarize(index_samples)
+            rows.append([f"{size:,}", repr(term), like_hits, like_stats['p50_ms'],
+                         index_hits, index_stats['p50_ms'], index_stats['p95_ms']])
+
+    print(f"🚀 Item search ({args.items:,} items, largest and median tenant)")
+    print_table(["tenant_items", "term", "like_hits", "like_p50_ms", "index_hits", "index_p50_ms", "index_p95_ms"],
+                rows)
+    print("LIKE casa qualquer trecho ('c' = qualquer 'c'); o índice casa palavras, a última como prefixo.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+Gerador de dados sintéticos multi-tenant para benchmarks em escala real.
+
+Cria --tenants tenants com tamanhos desiguais (Zipf: o maior tenant tem
+muito mais reservas que a cauda) e, para cada um, usuários, categorias,
+itens, clientes, reservas, pagamentos e check-ins/check-outs com datas
+plausíveis: reservas criadas ao longo de --history-days dias com
+crescimento, antecedência e duração com distribuições de cauda longa, status
+coerente com a data de referência (passadas concluídas, em curso ativas,
+futuras pendentes/confirmadas) e itens/clientes populares concentrando as
+reservas. Reservas não canceladas respeitam o estoque do item em cada dia,
+como a rota de reservas exige: se o item sorteado lotou no período, outro é
+sorteado e, sem nenhum livre, a reserva entra como cancelada. O total de reservas é --reservations; as demais tabelas saem
+proporcionais.
+
+A inserção ignora o ORM: COPY (CSV) no PostgreSQL e executemany direto no
+sqlite3, em lotes de --batch reservas, numa única transação. Os ids são
+atribuídos aqui (a partir do maior id existente), então nenhuma linha
+precisa voltar do banco; no PostgreSQL as sequências são ajustadas no fim.
+Os contadores de tenant_usage são gravados já corretos.
+
+Determinístico: a mesma semente, parâmetros e --reference-date geram os
+mesmos dados (em um banco vazio, inclusive os mesmos ids). Sem
+--reference-date as datas são relativas a hoje, então o conteúdo é o mesmo
+deslocado em dias inteiros e consultas relativas a "agora" (dashboard,
+próximas reservas) se comportam igual em qualquer dia.
+
+Todos os admins entram com admin@synthetic-<tenant id>.example.com e a
+senha SeedPassword123!.
+
+Uso:
+    python benchmarks/seed_data.py [--tenants 50] [--reservations 1000000] [--seed 42]
+    python benchmarks/seed_data.py --database-url postgresql://localhost/rental_bench
+"""
+
+import argparse
+import bisect
+import csv
+import io
+import itertools
+import math
+import random
+import time
+from datetime import date, timedelta
+
+from common import create_benchmark_app, print_table
+
+PASSWORD = 'SeedPassword123!'
+
+CATEGORY_NAMES = [
+    'Ferramentas', 'Festas e Eventos', 'Camping', 'Esportes', 'Audiovisual', 'Construção',
+    'Jardinagem', 'Mobiliário', 'Veículos', 'Fotografia', 'Som e Luz', 'Informática',
+    'Náutica', 'Bebê e Criança', 'Cozinha Industrial', 'Climatização', 'Limpeza', 'Música',
+    'Escritório', 'Decoração', 'Segurança', 'Saúde', 'Games', 'Moda e Trajes',
+]
+ITEM_NOUNS = [
+    'Furadeira', 'Mesa', 'Cadeira', 'Tenda', 'Barraca', 'Projetor', 'Caixa de som', 'Betoneira',
+    'Andaime', 'Bicicleta', 'Câmera', 'Notebook', 'Gerador', 'Cortador de grama', 'Escada',
+    'Microfone', 'Refletor LED', 'Caiaque', 'Drone', 'Lavadora de pressão', 'Ar-condicionado',
+    'Tela de projeção', 'Compressor', 'Serra circular', 'Carrinho de bebê', 'Fantasia',
+]
+BRANDS = ['Atlas', 'Vértice', 'Boreal', 'Nimbus', 'Orion', 'Pampa', 'Tupã', 'Delta', 'Aurora', 'Sertão']
+FIRST_NAMES = [
+    'Ana', 'Bruno', 'Carla', 'Diego', 'Eduarda', 'Felipe', 'Gabriela', 'Henrique', 'Isabela', 'Joao',
+    'Karina', 'Lucas', 'Mariana', 'Nicolas', 'Olivia', 'Pedro', 'Rafaela', 'Samuel', 'Tatiana', 'Vitor',
+    'Beatriz', 'Caio', 'Daniela', 'Enzo', 'Fernanda', 'Gustavo', 'Helena', 'Igor', 'Julia', 'Leonardo',
+]
+LAST_NAMES = [
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima', 'Gomes',
+    'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Almeida', 'Lopes', 'Soares', 'Fernandes', 'Vieira', 'Barbosa',
+    'Rocha', 'Dias', 'Nascimento', 'Andrade', 'Moreira', 'Nunes', 'Marques', 'Machado', 'Mendes', 'Freitas',
+]
+CITIES = [
+    ('São Paulo', 'SP'), ('Rio de Janeiro', 'RJ'), ('Belo Horizonte', 'MG'), ('Curitiba', 'PR'),
+    ('Porto Alegre', 'RS'), ('Salvador', 'BA'), ('Recife', 'PE'), ('Fortaleza', 'CE'),
+    ('Brasília', 'DF'), ('Florianópolis', 'SC'), ('Campinas', 'SP'), ('Goiânia', 'GO'),
+]
+# (valor, peso): duração da reserva em dias, método de pagamento, condição do item
+DURATIONS = [(1, 40), (2, 20), (3, 12), (4, 6), (5, 5), (7, 8), (10, 3), (14, 3), (30, 2), (60, 1)]
+PAYMENT_METHODS = [('pix', 45), ('credit_card', 30), ('debit_card', 10), ('bank_slip', 10), ('cash', 5)]
+GATEWAYS = {'pix': 'mercadopago', 'credit_card': 'stripe', 'debit_card': 'stripe', 'bank_slip': 'mercadopago'}
+CONDITIONS = [('excellent', 30), ('good', 50), ('fair', 15), ('poor', 4), ('damaged', 1)]
+
+# Colunas gravadas por tabela, na ordem de inserção (pais antes dos filhos)
+COLUMNS = {
+    'tenants': (
+        'id', 'name', 'subdomain', 'schema_name', 'timezone', 'currency', 'language', 'is_active',
+        'max_users', 'max_items', 'plan', 'permissions_version', 'created_at', 'updated_at',
+        'email_notifications', 'sms_notifications', 'whatsapp_notifications', 'primary_color', 'secondary_color',
+    ),
+    'users': (
+        'id', 'tenant_id', 'username', 'email', 'first_name', 'last_name', 'password_hash', 'is_active',
+        'email_verified', 'phone_verified', 'role', 'created_at', 'updated_at',
+    ),
+    'categories': ('id', 'tenant_id', 'name', 'description', 'icon', 'color', 'created_at', 'updated_at'),
+    'rental_items': (
+        'id', 'tenant_id', 'category_id', 'name', 'sku', 'barcode', 'daily_price', 'weekly_price',
+        'total_quantity', 'min_rental_hours', 'status', 'is_active', 'requires_deposit',
+        'deposit_amount', 'created_at', 'updated_at',
+    ),
+    'customers': (
+        'id', 'tenant_id', 'first_name', 'last_name', 'email', 'phone', 'document_type', 'document_number',
+        'city', 'state', 'country', 'is_active', 'created_at', 'updated_at',
+    ),
+    'reservations': (
+        'id', 'tenant_id', 'item_id', 'customer_id', 'reservation_code', 'start_date', 'end_date',
+        'actual_start_date', 'actual_end_date', 'quantity', 'unit_price', 'total_price', 'additional_fees',
+        'discount_amount', 'final_amount', 'status', 'is_recurring', 'created_at', 'updated_at', 'created_by',
+    ),
+    'payments': (
+        'id', 'tenant_id', 'reservation_id', 'payment_code', 'amount', 'currency', 'payment_method', 'gateway',
+        'status', 'paid_at', 'due_date', 'created_at', 'updated_at',
+    ),
+    'checkin_checkout': (
+        'id', 'tenant_id', 'reservation_id', 'operation_type', 'operation_date', 'performed_by',
+        'item_condition', 'created_at',
+    ),
+    'tenant_usage': (
+        'tenant_id', 'users_count', 'items_count', 'active_items_count', 'customers_count',
+        'reservations_pending', 'reservations_confirmed', 'reservations_active', 'reservations_completed',
+        'reservations_cancelled', 'reconciled_at',
+    ),
+}
+
+
+def _cumulative(pairs):
+    values = [value for value, _ in pairs]
+    return values, list(itertools.accumulate(weight for _, weight in pairs))
+
+
+def zipf_weights(count, skew):
+    """Pesos 1/k^skew normalizados (k = 1..count)."""
+    weights = [1 / k ** skew for k in range(1, count + 1)]
+    total = sum(weights)
+    return [weight / total for weight in weights]
+
+
+class Clock:
+    """Datas como texto no formato do SQLAlchemy, por dia relativo à referência.
+
+    Formatar datetime linha a linha domina o tempo de geração; aqui cada dia
+    e cada minuto do dia são formatados uma vez só. O mesmo texto serve ao
+    SQLite (que compara datas como texto) e ao COPY do PostgreSQL.
+    """
+
+    def __init__(self, reference):
+        self.reference = reference
+        self._days = {}
+        self._minutes = [f" {m // 60:02d}:{m % 60:02d}:00.000000" for m in range(24 * 60)]
+
+    def at(self, day, minute=0):
+        prefix = self._days.get(day)
+        if prefix is None:
+            prefix = self._days[day] = (self.reference + timedelta(days=day)).strftime('%Y-%m-%d')
+        return prefix + self._minutes[minute]
+
+
+class SQLiteWriter:
+    """executemany direto no sqlite3, sem o ORM.
+
+    Os índices secundários das tabelas carregadas são apagados antes da carga
+    e recriados no fim, na mesma transação: construir um índice de uma vez
+    sai bem mais barato que mantê-lo linha a linha.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        connection.execute('PRAGMA synchronous = OFF')
+        connection.execute('BEGIN')
+        self.indexes = connection.execute(
+            f"SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+            f"AND tbl_name IN ({', '.join('?' * len(COLUMNS))})", list(COLUMNS)
+        ).fetchall()
+        for name, _ in self.indexes:
+            connection.execute(f'DROP INDEX "{name}"')
+
+    def write(self, table, rows):
+        columns = COLUMNS[table]
+        self.connection.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})", rows
+        )
+
+    def finish(self):
+        for _, sql in self.indexes:
+            self.connection.execute(sql)
+        self.connection.commit()
+        self.connection.execute('PRAGMA synchronous = FULL')
+        self.connection.execute('ANALYZE')
+
+
+class PostgresWriter:
+    """COPY ... FROM STDIN (CSV) pelo psycopg2, com os índices recriados no fim como no SQLite."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.cursor = connection.cursor()
+        # Índices que não sustentam constraints (chave primária, unique)
+        self.cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() "
+            "AND tablename = ANY(%s) AND indexname NOT IN (SELECT conname FROM pg_constraint)", (list(COLUMNS),)
+        )
+        self.indexes = self.cursor.fetchall()
+        for name, _ in self.indexes:
+            self.cursor.execute(f'DROP INDEX "{name}"')
+
+    def write(self, table, rows):
+        buffer = io.StringIO()
+        # None vira campo vazio sem aspas, que o COPY em CSV lê como NULL
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        self.cursor.copy_expert(f"COPY {table} ({', '.join(COLUMNS[table])}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+    def finish(self):
+        for _, sql in self.indexes:
+            self.cursor.execute(sql)
+        # Os ids vieram daqui: as sequências precisam continuar depois deles
+        for table, columns in COLUMNS.items():
+            if columns[0] == 'id':
+                self.cursor.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+                )
+        self.connection.commit()
+        for table in COLUMNS:
+            self.cursor.execute(f"ANALYZE {table}")
+        self.connection.commit()
+
+
+class Generator:
+    def __init__(self, writer, next_ids, tenants=50, reservations=1_000_000, skew=1.1, seed=42,
+                 history_days=365, reference_date=None, batch=50_000, password_hash=''):
+        self.writer = writer
+        self.next_ids = next_ids
+        self.tenants = tenants
+        self.reservations = reservations
+        self.skew = skew
+        self.seed = seed
+        self.history_days = history_days
+        self.batch = batch
+        self.password_hash = password_hash
+        self.clock = Clock(reference_date or date.today())
+        self.buffers = {table: [] for table in COLUMNS}
+        self.counts = dict.fromkeys(COLUMNS, 0)
+
+    def _ids(self, table, count):
+        first = self.next_ids[table]
+        self.next_ids[table] = first + count
+        return range(first, first + count)
+
+    def _next(self, table):
+        return self._ids(table, 1)[0]
+
+    def flush(self):
+        for table, rows in self.buffers.items():
+            if rows:
+                self.writer.write(table, rows)
+                self.counts[table] += len(rows)
+                rows.clear()
+
+    def run(self):
+        sizes = [max(10, round(self.reservations * weight)) for weight in zipf_weights(self.tenants, self.skew)]
+        for rank, size in enumerate(sizes):
+            # Semente própria por tenant: o tenant k não depende dos demais parâmetros
+            self.tenant(random.Random(self.seed * 1_000_003 + rank), rank, size)
+        self.flush()
+        self.writer.finish()
+        return self.counts
+
+    def tenant(self, rng, rank, reservation_count):
+        clock, buffers = self.clock, self.buffers
+        tenant_id = self._next('tenants')
+        item_count = max(3, math.ceil(reservation_count / 40))
+        customer_count = max(5, math.ceil(reservation_count / 6))
+        category_count = min(len(CATEGORY_NAMES), 3 + int(math.log2(item_count)))
+        user_count = min(10, 1 + item_count // 100)
+        plan = 'enterprise' if rank < self.tenants * 0.05 else 'pro' if rank < self.tenants * 0.25 else 'basic'
+
+        first_day = -self.history_days - rng.randrange(30)
+        created = clock.at(first_day, rng.randrange(8 * 60, 18 * 60))
+        subdomain = f"synthetic-{tenant_id}"
+        buffers['tenants'].append((
+            tenant_id, f"Locadora {rng.choice(LAST_NAMES)} {tenant_id}", subdomain, f"tenant_{subdomain}",
+            'America/Sao_Paulo', 'BRL', 'pt', True, 10, max(100, item_count), plan, 0, created, created,
+            True, False, False, '#007bff', '#6c757d',
+        ))
+
+        user_ids = self._ids('users', user_count)
+        for n, user_id in enumerate(user_ids):
+            username = 'admin' if n == 0 else f"funcionario{n}"
+            buffers['users'].append((
+                user_id, tenant_id, username, f"{username}@{subdomain}.example.com", rng.choice(FIRST_NAMES),
+                rng.choice(LAST_NAMES), self.password_hash, True, True, False, 'admin' if n == 0 else 'employee',
+                created, created,
+            ))
+
+        category_ids = self._ids('categories', category_count)
+        for name, category_id in zip(rng.sample(CATEGORY_NAMES, category_count), category_ids):
+            buffers['categories'].append((
+                category_id, tenant_id, name, f"Itens de {name.lower()}", None, '#007bff', created, created,
+            ))
+
+        # Itens: preço log-normal, estoque pequeno, alguns inativos/em manutenção
+        item_ids = self._ids('rental_items', item_count)
+        prices, stocks = [], []
+        active_items = 0
+        for item_id in item_ids:
+            price = min(5000.0, max(5.0, round(rng.lognormvariate(4.2, 0.8), 2)))
+            prices.append(price)
+            active = rng.random() >= 0.05
+            active_items += active
+            status = 'available' if active else rng.choice(('maintenance', 'retired'))
+            quantity = rng.choice((1, 1, 1, 2, 3, 5, 10))
+            stocks.append(quantity)
+            deposit = price * 2 if price > 300 else None
+            day = first_day + rng.randrange(-first_day)
+            buffers['rental_items'].append((
+                item_id, tenant_id, rng.choice(category_ids),
+                f"{rng.choice(ITEM_NOUNS)} {rng.choice(BRANDS)} {rng.choice('ABCDEFGHKMRSTXZ')}{rng.randrange(10, 999)}",
+                f"SKU-{item_id:08d}", f"789{item_id:010d}", f"{price:.2f}", f"{price * 5:.2f}", quantity,
+                rng.choice((1, 4, 24)), status, active, deposit is not None,
+                f"{deposit:.2f}" if deposit is not None else None, clock.at(day, 600), clock.at(day, 600),
+            ))
+
+        # Clientes: cadastrados ao longo do histórico
+        customer_ids = self._ids('customers', customer_count)
+        for customer_id in customer_ids:
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            city, state = rng.choice(CITIES)
+            at = clock.at(first_day + rng.randrange(-first_day), rng.randrange(24 * 60))
+            buffers['customers'].append((
+                customer_id, tenant_id, first, last, f"{first.lower()}.{last.lower()}.{customer_id}@example.com",
+                f"+55 11 9{rng.randrange(10 ** 8):08d}", 'CPF', f"{rng.randrange(10 ** 11):011d}", city, state,
+                'BR', True, at, at,
+            ))
+
+        statuses = self.reservations_for(rng, tenant_id, reservation_count, user_ids, item_ids, prices, stocks,
+                                         customer_ids)
+        buffers['tenant_usage'].append((
+            tenant_id, user_count, item_count, active_items, customer_count, statuses['pending'],
+            statuses['confirmed'], statuses['active'], statuses['completed'], statuses['cancelled'],
+            clock.at(0),
+        ))
+
+    def reservations_for(self, rng, tenant_id, count, user_ids, item_ids, prices, stocks, customer_ids):
+        clock, buffers = self.clock, self.buffers
+        reservations, payments, checkins = buffers['reservations'], buffers['payments'], buffers['checkin_checkout']
+        statuses = dict.fromkeys(('pending', 'confirmed', 'active', 'completed', 'cancelled'), 0)
+        history = self.history_days
+        random_, randrange, expovariate = rng.random, rng.randrange, rng.expovariate
+        durations, duration_weights = _cumulative(DURATIONS)
+        methods, method_weights = _cumulative(PAYMENT_METHODS)
+        conditions, condition_weights = _cumulative(CONDITIONS)
+        # Itens e clientes populares: poucos concentram boa parte das reservas
+        item_weights = list(itertools.accumulate(zipf_weights(len(item_ids), 0.8)))
+        customer_weights = list(itertools.accumulate(zipf_weights(len(customer_ids), 0.6)))
+        admin = user_ids[0]
+        # Unidades reservadas por item e dia, do dia -history ao fim da reserva mais tardia
+        span = history + 92 + max(durations)
+        booked = {}
+
+        def pick(values, cumulative):
+            return values[min(bisect.bisect(cumulative, random_() * cumulative[-1]), len(values) - 1)]
+
+        def draw_item():
+            return min(bisect.bisect(item_weights, random_()), len(item_ids) - 1)
+
+        def fits(index, first, last, quantity):
+            units = booked.get(index)
+            return (max(units[first:last]) if units else 0) + quantity <= stocks[index]
+
+        def place(first, last, quantity):
+            """Índice de um item com estoque em [first, last), ou None."""
+            for _ in range(8):
+                index = draw_item()
+                if fits(index, first, last, quantity):
+                    return index
+            offset = randrange(len(item_ids))
+            for step in range(min(len(item_ids), 256)):
+                index = (offset + step) % len(item_ids)
+                if fits(index, first, last, quantity):
+                    return index
+            return None
+
+        for reservation_id in self._ids('reservations', count):
+            # Criação com crescimento (mais reservas recentes) e antecedência de cauda longa
+            created_day = -int(history * (1 - math.sqrt(random_())))
+            start_day = created_day + min(90, int(expovariate(1 / 5)))
+            days = pick(durations, duration_weights)
+            end_day = start_day + days
+            start_minute = randrange(8, 19) * 60
+            created, start, end = clock.at(created_day, randrange(24 * 60)), clock.at(start_day, start_minute), \
+                clock.at(end_day, start_minute)
+
+            if random_() < 0.08:
+                status = 'cancelled'
+            elif end_day < 0:
+                status = 'completed'
+            elif start_day <= 0:
+                status = 'active'
+            else:
+                status = 'confirmed' if random_() < 0.7 else 'pending'
+
+            quantity = 1 if random_() < 0.9 else randrange(2, 4)
+            # Inclui o dia do fim: o horário de início varia, então uma reserva que
+            # começa nesse dia pode se sobrepor às horas finais desta
+            first, last = start_day + history, end_day + history + 1
+            index = None if status == 'cancelled' else place(first, last, quantity)
+            if index is None:
+                status, index = 'cancelled', draw_item()  # cancelada não ocupa estoque
+            else:
+                units = booked.get(index)
+                if units is None:
+                    units = booked[index] = bytearray(span)
+                for day in range(first, last):
+                    units[day] += quantity
+            statuses[status] += 1
+
+            unit_price = prices[index]
+            total = unit_price * days * quantity
+            discount = round(total * randrange(5, 16) / 100, 2) if random_() < 0.1 else 0.0
+            final = total - discount
+            reservations.append((
+                reservation_id, tenant_id, item_ids[index],
+                customer_ids[min(bisect.bisect(customer_weights, random_()), len(customer_ids) - 1)],
+                f"SYN-{reservation_id:010d}", start, end, start if status in ('active', 'completed') else None,
+                end if status == 'completed' else None, quantity, f"{unit_price:.2f}", f"{total:.2f}", '0.00',
+                f"{discount:.2f}", f"{final:.2f}", status, False, created, created, admin,
+            ))
+
+            if status != 'cancelled':
+                method = pick(methods, method_weights)
+                paid = status in ('active', 'completed')
+                attempts = ['failed', 'completed' if paid else 'pending'] if random_() < 0.05 else \
+                    ['completed' if paid else 'pending']  # às vezes uma tentativa recusada antes
+                for payment_status in attempts:
+                    payment_id = self._next('payments')
+                    payments.append((
+                        payment_id, tenant_id, reservation_id, f"SYN-PAY-{payment_id:010d}", f"{final:.2f}", 'BRL',
+                        method, GATEWAYS.get(method), payment_status, created if payment_status == 'completed' else None,
+                        start, created, created,
+                    ))
+            if status in ('active', 'completed'):
+                checkins.append((
+                    self._next('checkin_checkout'), tenant_id, reservation_id, 'checkin', start, admin, 'good', start,
+                ))
+                if status == 'completed':
+                    checkins.append((
+                        self._next('checkin_checkout'), tenant_id, reservation_id, 'checkout', end, admin,
+                        pick(conditions, condition_weights), end,
+                    ))
+
+            if len(reservations) >= self.batch:
+                self.flush()
+        return statuses
+
+
+def _next_ids(connection):
+    next_ids = {}
+    for table, columns in COLUMNS.items():
+        if columns[0] == 'id':
+            cursor = connection.cursor()
+            cursor.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+            next_ids[table] = cursor.fetchone()[0]
+    return next_ids
+
+
+def generate(engine, **options):
+    """Gera os dados no banco do engine; retorna as linhas inseridas por tabela."""
+    from werkzeug.security import generate_password_hash
+
+    writers = {'sqlite': SQLiteWriter, 'postgresql': PostgresWriter}
+    if engine.dialect.name not in writers:
+        raise ValueError(f"Banco não suportado pelo gerador: {engine.dialect.name}")
+
+    connection = engine.raw_connection()
+    try:
+        writer = writers[engine.dialect.name](connection.driver_connection)
+        generator = Generator(writer, _next_ids(connection), password_hash=generate_password_hash(PASSWORD),
+                              **options)
+        return generator.run()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tenants', type=int, default=50)
+    parser.add_argument('--reservations', type=int, default=1_000_000)
+    parser.add_argument('--skew', type=float, default=1.1, help='Expoente Zipf do tamanho dos tenants')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--history-days', type=int, default=365)
+    parser.add_argument('--reference-date', type=date.fromisoformat, help='AAAA-MM-DD (padrão: hoje)')
+    parser.add_argument('--batch', type=int, default=50_000)
+    parser.add_argument('--database-url')
+    args = parser.parse_args()
+
+    app = create_benchmark_app(args.database_url)
+    from src.models.user import db
+
+    with app.app_context():
+        started = time.perf_counter()
+        counts = generate(db.engine, tenants=args.tenants, reservations=args.reservations, skew=args.skew,
+                          seed=args.seed, history_days=args.history_days, reference_date=args.reference_date,
+                          batch=args.batch)
+        elapsed = time.perf_counter() - started
+        url = db.engine.url.render_as_string(hide_password=True)
+
+    total = sum(counts.values())
+    print(f"🌱 {args.tenants} tenants (Zipf {args.skew:g}), seed {args.seed}, into {url}")
+    print_table(["table", "rows"], [[table, f"{rows:,}"] for table, rows in counts.items()] +
+                [["(total)", f"{total:,}"]])
+    print(f"\n⏱️  {elapsed:.1f}s, {total / elapsed:,.0f} rows/s ({total / elapsed * 60 / 1e6:.1f}M rows/min)")
+    print(f"🔑 Login: admin@synthetic-<tenant id>.example.com / {PASSWORD}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialização das listas (fields/expand vs. to_dict completo).
+
+Compara bytes da resposta, latência e número de consultas de
+GET /api/rental/reservations para diferentes projeções.
+
+Uso: python benchmarks/serialization_benchmark.py [--reservations 2000] [--per-page 100]
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+from common import create_benchmark_app, register_tenant, summarize, timed, print_table
+
+PROJECTIONS = [
+    ("full to_dict", ""),
+    ("expand=item,customer", "expand=item,customer"),
+    ("no embedding", "fields=id,reservation_code,start_date,end_date,status,item_id,customer_id"),
+    ("list view", "fields=id,reservation_code,start_date,end_date,status,item.name,customer.full_name"
+                  "&expand=item,customer"),
+]
+
+
+def seed(app, tenant_id, reservations):
+    from src.models.user import db
+    from src.models.rental import Category, RentalItem, Customer, Reservation
+
+    with app.app_context():
+        category = Category(tenant_id=tenant_id, name="Benchmark")
+        db.session.add(category)
+        db.session.flush()
+        items = [RentalItem(tenant_id=tenant_id, category_id=category.id, name=f"Item {n}",
+                            description="Benchmark item " * 8, daily_price=50, total_quantity=100)
+                 for n in range(50)]
+        customers = [Customer(tenant_id=tenant_id, first_name="Customer", last_name=str(n),
+                              email=f"customer{n}@example.com", address="Rua Exemplo, 123")
+                     for n in range(200)]
+        db.session.add_all(items + customers)
+        db.session.flush()
+
+        start = datetime(2030, 1, 1)
+        for n in range(reservations):
+            db.session.add(Reservation(
+                tenant_id=tenant_id, item_id=items[n % len(items)].id,
+                customer_id=customers[n % len(customers)].id,
+                reservation_code=f"RES-B{n:07d}",
+                start_date=start + timedelta(hours=n), end_date=start + timedelta(hours=n + 24),
+                unit_price=50, total_price=50, final_amount=50, notes="Benchmark reservation"
+            ))
+        db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--reservations', type=int, default=2000)
+    parser.add_argument('--per-page', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--database-url')
+    args = parser.parse_args()
+
+    app = create_benchmark_app(args.database_url)
+    client = app.test_client()
+    headers = register_tenant(client, 'serialization')
+    with app.app_context():
+        from src.models.tenant import Tenant
+        tenant_id = Tenant.query.filter_by(subdomain='serialization').first().id
+    seed(app, tenant_id, args.reservations)
+
+    rows = []
+    baseline_bytes = None
+    for label, query in PROJECTIONS:
+        url = f"/api/rental/reservations?per_page={args.per_page}&{query}"
+        samples = []
+        for _ in range(args.repeat):
+            response, elapsed = timed(client.get, url, headers=headers)
+            assert response.status_code == 200, response.get_data(as_text=True)
+            samples.append(elapsed)
+        size = len(response.get_data())
+        baseline_bytes = baseline_bytes or size
+        stats = summarize(samples)
+        rows.append([label, f"{size:,}", f"{size / baseline_bytes:.0%}",
+                     response.headers.get('X-Query-Count'), stats['p50_ms'], stats['p95_ms']])
+
+    print(f"🚀 Reservation list serialization ({args.per_page} rows per page)")
+    print_table(["projection", "bytes", "vs_full", "queries", "p50_ms", "p95_ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark de tempo de boot: import a frio e primeira requisição.
+
+Cada amostra é um processo Python novo que mede:
+
+- import src.main: o que paga todo teste, script e `flask --app src.main ...`;
+- boot: import de src.wsgi (o que o gunicorn carrega), criação da aplicação
+  incluída;
+- first request: GET /api/health (primeira conexão com o banco) e
+  GET /api/auth/me com um token (JWT, modelos e tenant em frio);
+- total: do início do processo até a primeira resposta.
+
+Compara o boot com SCHEMA_AUTO_CREATE (db.create_all() a cada boot) e sem
+(schema pelas migrações, padrão de produção). Com --ref mede também outro
+commit (ex.: --ref HEAD~1), extraído com git archive, como referência.
+
+Uso: python benchmarks/startup_benchmark.py [--samples 10] [--ref HEAD~1] [--database-url ...]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import create_benchmark_app, register_tenant, summarize, print_table
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, os, sys, time
+started = float(sys.argv[1])
+sys.path.insert(0, os.getcwd())
+t0 = time.perf_counter()
+import src.main
+t1 = time.perf_counter()
+from src.wsgi import app
+t2 = time.perf_counter()
+client = app.test_client()
+client.get('/api/health')
+client.get('/api/auth/me', headers={'Authorization': sys.argv[2]})
+t3 = time.perf_counter()
+print(json.dumps({'import_main': t1 - t0, 'boot': t2 - t1, 'first_request': t3 - t2,
+                  'total': time.time() - started}))
+"""
+
+
+def seed(database_url):
+    app = create_benchmark_app(database_url)
+    headers = register_tenant(app.test_client(), 'startup')
+    return os.environ['DATABASE_URL'], headers['Authorization']
+
+
+def sample(cwd, env, authorization):
+    result = subprocess.run([sys.executable, '-c', PROBE, repr(time.time()), authorization],
+                            cwd=cwd, env=env, capture_output=True, text=True, timeout=120)
+    if result.returncode:
+        raise RuntimeError(result.stderr)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def export_ref(ref):
+    """Extrai backend/rental_api do commit ref num diretório temporário."""
+    target = tempfile.mkdtemp(prefix='rental_startup_')
+    toplevel = subprocess.run(['git', 'rev-parse', '--show-toplevel'], cwd=BACKEND, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    prefix = os.path.relpath(BACKEND, toplevel)
+    archive = subprocess.run(['git', 'archive', ref, prefix], cwd=toplevel, capture_output=True, check=True)
+    subprocess.run(['tar', '-x', '-C', target], input=archive.stdout, check=True)
+    return os.path.join(target, prefix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--samples', type=int, default=10)
+    parser.add_argument('--ref', help='Commit de referência para medir também (ex.: HEAD~1)')
+    parser.add_argument('--database-url')
+    args = parser.parse_args()
+
+    database_url, authorization = seed(args.database_url)
+    env = dict(os.environ, DATABASE_URL=database_url, FLASK_ENV='production', RATE_LIMIT_ENABLED='false')
+    env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+
+    setups = []
+    if args.ref:
+        setups.append((f"{args.ref} (create_all)", export_ref(args.ref), dict(env, SCHEMA_AUTO_CREATE='true')))
+    setups += [
+        ("create_all on boot", BACKEND, dict(env, SCHEMA_AUTO_CREATE='true')),
+        ("migrations-managed", BACKEND, dict(env, SCHEMA_AUTO_CREATE='false')),
+    ]
+
+    rows = []
+    for label, cwd, setup_env in setups:
+        sample(cwd, setup_env, authorization)  # aquece .pyc e cache de disco
+        samples = [sample(cwd, setup_env, authorization) for _ in range(args.samples)]
+        rows.append([label] + [summarize([s[key] for s in samples])['p50_ms']
+                               for key in ('import_main', 'boot', 'first_request', 'total')])
+
+    print(f"🚀 Cold start, p50 of {args.samples} processes, {database_url.split('://', 1)[0]}")
+    print_table(["setup", "import_main_ms", "boot_ms", "first_request_ms", "total_ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark de vazão do servidor de produção (gunicorn) por número de workers.
+
+Sobe gunicorn com gunicorn.conf.py para cada valor de --workers e dispara
+--clients processos clientes (HTTP keep-alive) contra GET /api/rental/items
+durante --duration segundos, reportando requisições/s e latências.
+O servidor de desenvolvimento (python src/main.py) entra como referência.
+
+Uso: python benchmarks/wsgi_benchmark.py [--workers 1,2,4] [--threads 4] [--clients 16]
+"""
+
+import argparse
+import http.client
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from common import create_benchmark_app, register_tenant, summarize, print_table
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATH = "/api/rental/items?per_page=20"
+
+
+def seed(database_url, items):
+    """Cria o tenant e os itens; retorna o header Authorization."""
+    app = create_benchmark_app(database_url)
+    client = app.test_client()
+    headers = register_tenant(client, 'wsgi')
+    for n in range(items):
+        response = client.post('/api/rental/items', json={'name': f"Item {n}", 'daily_price': 10}, headers=headers)
+        assert response.status_code == 201, response.get_data(as_text=True)
+    return headers['Authorization']
+
+
+def wait_until_up(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/api/health')
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def client_loop(args):
+    port, authorization, duration = args
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            connection.request('GET', PATH, headers={'Authorization': authorization})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - started)
+    return latencies, errors
+
+
+def run_load(port, authorization, clients, duration):
+    with multiprocessing.Pool(clients) as pool:
+        results = pool.map(client_loop, [(port, authorization, duration)] * clients)
+    latencies = [value for samples, _ in results for value in samples]
+    errors = sum(count for _, count in results)
+    return len(latencies) / duration, summarize(latencies), errors
+
+
+def start_server(command, env):
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def stop_server(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', default='1,2,4', help='Lista de números de workers')
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--items', type=int, default=50)
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--skip-dev-server', action='store_true')
+    parser.add_argument('--database-url')
+    args = parser.parse_args()
+
+    authorization = seed(args.database_url, args.items)
+    env = dict(os.environ, FLASK_ENV='production', GUNICORN_ACCESS_LOG='')
+
+    setups = []
+    if not args.skip_dev_server:
+        dev_env = dict(env, FLASK_ENV='development')
+        setups.append(("dev server", [sys.executable, '-c',
+                       f"from src.main import app; app.run(port={args.port}, debug=False)"], dev_env))
+    for workers in [int(value) for value in args.workers.split(',')]:
+        setups.append((f"gunicorn {workers}x{args.threads}", [
+            sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'src.wsgi:app',
+            '--bind', f'127.0.0.1:{args.port}', '--workers', str(workers), '--threads', str(args.threads)
+        ], env))
+
+    rows = []
+    for label, command, command_env in setups:
+        process = start_server(command, command_env)
+        try:
+            wait_until_up(args.port)
+            run_load(args.port, authorization, args.clients, 1.0)  # aquecimento
+            rps, stats, errors = run_load(args.port, authorization, args.clients, args.duration)
+        finally:
+            stop_server(process)
+        rows.append([label, f"{rps:,.0f}", stats['p50_ms'], stats['p95_ms'], stats['p99_ms'], errors])
+
+    print(f"🚀 GET {PATH}: {args.clients} clients, {args.duration:.0f}s, {multiprocessing.cpu_count()} CPUs")
+    print_table(["server", "req/s", "p50_ms", "p95_ms", "p99_ms", "errors"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Configuração do gunicorn para produção.
+
+Uso: gunicorn --config gunicorn.conf.py src.wsgi:app
+
+Workers pré-forkados (gthread) dimensionados pelo número de CPUs, com a
+aplicação carregada uma única vez no master (preload_app) e compartilhada
+por copy-on-write. Cada worker é reciclado após GUNICORN_MAX_REQUESTS
+requisições (com jitter para não reiniciarem todos juntos).
+
+Sinais:
+- HUP: relê esta configuração e troca os workers sem derrubar conexões.
+  Com preload_app o código da aplicação NÃO é recarregado; para um deploy
+  use USR2 (novo master) seguido de QUIT no master antigo, ou reinicie o
+  container.
+- TTIN/TTOU: adiciona/remove um worker.
+- TERM: desligamento gracioso (aguarda graceful_timeout).
+"""
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+_cpus = multiprocessing.cpu_count()
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '5000')}")
+
+# Métricas Prometheus de todos os workers (src/services/metrics.py). Precisa
+# existir antes do preload da aplicação, que cria as métricas; um diretório
+# por master, então cada execução começa do zero (o HUP relê este arquivo com
+# a variável já definida e mantém os arquivos)
+_metrics_dir = None
+if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+    _metrics_dir = os.path.join('/dev/shm' if os.path.isdir('/dev/shm') else '/tmp', f"rental_metrics_{os.getpid()}")
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = _metrics_dir
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+# Processos x threads: workers escalam com as CPUs, threads cobrem a espera
+# por banco/rede. Mantenha threads <= DB_POOL_SIZE + DB_MAX_OVERFLOW (pool do
+# SQLAlchemy por worker) e workers x esse total abaixo do max_connections do banco.
+worker_class = 'gthread'
+workers = _env_int('WEB_CONCURRENCY', _env_int('GUNICORN_WORKERS', min(_cpus * 2 + 1, 12)))
+threads = _env_int('GUNICORN_THREADS', 4)
+
+preload_app = True
+
+# Reciclagem de workers (limita crescimento de memória)
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+# Evita escrever heartbeat em disco dentro de containers
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
+def post_fork(server, worker):
+    """Descarta as conexões herdadas do master.
+
+    Com preload_app o master pode ter aberto conexões (create_all); sockets de banco
+    não podem ser compartilhados entre processos, então cada worker começa
+    com um pool vazio. Vale para todos os engines: o principal e as réplicas
+    de leitura (SQLALCHEMY_BINDS).
+    """
+    from src.models.user import db
+    from src.wsgi import app
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    """Descarta os medidores (gauges) do worker que saiu; contadores e histogramas seguem somando."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def pre_exec(server):
+    """Novo master (USR2): cria o próprio diretório de métricas."""
+    if _metrics_dir:
+        os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+
+
+def on_exit(server):
+    if _metrics_dir:
+        import shutil
+
+        shutil.rmtree(_metrics_dir, ignore_errors=True)
+
+
+def when_ready(server):
+    server.log.info('Rental SaaS API pronta: %s workers x %s threads', server.cfg.workers, server.cfg.threads)
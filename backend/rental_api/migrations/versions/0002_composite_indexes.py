@@ -0,0 +1,68 @@
+"""composite tenant indexes
+
+Índices compostos (tenant_id primeiro) para as listagens, filtros e
+paginação por cursor, mais dois índices parciais: próximas reservas do
+dashboard e reservas que ocupam unidades (checagem de disponibilidade).
+
+No PostgreSQL os índices são criados com CREATE INDEX CONCURRENTLY, fora
+da transação da migração, para não bloquear escritas em tabelas grandes.
+IF NOT EXISTS torna a migração segura para reexecução após uma falha no
+meio (um índice concorrente interrompido fica INVALID e deve ser removido
+antes de rodar de novo).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+UPCOMING = sa.text("status IN ('pending', 'confirmed')")
+BLOCKING = sa.text("status IN ('pending', 'confirmed', 'active')")
+
+INDEXES = [
+    ('ix_users_tenant_id_id', 'users', ['tenant_id', 'id'], None),
+    ('ix_rental_items_tenant_id_id', 'rental_items', ['tenant_id', 'id'], None),
+    ('ix_rental_items_tenant_category', 'rental_items', ['tenant_id', 'category_id'], None),
+    ('ix_rental_items_tenant_status', 'rental_items', ['tenant_id', 'status'], None),
+    ('ix_rental_items_tenant_barcode', 'rental_items', ['tenant_id', 'barcode'], None),
+    ('ix_customers_tenant_id_id', 'customers', ['tenant_id', 'id'], None),
+    ('ix_customers_tenant_email', 'customers', ['tenant_id', 'email'], None),
+    ('ix_reservations_tenant_start', 'reservations', ['tenant_id', 'start_date', 'id'], None),
+    ('ix_reservations_tenant_status', 'reservations', ['tenant_id', 'status'], None),
+    ('ix_reservations_tenant_created', 'reservations', ['tenant_id', 'created_at'], None),
+    ('ix_reservations_tenant_item', 'reservations', ['tenant_id', 'item_id'], None),
+    ('ix_reservations_tenant_customer', 'reservations', ['tenant_id', 'customer_id'], None),
+    ('ix_reservations_upcoming', 'reservations', ['tenant_id', 'start_date'], UPCOMING),
+    ('ix_reservations_item_blocking', 'reservations', ['item_id', 'start_date', 'end_date'], BLOCKING),
+    ('ix_contracts_reservation_id', 'contracts', ['reservation_id'], None),
+    ('ix_payments_reservation_id', 'payments', ['reservation_id'], None),
+    ('ix_checkin_checkout_reservation_id', 'checkin_checkout', ['reservation_id'], None),
+]
+
+
+def upgrade():
+    # CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False, if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=where,
+                sqlite_where=where
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,103 @@
+"""full-text and trigram search
+
+Objetos de busca de src/services/search.py para itens e clientes.
+
+PostgreSQL: coluna gerada search_vector (tsvector com pesos) e índices GIN
+(tenant_id, search_vector) e (tenant_id, <texto> gin_trgm_ops), criados
+CONCURRENTLY. Adicionar a coluna gerada reescreve a tabela sob lock
+exclusivo; em bases grandes rode em janela de manutenção.
+
+SQLite: tabelas virtuais FTS5 mantidas por triggers, recriadas e
+preenchidas a partir das tabelas de origem.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+SEARCH = {
+    'rental_items': {
+        'primary': ['name', 'sku', 'barcode'],
+        'secondary': ['description'],
+        'trigram': 'name',
+    },
+    'customers': {
+        'primary': ['first_name', 'last_name'],
+        'secondary': ['email', 'document_number', 'phone'],
+        'trigram': "coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || coalesce(email, '')",
+    },
+}
+
+
+def _vector(columns, weight):
+    return ' || '.join(f"setweight(to_tsvector('simple', coalesce({name}, '')), '{weight}')" for name in columns)
+
+
+def _upgrade_postgresql():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    for table, spec in SEARCH.items():
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS "
+            f"({_vector(spec['primary'], 'A')} || {_vector(spec['secondary'], 'B')}) STORED"
+        )
+
+    with op.get_context().autocommit_block():
+        for table, spec in SEARCH.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_search "
+                       f"ON {table} USING gin (tenant_id, search_vector)")
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_trgm "
+                       f"ON {table} USING gin (tenant_id, ({spec['trigram']}) gin_trgm_ops)")
+
+
+def _upgrade_sqlite():
+    for table, spec in SEARCH.items():
+        fts = f'{table}_fts'
+        columns = spec['primary'] + spec['secondary']
+        names = ', '.join(columns)
+        new_values = ', '.join(f'new.{name}' for name in columns)
+        insert = (f"INSERT INTO {fts}(rowid, tenant, {names}) "
+                  f"VALUES (new.id, 't' || new.tenant_id, {new_values});")
+        delete = f"DELETE FROM {fts} WHERE rowid = old.id;"
+
+        op.execute(f"DROP TABLE IF EXISTS {fts}")
+        op.execute(f"CREATE VIRTUAL TABLE {fts} USING fts5("
+                   f"tenant, {names}, tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3')")
+        op.execute(f"INSERT INTO {fts}(rowid, tenant, {names}) "
+                   f"SELECT id, 't' || tenant_id, {names} FROM {table}")
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END")
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END")
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF tenant_id, {names} ON {table} "
+                   f"BEGIN {delete} {insert} END")
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        _upgrade_postgresql()
+    elif dialect == 'sqlite':
+        _upgrade_sqlite()
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    for table in SEARCH:
+        if dialect == 'postgresql':
+            with op.get_context().autocommit_block():
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_trgm")
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_search")
+            op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+        elif dialect == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
@@ -0,0 +1,29 @@
+"""tenant permissions version
+
+Versão de permissões por tenant, comparada com a claim 'pv' dos access
+tokens (src/services/permissions.py).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tenants') as batch_op:
+        batch_op.add_column(sa.Column('permissions_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('tenants') as batch_op:
+        batch_op.drop_column('permissions_version')
@@ -0,0 +1,32 @@
+"""users email index
+
+Índice em users.email para o login sem tenant identificado (sem subdomínio
+no Host nem campo 'tenant'), que busca o email em todos os tenants. Com o
+tenant resolvido a busca usa a restrição única (tenant_id, email).
+
+Criado com CREATE INDEX CONCURRENTLY no PostgreSQL, como em 0002.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_email', 'users', ['email'], unique=False, if_not_exists=True,
+                        postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_email', table_name='users', if_exists=True, postgresql_concurrently=True)
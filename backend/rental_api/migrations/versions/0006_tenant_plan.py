@@ -0,0 +1,29 @@
+"""tenant plan
+
+Plano do tenant, que define os limites de requisições por tenant e por
+usuário (src/services/rate_limit.py). Tenants existentes ficam no 'basic'.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tenants') as batch_op:
+        batch_op.add_column(sa.Column('plan', sa.String(length=20), nullable=False, server_default='basic'))
+
+
+def downgrade():
+    with op.batch_alter_table('tenants') as batch_op:
+        batch_op.drop_column('plan')
@@ -0,0 +1,71 @@
+"""tenant usage
+
+Contadores de uso por tenant (src/services/usage.py). A tabela já existe em
+bancos migrados antes de ela ter migração própria; nesses só o
+preenchimento roda. Tenants sem linha recebem os contadores calculados dos
+dados atuais (o mesmo que `flask usage reconcile`).
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def _count(table, criteria=''):
+    return f"(SELECT COUNT(*) FROM {table} WHERE {table}.tenant_id = tenants.id{criteria})"
+
+
+def upgrade():
+    if not sa.inspect(op.get_bind()).has_table('tenant_usage'):
+        op.create_table('tenant_usage',
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('users_count', sa.Integer(), nullable=False),
+        sa.Column('items_count', sa.Integer(), nullable=False),
+        sa.Column('active_items_count', sa.Integer(), nullable=False),
+        sa.Column('customers_count', sa.Integer(), nullable=False),
+        sa.Column('reservations_pending', sa.Integer(), nullable=False),
+        sa.Column('reservations_confirmed', sa.Integer(), nullable=False),
+        sa.Column('reservations_active', sa.Integer(), nullable=False),
+        sa.Column('reservations_completed', sa.Integer(), nullable=False),
+        sa.Column('reservations_cancelled', sa.Integer(), nullable=False),
+        sa.Column('reconciled_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+        sa.PrimaryKeyConstraint('tenant_id')
+        )
+
+    # Reserva sem status conta como pendente, como em usage._status_column
+    op.execute(f"""
+        INSERT INTO tenant_usage (
+            tenant_id, users_count, items_count, active_items_count, customers_count,
+            reservations_pending, reservations_confirmed, reservations_active,
+            reservations_completed, reservations_cancelled, reconciled_at
+        )
+        SELECT
+            tenants.id,
+            {_count('users')},
+            {_count('rental_items')},
+            {_count('rental_items', ' AND rental_items.is_active = TRUE')},
+            {_count('customers')},
+            {_count('reservations', " AND (reservations.status = 'pending' OR reservations.status IS NULL)")},
+            {_count('reservations', " AND reservations.status = 'confirmed'")},
+            {_count('reservations', " AND reservations.status = 'active'")},
+            {_count('reservations', " AND reservations.status = 'completed'")},
+            {_count('reservations', " AND reservations.status = 'cancelled'")},
+            CURRENT_TIMESTAMP
+        FROM tenants
+        WHERE NOT EXISTS (SELECT 1 FROM tenant_usage WHERE tenant_usage.tenant_id = tenants.id)
+    """)
+
+
+def downgrade():
+    op.drop_table('tenant_usage')
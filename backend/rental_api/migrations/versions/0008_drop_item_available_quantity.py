@@ -0,0 +1,31 @@
+"""drop rental_items.available_quantity
+
+A disponibilidade depende do período e vem das reservas (GET
+/rental/items/<id>/availability e src/services/booking.py); a coluna não
+era mantida por nenhuma escrita e só devolvia o valor informado no cadastro.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ALTER direto (SQLite 3.35+), sem batch: recriar a tabela apagaria os
+    # triggers de busca da migração 0003
+    op.execute('ALTER TABLE rental_items DROP COLUMN available_quantity')
+
+
+def downgrade():
+    op.add_column('rental_items', sa.Column('available_quantity', sa.Integer(), nullable=True))
+    op.execute('UPDATE rental_items SET available_quantity = total_quantity')
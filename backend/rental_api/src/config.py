@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 from dotenv import load_dotenv
 
@@ -12,11 +13,36 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Pool de conexões por worker. Cada worker do gunicorn abre até
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW conexões (em cada banco, réplicas incluídas):
+    # some os workers de todas as instâncias contra o max_connections do banco.
+    # Esgotado o pool, a requisição espera DB_POOL_TIMEOUT segundos antes do erro
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 300))
     SQLALCHEMY_ENGINE_OPTIONS = {
         'pool_pre_ping': True,
-        'pool_recycle': 300,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
     }
     
+    # Réplicas de leitura (src/utils/db_routing.py): URLs separadas por vírgula.
+    # GETs dos blueprints listados leem delas; o tenant que escreveu lê do
+    # primário por DB_REPLICA_STICKY_SECONDS (cubra o atraso da replicação)
+    DATABASE_REPLICA_URLS = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',')
+                             if url.strip()]
+    SQLALCHEMY_BINDS = {f'replica_{index}': url for index, url in enumerate(DATABASE_REPLICA_URLS)}
+    DB_REPLICA_BLUEPRINTS = [name.strip() for name in os.environ.get('DB_REPLICA_BLUEPRINTS', 'rental,tenant').split(',')
+                             if name.strip()]
+    DB_REPLICA_STICKY_SECONDS = float(os.environ.get('DB_REPLICA_STICKY_SECONDS', 5))
+    DB_REPLICA_STICKY_BACKEND = os.environ.get('DB_REPLICA_STICKY_BACKEND', 'local')
+    # db.create_all() no boot: cômodo em desenvolvimento e testes; em produção o
+    # schema fica com as migrações (flask db upgrade) e o boot não toca no banco
+    SCHEMA_AUTO_CREATE = os.environ.get('SCHEMA_AUTO_CREATE', 'true').lower() in ('1', 'true', 'yes')
+    
     # JWT Configuration
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or SECRET_KEY
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=int(os.environ.get('JWT_ACCESS_TOKEN_EXPIRES', 24)))
@@ -63,6 +89,81 @@ class Config:
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or 'uploads'
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB
     
+    # Disponibilidade (segundos até recarregar o índice de reservas de um item)
+    AVAILABILITY_INDEX_TTL = int(os.environ.get('AVAILABILITY_INDEX_TTL', 60))
+    
+    # Permissões no JWT (segundos até reler a versão de permissões do tenant)
+    PERMISSION_VERSION_TTL = int(os.environ.get('PERMISSION_VERSION_TTL', 5))
+    
+    # Cache de tenant/categorias por worker (src/services/lookups.py); com
+    # CACHE_REDIS_INVALIDATION as invalidações são repassadas aos outros workers
+    LOOKUP_CACHE_TTL = int(os.environ.get('LOOKUP_CACHE_TTL', 60))
+    LOOKUP_CACHE_SIZE = int(os.environ.get('LOOKUP_CACHE_SIZE', 1024))
+    CACHE_REDIS_INVALIDATION = os.environ.get('CACHE_REDIS_INVALIDATION', '').lower() in ('1', 'true', 'yes')
+    
+    # Cache de respostas GET (src/services/response_cache.py): 'redis', 'local' ou vazio (desligado)
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', '')
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 30))
+    RESPONSE_CACHE_LOCK_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_LOCK_TIMEOUT', 5))
+    
+    # Hash de senhas (src/services/passwords.py): threads por worker do gunicorn
+    # (0 = na thread da requisição) e operações além delas antes de responder 429.
+    # Mantenha WORKERS + QUEUE_DEPTH < GUNICORN_THREADS para sobrar thread às demais rotas
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE_DEPTH = int(os.environ.get('PASSWORD_HASH_QUEUE_DEPTH', 1))
+    PASSWORD_HASH_TIMEOUT = int(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+    
+    # Revogação de tokens no logout (src/services/revocation.py): 'redis' para
+    # valer em todos os workers; 'local' só no processo que fez o logout
+    TOKEN_REVOCATION_BACKEND = os.environ.get('TOKEN_REVOCATION_BACKEND', 'local')
+    REVOCATION_SYNC_INTERVAL = float(os.environ.get('REVOCATION_SYNC_INTERVAL', 2))
+    REVOCATION_REBUILD_INTERVAL = int(os.environ.get('REVOCATION_REBUILD_INTERVAL', 3600))
+    REVOCATION_BLOOM_CAPACITY = int(os.environ.get('REVOCATION_BLOOM_CAPACITY', 100000))
+    REVOCATION_BLOOM_ERROR_RATE = float(os.environ.get('REVOCATION_BLOOM_ERROR_RATE', 0.001))
+    
+    # Limite de requisições por tenant/usuário conforme o plano (src/services/rate_limit.py):
+    # 'local' conta por worker; 'redis' divide um balde global entre os workers
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'local')
+    RATE_LIMIT_LEASE_FRACTION = float(os.environ.get('RATE_LIMIT_LEASE_FRACTION', 0.05))
+    RATE_LIMIT_LEASE_TTL = float(os.environ.get('RATE_LIMIT_LEASE_TTL', 1))
+    RATE_LIMIT_ANONYMOUS_RATE = float(os.environ.get('RATE_LIMIT_ANONYMOUS_RATE', 5))
+    RATE_LIMIT_ANONYMOUS_BURST = int(os.environ.get('RATE_LIMIT_ANONYMOUS_BURST', 20))
+    # Baldes em memória por worker (IPs, usuários, tenants); os parados somem sozinhos
+    RATE_LIMIT_MAX_BUCKETS = int(os.environ.get('RATE_LIMIT_MAX_BUCKETS', 10000))
+    
+    # Proxies reversos à frente da API (o nginx do frontend conta 1): o IP do
+    # cliente (limite de requisições anônimas) e o esquema vêm do X-Forwarded-*.
+    # 0 = IP da conexão. Com proxies, a porta da API não pode ficar exposta
+    # direto: um cliente poderia forjar o X-Forwarded-For
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', 0))
+    
+    # Instrumentação SQL (src/utils/sql_stats.py): cabeçalho Server-Timing e aviso
+    # no log quando o mesmo comando se repete mais de SQL_REPEAT_THRESHOLD vezes (N+1)
+    SQL_SERVER_TIMING = os.environ.get('SQL_SERVER_TIMING', 'true').lower() in ('1', 'true', 'yes')
+    SQL_REPEAT_THRESHOLD = int(os.environ.get('SQL_REPEAT_THRESHOLD', 5))
+    
+    # Métricas (GET /api/metrics): tenants com rótulo próprio por processo e token
+    # Bearer exigido no scrape (obrigatório em produção)
+    METRICS_MAX_TENANTS = int(os.environ.get('METRICS_MAX_TENANTS', 100))
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    # Sem token a rota fica fechada (403): as séries expõem o tráfego de cada tenant
+    METRICS_REQUIRE_TOKEN = os.environ.get('METRICS_REQUIRE_TOKEN', '').lower() in ('1', 'true', 'yes')
+    
+    # Perfis de requisições (src/services/profiling.py): 1 a cada SAMPLE_RATE
+    # requisições (0 = só com o cabeçalho X-Profile: 1 de um admin)
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '').lower() in ('1', 'true', 'yes')
+    PROFILING_SAMPLE_RATE = int(os.environ.get('PROFILING_SAMPLE_RATE', 100))
+    PROFILING_DIR = os.environ.get('PROFILING_DIR') or os.path.join(tempfile.gettempdir(), 'rental_profiles')
+    PROFILING_MAX_FILES = int(os.environ.get('PROFILING_MAX_FILES', 200))
+    PROFILING_INTERVAL = float(os.environ.get('PROFILING_INTERVAL', 0.001))
+    
+    # Prontidão (GET /api/health/ready, src/services/health.py): segundos entre
+    # sondagens de banco/Redis por worker e fração do pool em uso que retorna 503
+    HEALTH_PROBE_INTERVAL = float(os.environ.get('HEALTH_PROBE_INTERVAL', 2))
+    HEALTH_POOL_MAX_SATURATION = float(os.environ.get('HEALTH_POOL_MAX_SATURATION', 1.0))
+    
     # Multi-tenancy
     TENANT_SCHEMA_PREFIX = 'tenant_'
     
@@ -78,12 +179,23 @@ class ProductionConfig(Config):
     """Production configuration."""
     DEBUG = False
     TESTING = False
+    SQL_SERVER_TIMING = os.environ.get('SQL_SERVER_TIMING', '').lower() in ('1', 'true', 'yes')
+    SCHEMA_AUTO_CREATE = os.environ.get('SCHEMA_AUTO_CREATE', '').lower() in ('1', 'true', 'yes')
+    METRICS_REQUIRE_TOKEN = os.environ.get('METRICS_REQUIRE_TOKEN', 'true').lower() in ('1', 'true', 'yes')
+    # Pool esgotado falha rápido: melhor 500 e /api/health/ready em 503 que
+    # requisições presas até o timeout do gunicorn
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+    SQLALCHEMY_ENGINE_OPTIONS = dict(Config.SQLALCHEMY_ENGINE_OPTIONS, pool_timeout=DB_POOL_TIMEOUT)
 
 class TestingConfig(Config):
     """Testing configuration."""
     DEBUG = True
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # SQLite em memória usa StaticPool, que não aceita pool_size/max_overflow
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    RESPONSE_CACHE_BACKEND = 'local'
+    RATE_LIMIT_ENABLED = False
 
 config = {
     'development': DevelopmentConfig,
@@ -1,53 +1,125 @@
+import hmac
 import os
 import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
-from flask_cors import CORS
-from flask_jwt_extended import JWTManager
-from flask_migrate import Migrate
+import click
+from flask import Flask, request, send_from_directory
 
 # Importar configurações
 from src.config import config
 
-# Importar modelos
-from src.models.user import db, User
-from src.models.tenant import Tenant
-from src.models.rental import (
-    Category, RentalItem, Customer, Reservation, 
-    Contract, Payment, CheckInOut
-)
+# Modelos, blueprints e serviços são importados dentro de create_app: importar
+# este módulo (testes, `flask --app src.main ...`) não carrega a aplicação inteira
+
+
+class LazyMigrateGroup(click.Group):
+    """`flask db ...` sem importar Flask-Migrate/alembic a cada boot.
+
+    O Migrate só é registrado quando o comando db é chamado; a partir daí
+    quem interpreta as opções e subcomandos é o grupo do próprio Flask-Migrate.
+    """
+
+    def make_context(self, info_name, args, parent=None, **extra):
+        from flask import current_app
+        from flask_migrate import Migrate
+        from src.models.user import db
+
+        if 'migrate' not in current_app.extensions:
+            Migrate(current_app, db)
+        return current_app.cli.commands['db'].make_context(info_name, args, parent=parent, **extra)
 
-# Importar blueprints
-from src.routes.user import user_bp
-from src.routes.auth import auth_bp
-from src.routes.tenant import tenant_bp
-from src.routes.rental import rental_bp
 
 def create_app(config_name='default'):
+    from flask_cors import CORS
+    from flask_jwt_extended import JWTManager
+
+    # Importar modelos (registra as tabelas no metadata)
+    from src.models.user import db
+    from src.models import tenant, rental  # noqa: F401
+
+    # Importar blueprints
+    from src.routes.user import user_bp
+    from src.routes.auth import auth_bp
+    from src.routes.tenant import tenant_bp
+    from src.routes.rental import rental_bp
+    from src.routes.profiling import profiling_bp
+
+    from src.services import (
+        health, lookups, metrics, passwords, profiling, rate_limit, response_cache, revocation, usage
+    )
+    from src.utils import db_routing, sql_stats
+    from src.utils.cache import caches
+
     app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
     
     # Carregar configurações
     app.config.from_object(config[config_name])
     
+    # IP real do cliente atrás do nginx (X-Forwarded-For/Proto)
+    if app.config.get('PROXY_FIX_X_FOR'):
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        hops = app.config['PROXY_FIX_X_FOR']
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+    
     # Inicializar extensões
     db.init_app(app)
-    migrate = Migrate(app, db)
     jwt = JWTManager(app)
     
+    # GETs de rental/tenant nas réplicas de leitura, com read-your-writes por tenant
+    db_routing.router.init_app(app)
+    
+    # Tokens revogados no logout (filtro de Bloom por worker + Redis)
+    revocation.blocklist.init_app(app)
+    jwt.token_in_blocklist_loader(revocation.token_in_blocklist)
+    
+    # Métricas Prometheus (GET /api/metrics); antes do limite para contar as 429
+    metrics.init_app(app)
+    
+    # Perfis amostrados de requisições (só com PROFILING_ENABLED)
+    profiling.profiler.init_app(app)
+    
+    # Limite de requisições por tenant/usuário (429 antes das rotas)
+    rate_limit.limiter.init_app(app)
+    
     # Configurar CORS
-    CORS(app, origins=app.config.get('CORS_ORIGINS', ['*']))
+    CORS(app, origins=app.config.get('CORS_ORIGINS', ['*']),
+         expose_headers=['ETag', 'X-Cache', 'Retry-After', 'X-RateLimit-Limit', 'X-RateLimit-Remaining',
+                         'X-Query-Count', 'Server-Timing', 'X-DB-Route'])
+    
+    # Consultas por requisição (X-Query-Count, Server-Timing fora de produção, aviso de N+1)
+    sql_stats.init_app(app)
+    
+    # Caches em memória (tenant, categorias) e invalidação entre workers
+    caches.configure(app)
+    
+    # Cache de respostas GET por tenant (X-Cache: HIT/MISS)
+    response_cache.init_app(app)
+    
+    # Pool de hash de senhas (login/cadastro)
+    passwords.hasher.init_app(app)
+    
+    # Sondas de banco/Redis em segundo plano para /api/health/ready
+    health.prober.init_app(app)
     
     # Registrar blueprints
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(user_bp, url_prefix='/api/users')
     app.register_blueprint(tenant_bp, url_prefix='/api/tenants')
     app.register_blueprint(rental_bp, url_prefix='/api/rental')
+    app.register_blueprint(profiling_bp, url_prefix='/api/profiles')
+    
+    # Comandos de linha de comando (flask usage reconcile, flask db upgrade)
+    app.cli.add_command(usage.usage_cli)
+    app.cli.add_command(rate_limit.plans_cli)
+    app.cli.add_command(LazyMigrateGroup('db', help='Migrações do banco (Flask-Migrate).'))
     
-    # Criar tabelas
-    with app.app_context():
-        db.create_all()
+    # Criar tabelas no boot só com SCHEMA_AUTO_CREATE (desenvolvimento/testes);
+    # em produção o schema é das migrações (flask db upgrade)
+    if app.config.get('SCHEMA_AUTO_CREATE'):
+        with app.app_context():
+            db.create_all()
     
     @app.route('/', defaults={'path': ''})
     @app.route('/<path:path>')
@@ -68,12 +140,9 @@ def create_app(config_name='default'):
     @app.route('/api/health')
     def health_check():
         from datetime import datetime
-        try:
-            # Test database connection
-            db.session.execute('SELECT 1')
-            db_status = 'healthy'
-        except Exception as e:
-            db_status = f'unhealthy: {str(e)}'
+        # Resultado da última sondagem em segundo plano, sem consultar o banco aqui
+        database = health.prober.snapshot()['database']
+        db_status = 'healthy' if database['status'] == 'ok' else f"unhealthy: {database.get('error', database['status'])}"
         
         return {
             'status': 'healthy' if db_status == 'healthy' else 'unhealthy',
@@ -86,9 +155,45 @@ def create_app(config_name='default'):
             'message': 'Rental SaaS API is running'
         }
     
+    @app.route('/api/health/live')
+    def liveness():
+        # Só confirma que o worker responde: nenhum I/O
+        return {'status': 'alive'}
+    
+    @app.route('/api/health/ready')
+    def readiness():
+        body, status = health.prober.readiness()
+        return body, status, {'Cache-Control': 'no-store'}
+    
+    @app.route('/api/metrics')
+    def metrics_endpoint():
+        token = app.config.get('METRICS_TOKEN')
+        if not token and app.config.get('METRICS_REQUIRE_TOKEN'):
+            return {'error': 'Métricas desativadas: defina METRICS_TOKEN'}, 403
+        if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return {'error': 'Não autorizado'}, 401
+        body, content_type = metrics.exposition()
+        return body, 200, {'Content-Type': content_type}
+    
+    @app.route('/api/health/cache')
+    def cache_stats():
+        # Acertos/falhas dos caches deste worker
+        return {'pid': os.getpid(), 'caches': lookups.stats()}
+    
     return app
 
-app = create_app(os.environ.get('FLASK_ENV', 'development'))
+def __getattr__(name):
+    # `from src.main import app, db` continua funcionando, mas a aplicação só
+    # é criada quando alguém a pede (servidor, flask CLI), uma vez por processo
+    if name == 'app':
+        app = globals()['app'] = create_app(os.environ.get('FLASK_ENV', 'development'))
+        return app
+    if name == 'db':
+        from src.models.user import db
+        return db
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Servidor de desenvolvimento; em produção use gunicorn (src/wsgi.py)
+    app = create_app(os.environ.get('FLASK_ENV', 'development'))
+    app.run(host='0.0.0.0', port=5000, debug=app.config.get('DEBUG', False))
@@ -1,6 +1,6 @@
 from datetime import datetime
 from decimal import Decimal
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Numeric, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Numeric, JSON, text
 from sqlalchemy.orm import relationship
 from enum import Enum
 from src.models.user import db
@@ -32,7 +32,61 @@ class PaymentMethod(Enum):
     BANK_SLIP = "bank_slip"
     CASH = "cash"
 
-class Category(db.Model):
+def _iso(value):
+    return value.isoformat() if value else None
+
+def _float(value):
+    return float(value) if value else None
+
+def split_paths(paths):
+    """Separa caminhos como 'item.category' em nomes deste nível e sub-caminhos."""
+    own, nested = set(), {}
+    for path in paths:
+        head, _, rest = path.partition('.')
+        if rest:
+            nested.setdefault(head, set()).add(rest)
+        else:
+            own.add(head)
+    return own, nested
+
+class SerializableMixin:
+    """Serialização com campos esparsos (fields) e incorporação controlada (expand).
+    
+    Sem argumentos, to_dict() mantém o formato completo de sempre. Com fields,
+    só os campos pedidos são lidos do objeto, então colunas não carregadas
+    (load_only) não disparam consultas extras.
+    """
+    SERIALIZERS = {}       # campo -> função que recebe o objeto
+    COMPUTED_COLUMNS = {}  # campo calculado -> colunas de que depende
+    RELATIONS = ()         # relacionamentos que podem ser incorporados
+    DEFAULT_EXPAND = ()    # incorporados quando expand não é informado
+    
+    def to_dict(self, fields=None, expand=None):
+        own_fields, nested_fields = split_paths(fields) if fields is not None else (None, {})
+        
+        if expand is None:
+            relations = {name: None for name in self.DEFAULT_EXPAND}
+        else:
+            own_expand, nested_expand = split_paths(expand)
+            relations = {
+                name: nested_expand.get(name, set())
+                for name in own_expand | set(nested_expand)
+                if name in self.RELATIONS
+            }
+        
+        data = {
+            name: serialize(self)
+            for name, serialize in self.SERIALIZERS.items()
+            if own_fields is None or name in own_fields
+        }
+        for name, sub_expand in relations.items():
+            related = getattr(self, name)
+            data[name] = related.to_dict(
+                fields=nested_fields.get(name), expand=sub_expand
+            ) if related else None
+        return data
+
+class Category(SerializableMixin, db.Model):
     """Modelo para categorias de itens de locação."""
     __tablename__ = 'categories'
     
@@ -55,19 +109,18 @@ class Category(db.Model):
         db.UniqueConstraint('tenant_id', 'name', name='uq_tenant_category_name'),
     )
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'tenant_id': self.tenant_id,
-            'name': self.name,
-            'description': self.description,
-            'icon': self.icon,
-            'color': self.color,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    SERIALIZERS = {
+        'id': lambda c: c.id,
+        'tenant_id': lambda c: c.tenant_id,
+        'name': lambda c: c.name,
+        'description': lambda c: c.description,
+        'icon': lambda c: c.icon,
+        'color': lambda c: c.color,
+        'created_at': lambda c: _iso(c.created_at),
+        'updated_at': lambda c: _iso(c.updated_at)
+    }
 
-class RentalItem(db.Model):
+class RentalItem(SerializableMixin, db.Model):
     """Modelo para itens disponíveis para locação."""
     __tablename__ = 'rental_items'
     
@@ -89,7 +142,6 @@ class RentalItem(db.Model):
     
     # Estoque e disponibilidade
     total_quantity = Column(Integer, default=1)
-    available_quantity = Column(Integer, default=1)
     min_rental_hours = Column(Integer, default=1)
     max_rental_days = Column(Integer, nullable=True)
     
@@ -115,37 +167,44 @@ class RentalItem(db.Model):
     category = relationship("Category", back_populates="items")
     reservations = relationship("Reservation", back_populates="item")
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'tenant_id': self.tenant_id,
-            'category_id': self.category_id,
-            'name': self.name,
-            'description': self.description,
-            'sku': self.sku,
-            'barcode': self.barcode,
-            'hourly_price': float(self.hourly_price) if self.hourly_price else None,
-            'daily_price': float(self.daily_price) if self.daily_price else None,
-            'weekly_price': float(self.weekly_price) if self.weekly_price else None,
-            'monthly_price': float(self.monthly_price) if self.monthly_price else None,
-            'total_quantity': self.total_quantity,
-            'available_quantity': self.available_quantity,
-            'min_rental_hours': self.min_rental_hours,
-            'max_rental_days': self.max_rental_days,
-            'status': self.status,
-            'is_active': self.is_active,
-            'requires_deposit': self.requires_deposit,
-            'deposit_amount': float(self.deposit_amount) if self.deposit_amount else None,
-            'attributes': self.attributes,
-            'specifications': self.specifications,
-            'images': self.images,
-            'documents': self.documents,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'category': self.category.to_dict() if self.category else None
-        }
+    # Índices para as consultas por tenant (ver migrations/versions/0002)
+    __table_args__ = (
+        db.Index('ix_rental_items_tenant_id_id', 'tenant_id', 'id'),
+        db.Index('ix_rental_items_tenant_category', 'tenant_id', 'category_id'),
+        db.Index('ix_rental_items_tenant_status', 'tenant_id', 'status'),
+        db.Index('ix_rental_items_tenant_barcode', 'tenant_id', 'barcode'),
+    )
+    
+    SERIALIZERS = {
+        'id': lambda i: i.id,
+        'tenant_id': lambda i: i.tenant_id,
+        'category_id': lambda i: i.category_id,
+        'name': lambda i: i.name,
+        'description': lambda i: i.description,
+        'sku': lambda i: i.sku,
+        'barcode': lambda i: i.barcode,
+        'hourly_price': lambda i: _float(i.hourly_price),
+        'daily_price': lambda i: _float(i.daily_price),
+        'weekly_price': lambda i: _float(i.weekly_price),
+        'monthly_price': lambda i: _float(i.monthly_price),
+        'total_quantity': lambda i: i.total_quantity,
+        'min_rental_hours': lambda i: i.min_rental_hours,
+        'max_rental_days': lambda i: i.max_rental_days,
+        'status': lambda i: i.status,
+        'is_active': lambda i: i.is_active,
+        'requires_deposit': lambda i: i.requires_deposit,
+        'deposit_amount': lambda i: _float(i.deposit_amount),
+        'attributes': lambda i: i.attributes,
+        'specifications': lambda i: i.specifications,
+        'images': lambda i: i.images,
+        'documents': lambda i: i.documents,
+        'created_at': lambda i: _iso(i.created_at),
+        'updated_at': lambda i: _iso(i.updated_at)
+    }
+    RELATIONS = ('category',)
+    DEFAULT_EXPAND = ('category',)
 
-class Customer(db.Model):
+class Customer(SerializableMixin, db.Model):
     """Modelo para clientes que fazem locações."""
     __tablename__ = 'customers'
     
@@ -185,35 +244,40 @@ class Customer(db.Model):
     # Relacionamentos
     reservations = relationship("Reservation", back_populates="customer")
     
+    __table_args__ = (
+        db.Index('ix_customers_tenant_id_id', 'tenant_id', 'id'),
+        db.Index('ix_customers_tenant_email', 'tenant_id', 'email'),
+    )
+    
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}"
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'tenant_id': self.tenant_id,
-            'user_id': self.user_id,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'full_name': self.get_full_name(),
-            'email': self.email,
-            'phone': self.phone,
-            'document_type': self.document_type,
-            'document_number': self.document_number,
-            'address': self.address,
-            'city': self.city,
-            'state': self.state,
-            'zip_code': self.zip_code,
-            'country': self.country,
-            'emergency_contact_name': self.emergency_contact_name,
-            'emergency_contact_phone': self.emergency_contact_phone,
-            'is_active': self.is_active,
-            'credit_limit': float(self.credit_limit) if self.credit_limit else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    SERIALIZERS = {
+        'id': lambda c: c.id,
+        'tenant_id': lambda c: c.tenant_id,
+        'user_id': lambda c: c.user_id,
+        'first_name': lambda c: c.first_name,
+        'last_name': lambda c: c.last_name,
+        'full_name': lambda c: c.get_full_name(),
+        'email': lambda c: c.email,
+        'phone': lambda c: c.phone,
+        'document_type': lambda c: c.document_type,
+        'document_number': lambda c: c.document_number,
+        'address': lambda c: c.address,
+        'city': lambda c: c.city,
+        'state': lambda c: c.state,
+        'zip_code': lambda c: c.zip_code,
+        'country': lambda c: c.country,
+        'emergency_contact_name': lambda c: c.emergency_contact_name,
+        'emergency_contact_phone': lambda c: c.emergency_contact_phone,
+        'is_active': lambda c: c.is_active,
+        'credit_limit': lambda c: _float(c.credit_limit),
+        'created_at': lambda c: _iso(c.created_at),
+        'updated_at': lambda c: _iso(c.updated_at)
+    }
+    COMPUTED_COLUMNS = {'full_name': ('first_name', 'last_name')}
 
-class Reservation(db.Model):
+class Reservation(SerializableMixin, db.Model):
     """Modelo para reservas de locação."""
     __tablename__ = 'reservations'
     
@@ -263,35 +327,53 @@ class Reservation(db.Model):
     payments = relationship("Payment", back_populates="reservation")
     checkins = relationship("CheckInOut", back_populates="reservation")
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'tenant_id': self.tenant_id,
-            'item_id': self.item_id,
-            'customer_id': self.customer_id,
-            'reservation_code': self.reservation_code,
-            'start_date': self.start_date.isoformat() if self.start_date else None,
-            'end_date': self.end_date.isoformat() if self.end_date else None,
-            'actual_start_date': self.actual_start_date.isoformat() if self.actual_start_date else None,
-            'actual_end_date': self.actual_end_date.isoformat() if self.actual_end_date else None,
-            'quantity': self.quantity,
-            'unit_price': float(self.unit_price) if self.unit_price else None,
-            'total_price': float(self.total_price) if self.total_price else None,
-            'deposit_amount': float(self.deposit_amount) if self.deposit_amount else None,
-            'additional_fees': float(self.additional_fees) if self.additional_fees else None,
-            'discount_amount': float(self.discount_amount) if self.discount_amount else None,
-            'final_amount': float(self.final_amount) if self.final_amount else None,
-            'status': self.status,
-            'is_recurring': self.is_recurring,
-            'recurring_pattern': self.recurring_pattern,
-            'notes': self.notes,
-            'internal_notes': self.internal_notes,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'created_by': self.created_by,
-            'item': self.item.to_dict() if self.item else None,
-            'customer': self.customer.to_dict() if self.customer else None
-        }
+    __table_args__ = (
+        db.Index('ix_reservations_tenant_start', 'tenant_id', 'start_date', 'id'),
+        db.Index('ix_reservations_tenant_status', 'tenant_id', 'status'),
+        db.Index('ix_reservations_tenant_created', 'tenant_id', 'created_at'),
+        db.Index('ix_reservations_tenant_item', 'tenant_id', 'item_id'),
+        db.Index('ix_reservations_tenant_customer', 'tenant_id', 'customer_id'),
+        # Parciais: próximas reservas do dashboard e reservas que ocupam unidades
+        db.Index(
+            'ix_reservations_upcoming', 'tenant_id', 'start_date',
+            postgresql_where=text("status IN ('pending', 'confirmed')"),
+            sqlite_where=text("status IN ('pending', 'confirmed')")
+        ),
+        db.Index(
+            'ix_reservations_item_blocking', 'item_id', 'start_date', 'end_date',
+            postgresql_where=text("status IN ('pending', 'confirmed', 'active')"),
+            sqlite_where=text("status IN ('pending', 'confirmed', 'active')")
+        ),
+    )
+    
+    SERIALIZERS = {
+        'id': lambda r: r.id,
+        'tenant_id': lambda r: r.tenant_id,
+        'item_id': lambda r: r.item_id,
+        'customer_id': lambda r: r.customer_id,
+        'reservation_code': lambda r: r.reservation_code,
+        'start_date': lambda r: _iso(r.start_date),
+        'end_date': lambda r: _iso(r.end_date),
+        'actual_start_date': lambda r: _iso(r.actual_start_date),
+        'actual_end_date': lambda r: _iso(r.actual_end_date),
+        'quantity': lambda r: r.quantity,
+        'unit_price': lambda r: _float(r.unit_price),
+        'total_price': lambda r: _float(r.total_price),
+        'deposit_amount': lambda r: _float(r.deposit_amount),
+        'additional_fees': lambda r: _float(r.additional_fees),
+        'discount_amount': lambda r: _float(r.discount_amount),
+        'final_amount': lambda r: _float(r.final_amount),
+        'status': lambda r: r.status,
+        'is_recurring': lambda r: r.is_recurring,
+        'recurring_pattern': lambda r: r.recurring_pattern,
+        'notes': lambda r: r.notes,
+        'internal_notes': lambda r: r.internal_notes,
+        'created_at': lambda r: _iso(r.created_at),
+        'updated_at': lambda r: _iso(r.updated_at),
+        'created_by': lambda r: r.created_by
+    }
+    RELATIONS = ('item', 'customer')
+    DEFAULT_EXPAND = ('item', 'customer')
 
 class Contract(db.Model):
     """Modelo para contratos de locação."""
@@ -299,7 +381,7 @@ class Contract(db.Model):
     
     id = Column(Integer, primary_key=True)
     tenant_id = Column(Integer, ForeignKey('tenants.id'), nullable=False)
-    reservation_id = Column(Integer, ForeignKey('reservations.id'), nullable=False)
+    reservation_id = Column(Integer, ForeignKey('reservations.id'), nullable=False, index=True)
     
     # Informações do contrato
     contract_number = Column(String(50), unique=True, nullable=False)
@@ -347,7 +429,7 @@ class Payment(db.Model):
     
     id = Column(Integer, primary_key=True)
     tenant_id = Column(Integer, ForeignKey('tenants.id'), nullable=False)
-    reservation_id = Column(Integer, ForeignKey('reservations.id'), nullable=False)
+    reservation_id = Column(Integer, ForeignKey('reservations.id'), nullable=False, index=True)
     
     # Informações do pagamento
     payment_code = Column(String(50), unique=True, nullable=False)
@@ -401,7 +483,7 @@ class CheckInOut(db.Model):
     
     id = Column(Integer, primary_key=True)
     tenant_id = Column(Integer, ForeignKey('tenants.id'), nullable=False)
-    reservation_id = Column(Integer, ForeignKey('reservations.id'), nullable=False)
+    reservation_id = Column(Integer, ForeignKey('reservations.id'), nullable=False, index=True)
     
     # Tipo de operação
     operation_type = Column(String(10), nullable=False)  # checkin, checkout
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey
 from src.models.user import db
 
 class Tenant(db.Model):
@@ -22,6 +22,13 @@ class Tenant(db.Model):
     max_users = Column(Integer, default=10)
     max_items = Column(Integer, default=100)
     
+    # Plano contratado: define os limites de requisições (src/services/rate_limit.py)
+    plan = Column(String(20), nullable=False, default='basic', server_default='basic')
+    
+    # Incrementada a cada mudança de papel/permissões de um usuário do tenant;
+    # tokens emitidos com versão anterior são conferidos no banco
+    permissions_version = Column(Integer, nullable=False, default=0, server_default='0')
+    
     # Configurações de pagamento
     stripe_account_id = Column(String(255), nullable=True)
     paypal_account_id = Column(String(255), nullable=True)
@@ -58,6 +65,7 @@ class Tenant(db.Model):
             'is_active': self.is_active,
             'max_users': self.max_users,
             'max_items': self.max_items,
+            'plan': self.plan,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'email_notifications': self.email_notifications,
@@ -80,3 +88,57 @@ class Tenant(db.Model):
         )
         return tenant
 
+
+class TenantUsage(db.Model):
+    """Contadores de uso por tenant, mantidos a cada escrita (ver services/usage.py)."""
+    __tablename__ = 'tenant_usage'
+    
+    tenant_id = Column(Integer, ForeignKey('tenants.id'), primary_key=True)
+    
+    users_count = Column(Integer, nullable=False, default=0)
+    items_count = Column(Integer, nullable=False, default=0)
+    active_items_count = Column(Integer, nullable=False, default=0)
+    customers_count = Column(Integer, nullable=False, default=0)
+    
+    # Reservas por status
+    reservations_pending = Column(Integer, nullable=False, default=0)
+    reservations_confirmed = Column(Integer, nullable=False, default=0)
+    reservations_active = Column(Integer, nullable=False, default=0)
+    reservations_completed = Column(Integer, nullable=False, default=0)
+    reservations_cancelled = Column(Integer, nullable=False, default=0)
+    
+    # Metadados
+    reconciled_at = Column(DateTime, nullable=True)
+    
+    COUNTER_COLUMNS = (
+        'users_count', 'items_count', 'active_items_count', 'customers_count',
+        'reservations_pending', 'reservations_confirmed', 'reservations_active',
+        'reservations_completed', 'reservations_cancelled'
+    )
+    
+    def __repr__(self):
+        return f'<TenantUsage {self.tenant_id}>'
+    
+    def reservations_by_status(self):
+        """Retorna a quantidade de reservas por status."""
+        return {
+            'pending': self.reservations_pending,
+            'confirmed': self.reservations_confirmed,
+            'active': self.reservations_active,
+            'completed': self.reservations_completed,
+            'cancelled': self.reservations_cancelled
+        }
+    
+    def to_dict(self):
+        """Converte o objeto para dicionário."""
+        reservations = self.reservations_by_status()
+        return {
+            'tenant_id': self.tenant_id,
+            'users': self.users_count,
+            'items': self.items_count,
+            'active_items': self.active_items_count,
+            'customers': self.customers_count,
+            'reservations': reservations,
+            'reservations_total': sum(reservations.values()),
+            'reconciled_at': self.reconciled_at.isoformat() if self.reconciled_at else None
+        }
@@ -4,7 +4,10 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text
 from sqlalchemy.orm import relationship
 
-db = SQLAlchemy()
+from src.utils.db_routing import RoutingSession
+
+# Leituras de GETs podem ir para réplicas (DATABASE_REPLICA_URLS)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class User(db.Model):
     """Modelo para representar usuários do sistema."""
@@ -43,6 +46,9 @@ class User(db.Model):
     __table_args__ = (
         db.UniqueConstraint('tenant_id', 'username', name='uq_tenant_username'),
         db.UniqueConstraint('tenant_id', 'email', name='uq_tenant_email'),
+        db.Index('ix_users_tenant_id_id', 'tenant_id', 'id'),
+        # Login sem tenant identificado (busca só pelo email)
+        db.Index('ix_users_email', 'email'),
     )
     
     def set_password(self, password):
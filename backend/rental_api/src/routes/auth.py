@@ -4,10 +4,12 @@ from flask_jwt_extended import (
     jwt_required, get_jwt_identity, get_jwt
 )
 from datetime import datetime, timedelta
+from urllib.parse import urlsplit
 import uuid
 
 from src.models.user import db, User
 from src.models.tenant import Tenant
+from src.services import lookups, passwords, permissions, revocation
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -28,6 +30,9 @@ def register():
         if existing_tenant:
             return jsonify({'error': 'Subdomínio já está em uso'}), 400
         
+        # Hash depois das verificações baratas e antes das escritas
+        password_hash = passwords.hasher.hash(data['password'])
+        
         # Criar tenant
         tenant = Tenant.create_tenant(
             name=data['tenant_name'],
@@ -56,19 +61,19 @@ def register():
             first_name=data.get('first_name'),
             last_name=data.get('last_name'),
             phone=data.get('phone'),
-            role='admin'
+            role='admin',
+            password_hash=password_hash
         )
-        user.set_password(data['password'])
         
         db.session.add(user)
         db.session.commit()
         
         # Criar tokens
         access_token = create_access_token(
-            identity=user.id,
-            additional_claims={'tenant_id': tenant.id, 'role': user.role}
+            identity=str(user.id),
+            additional_claims=permissions.token_claims(user, tenant)
         )
-        refresh_token = create_refresh_token(identity=user.id)
+        refresh_token = create_refresh_token(identity=str(user.id))
         
         return jsonify({
             'message': 'Usuário e tenant criados com sucesso',
@@ -78,10 +83,41 @@ def register():
             'tenant': tenant.to_dict()
         }), 201
         
+    except passwords.HashingBusy:
+        db.session.rollback()
+        return jsonify({'error': 'Servidor ocupado, tente novamente em instantes'}), 429, {'Retry-After': '1'}
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+def _own_hosts():
+    """Hosts da própria requisição (API e página de origem), sem porta."""
+    hosts = [request.host, urlsplit(request.headers.get('Origin') or '').netloc]
+    return {host.split(':', 1)[0].lower().rstrip('.') for host in hosts if host}
+
+def find_user_by_email(data):
+    """Usuário com o email informado, no tenant da requisição quando possível.
+
+    O tenant vem do campo 'tenant' do corpo (subdomínio ou domínio) ou do
+    Host. Um 'tenant' que não existe retorna None (401), a não ser que seja
+    só o host da própria requisição: o SPA manda o host da página, que em
+    localhost ou no domínio principal do app não é um tenant. Sem tenant o
+    email é buscado em todos os tenants e só vale se estiver em um deles,
+    para que cada login custe no máximo um hash de senha.
+    """
+    tenant = (data.get('tenant') or '').strip()
+    tenant_id = lookups.resolve_tenant_id(tenant) if tenant else None
+    if tenant_id is None and tenant and tenant.split(':', 1)[0].lower().rstrip('.') not in _own_hosts():
+        return None
+    if tenant_id is None:
+        tenant_id = lookups.resolve_tenant_id(request.host)
+
+    query = User.query.filter_by(email=data['email'])
+    if tenant_id is not None:
+        return query.filter_by(tenant_id=tenant_id).first()
+    users = query.limit(2).all()
+    return users[0] if len(users) == 1 else None
+
 @auth_bp.route('/login', methods=['POST'])
 def login():
     """Autentica um usuário."""
@@ -91,17 +127,18 @@ def login():
         if not data.get('email') or not data.get('password'):
             return jsonify({'error': 'Email e senha são obrigatórios'}), 400
         
-        # Buscar usuário por email
-        user = User.query.filter_by(email=data['email']).first()
+        # Buscar usuário por tenant + email. Email em mais de uma empresa sem
+        # tenant também é 401, para não revelar onde ele está cadastrado
+        user = find_user_by_email(data)
         
-        if not user or not user.check_password(data['password']):
+        if not user or not passwords.check_password(user, data['password']):
             return jsonify({'error': 'Credenciais inválidas'}), 401
         
         if not user.is_active:
             return jsonify({'error': 'Usuário inativo'}), 401
         
         # Verificar se o tenant está ativo
-        tenant = Tenant.query.get(user.tenant_id)
+        tenant = lookups.get_tenant(user.tenant_id)
         if not tenant or not tenant.is_active:
             return jsonify({'error': 'Tenant inativo'}), 401
         
@@ -111,10 +148,10 @@ def login():
         
         # Criar tokens
         access_token = create_access_token(
-            identity=user.id,
-            additional_claims={'tenant_id': user.tenant_id, 'role': user.role}
+            identity=str(user.id),
+            additional_claims=permissions.token_claims(user, tenant)
         )
-        refresh_token = create_refresh_token(identity=user.id)
+        refresh_token = create_refresh_token(identity=str(user.id))
         
         return jsonify({
             'message': 'Login realizado com sucesso',
@@ -124,6 +161,9 @@ def login():
             'tenant': tenant.to_dict()
         }), 200
         
+    except passwords.HashingBusy:
+        db.session.rollback()
+        return jsonify({'error': 'Servidor ocupado, tente novamente em instantes'}), 429, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -138,10 +178,12 @@ def refresh():
         if not user or not user.is_active:
             return jsonify({'error': 'Usuário não encontrado ou inativo'}), 401
         
-        # Criar novo token de acesso
+        tenant = db.session.get(Tenant, user.tenant_id)
+        
+        # Criar novo token de acesso (com papel e permissões atuais)
         access_token = create_access_token(
-            identity=user.id,
-            additional_claims={'tenant_id': user.tenant_id, 'role': user.role}
+            identity=str(user.id),
+            additional_claims=permissions.token_claims(user, tenant)
         )
         
         return jsonify({
@@ -162,7 +204,7 @@ def get_current_user():
         if not user:
             return jsonify({'error': 'Usuário não encontrado'}), 404
         
-        tenant = Tenant.query.get(user.tenant_id)
+        tenant = lookups.get_tenant(user.tenant_id)
         
         return jsonify({
             'user': user.to_dict(),
@@ -173,11 +215,16 @@ def get_current_user():
         return jsonify({'error': str(e)}), 500
 
 @auth_bp.route('/logout', methods=['POST'])
-@jwt_required()
+@jwt_required(verify_type=False)
 def logout():
-    """Logout do usuário (invalidar token)."""
-    # Em uma implementação completa, você adicionaria o token a uma blacklist
-    return jsonify({'message': 'Logout realizado com sucesso'}), 200
+    """Logout do usuário (revoga o token enviado, de acesso ou de refresh)."""
+    try:
+        claims = get_jwt()
+        revocation.blocklist.revoke(claims['jti'], claims['exp'])
+        return jsonify({'message': 'Logout realizado com sucesso'}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 @auth_bp.route('/change-password', methods=['POST'])
 @jwt_required()
@@ -195,14 +242,17 @@ def change_password():
         if not data.get('current_password') or not data.get('new_password'):
             return jsonify({'error': 'Senha atual e nova senha são obrigatórias'}), 400
         
-        if not user.check_password(data['current_password']):
+        if not passwords.check_password(user, data['current_password']):
             return jsonify({'error': 'Senha atual incorreta'}), 401
         
-        user.set_password(data['new_password'])
+        passwords.set_password(user, data['new_password'])
         db.session.commit()
         
         return jsonify({'message': 'Senha alterada com sucesso'}), 200
         
+    except passwords.HashingBusy:
+        db.session.rollback()
+        return jsonify({'error': 'Servidor ocupado, tente novamente em instantes'}), 429, {'Retry-After': '1'}
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -216,7 +266,7 @@ def forgot_password():
         if not data.get('email'):
             return jsonify({'error': 'Email é obrigatório'}), 400
         
-        user = User.query.filter_by(email=data['email']).first()
+        user = find_user_by_email(data)
         
         if user:
             # Aqui você implementaria o envio de email com token de reset
@@ -0,0 +1,39 @@
+from flask import Blueprint, request, jsonify, send_file
+from flask_jwt_extended import jwt_required, get_jwt
+
+from src.routes.tenant import require_admin
+from src.services.profiling import profiler
+
+profiling_bp = Blueprint('profiling', __name__)
+
+@profiling_bp.route('/', methods=['GET'])
+@jwt_required()
+@require_admin()
+def list_profiles():
+    """Lista os perfis recentes do tenant (filtro opcional por endpoint)."""
+    try:
+        if not profiler.enabled:
+            return jsonify({'error': 'Perfilamento desligado (PROFILING_ENABLED)'}), 404
+        
+        claims = get_jwt()
+        profiles = profiler.list(claims.get('tenant_id'), request.args.get('endpoint'))
+        return jsonify({'profiles': profiles}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@profiling_bp.route('/<name>', methods=['GET'])
+@jwt_required()
+@require_admin()
+def download_profile(name):
+    """Baixa um perfil (JSON do speedscope)."""
+    try:
+        claims = get_jwt()
+        path = profiler.path(name, claims.get('tenant_id')) if profiler.enabled else None
+        if not path:
+            return jsonify({'error': 'Perfil não encontrado'}), 404
+        
+        return send_file(path, mimetype='application/json', as_attachment=True, download_name=name)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -3,12 +3,16 @@ from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from datetime import datetime, timedelta
 from decimal import Decimal
 import uuid
+from sqlalchemy.orm import joinedload
 
 from src.models.user import db, User
 from src.models.rental import (
     Category, RentalItem, Customer, Reservation, 
     Contract, Payment, CheckInOut, ReservationStatus, PaymentStatus
 )
+from src.services.availability import availability
+from src.services import booking, dashboard, lookups, pagination, permissions, projection, response_cache
+from src.services import search as text_search
 
 rental_bp = Blueprint('rental', __name__)
 
@@ -18,16 +22,25 @@ def get_current_tenant_id():
     return claims.get('tenant_id')
 
 def require_permission(permission):
-    """Decorator para verificar permissões."""
+    """Decorator para verificar permissões.
+
+    Autoriza pelas claims do token; o usuário só é lido do banco quando as
+    permissões do tenant mudaram depois da emissão do token.
+    """
     def decorator(f):
         def wrapper(*args, **kwargs):
-            current_user_id = get_jwt_identity()
-            user = User.query.get(current_user_id)
-            
-            if not user:
-                return jsonify({'error': 'Usuário não encontrado'}), 404
+            claims = get_jwt()
+            if permissions.claims_current(claims):
+                allowed = permissions.claims_allow(claims, permission)
+            else:
+                user = db.session.get(User, int(get_jwt_identity()))
+                
+                if not user:
+                    return jsonify({'error': 'Usuário não encontrado'}), 404
+                
+                allowed = user.is_active and (user.role == 'admin' or user.has_permission(permission))
             
-            if user.role == 'admin' or user.has_permission(permission):
+            if allowed:
                 return f(*args, **kwargs)
             
             return jsonify({'error': 'Permissão negada'}), 403
@@ -39,13 +52,12 @@ def require_permission(permission):
 
 @rental_bp.route('/categories', methods=['GET'])
 @jwt_required()
+@response_cache.cached('categories')
 def get_categories():
     """Lista categorias do tenant."""
     try:
         tenant_id = get_current_tenant_id()
-        categories = Category.query.filter_by(tenant_id=tenant_id).all()
-        
-        return jsonify([category.to_dict() for category in categories]), 200
+        return jsonify(lookups.get_categories(tenant_id)), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -86,6 +98,7 @@ def create_category():
 
 @rental_bp.route('/items', methods=['GET'])
 @jwt_required()
+@response_cache.cached('items')
 def get_items():
     """Lista itens de locação do tenant."""
     try:
@@ -97,8 +110,11 @@ def get_items():
         category_id = request.args.get('category_id', type=int)
         status = request.args.get('status')
         search = request.args.get('search')
+        fields, expand = projection.from_request(request.args)
         
-        query = RentalItem.query.filter_by(tenant_id=tenant_id)
+        query = RentalItem.query.filter_by(tenant_id=tenant_id).options(
+            *projection.loader_options(RentalItem, fields, expand)
+        )
         
         if category_id:
             query = query.filter_by(category_id=category_id)
@@ -107,15 +123,23 @@ def get_items():
             query = query.filter_by(status=status)
         
         if search:
-            query = query.filter(
-                RentalItem.name.contains(search) |
-                RentalItem.description.contains(search)
+            query = text_search.apply(query, RentalItem, tenant_id, search,
+                                      ranked=not pagination.wants_cursor(request.args))
+        
+        if pagination.wants_cursor(request.args):
+            cursor_page = pagination.keyset_paginate(
+                query, [RentalItem.id], request.args,
+                cache_key=pagination.cache_key_for('items', tenant_id, request.args)
             )
+            return jsonify({
+                'items': [item.to_dict(fields, expand) for item in cursor_page.items],
+                'pagination': cursor_page.to_dict()
+            }), 200
         
         items = query.paginate(page=page, per_page=per_page, error_out=False)
         
         return jsonify({
-            'items': [item.to_dict() for item in items.items],
+            'items': [item.to_dict(fields, expand) for item in items.items],
             'pagination': {
                 'page': page,
                 'pages': items.pages,
@@ -124,6 +148,8 @@ def get_items():
             }
         }), 200
         
+    except pagination.InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -151,7 +177,6 @@ def create_item():
             weekly_price=Decimal(str(data['weekly_price'])) if data.get('weekly_price') else None,
             monthly_price=Decimal(str(data['monthly_price'])) if data.get('monthly_price') else None,
             total_quantity=data.get('total_quantity', 1),
-            available_quantity=data.get('available_quantity', 1),
             min_rental_hours=data.get('min_rental_hours', 1),
             max_rental_days=data.get('max_rental_days'),
             requires_deposit=data.get('requires_deposit', False),
@@ -207,7 +232,7 @@ def update_item(item_id):
         # Campos que podem ser atualizados
         updatable_fields = [
             'category_id', 'name', 'description', 'sku', 'barcode',
-            'total_quantity', 'available_quantity', 'min_rental_hours',
+            'total_quantity', 'min_rental_hours',
             'max_rental_days', 'status', 'is_active', 'requires_deposit',
             'attributes', 'specifications', 'images', 'documents'
         ]
@@ -234,6 +259,42 @@ def update_item(item_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@rental_bp.route('/items/<int:item_id>/availability', methods=['GET'])
+@jwt_required()
+def get_item_availability(item_id):
+    """Retorna as unidades livres de um item em um período."""
+    try:
+        tenant_id = get_current_tenant_id()
+        item = RentalItem.query.filter_by(id=item_id, tenant_id=tenant_id).first()
+        
+        if not item:
+            return jsonify({'error': 'Item não encontrado'}), 404
+        
+        start_date = request.args.get('start_date')
+        end_date = request.args.get('end_date')
+        
+        if not start_date or not end_date:
+            return jsonify({'error': 'start_date e end_date são obrigatórios'}), 400
+        
+        start_dt = datetime.fromisoformat(start_date)
+        end_dt = datetime.fromisoformat(end_date)
+        
+        if end_dt <= start_dt:
+            return jsonify({'error': 'Data final deve ser posterior à data inicial'}), 400
+        
+        free = availability.free_units(item, start_dt, end_dt)
+        
+        return jsonify({
+            'item_id': item.id,
+            'start_date': start_dt.isoformat(),
+            'end_date': end_dt.isoformat(),
+            'total_quantity': item.total_quantity,
+            'available_quantity': free
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 # ===== CLIENTES =====
 
 @rental_bp.route('/customers', methods=['GET'])
@@ -246,20 +307,30 @@ def get_customers():
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         search = request.args.get('search')
+        fields, expand = projection.from_request(request.args)
         
-        query = Customer.query.filter_by(tenant_id=tenant_id)
+        query = Customer.query.filter_by(tenant_id=tenant_id).options(
+            *projection.loader_options(Customer, fields, expand)
+        )
         
         if search:
-            query = query.filter(
-                Customer.first_name.contains(search) |
-                Customer.last_name.contains(search) |
-                Customer.email.contains(search)
+            query = text_search.apply(query, Customer, tenant_id, search,
+                                      ranked=not pagination.wants_cursor(request.args))
+        
+        if pagination.wants_cursor(request.args):
+            cursor_page = pagination.keyset_paginate(
+                query, [Customer.id], request.args,
+                cache_key=pagination.cache_key_for('customers', tenant_id, request.args)
             )
+            return jsonify({
+                'customers': [customer.to_dict(fields, expand) for customer in cursor_page.items],
+                'pagination': cursor_page.to_dict()
+            }), 200
         
         customers = query.paginate(page=page, per_page=per_page, error_out=False)
         
         return jsonify({
-            'customers': [customer.to_dict() for customer in customers.items],
+            'customers': [customer.to_dict(fields, expand) for customer in customers.items],
             'pagination': {
                 'page': page,
                 'pages': customers.pages,
@@ -268,6 +339,8 @@ def get_customers():
             }
         }), 200
         
+    except pagination.InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -332,8 +405,11 @@ def get_reservations():
         customer_id = request.args.get('customer_id', type=int)
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
+        fields, expand = projection.from_request(request.args)
         
-        query = Reservation.query.filter_by(tenant_id=tenant_id)
+        query = Reservation.query.filter_by(tenant_id=tenant_id).options(
+            *projection.loader_options(Reservation, fields, expand)
+        )
         
         if status:
             query = query.filter_by(status=status)
@@ -352,12 +428,22 @@ def get_reservations():
             end_dt = datetime.fromisoformat(end_date)
             query = query.filter(Reservation.end_date <= end_dt)
         
+        if pagination.wants_cursor(request.args):
+            cursor_page = pagination.keyset_paginate(
+                query, [Reservation.start_date, Reservation.id], request.args, descending=True,
+                cache_key=pagination.cache_key_for('reservations', tenant_id, request.args)
+            )
+            return jsonify({
+                'reservations': [reservation.to_dict(fields, expand) for reservation in cursor_page.items],
+                'pagination': cursor_page.to_dict()
+            }), 200
+        
         reservations = query.order_by(Reservation.start_date.desc()).paginate(
             page=page, per_page=per_page, error_out=False
         )
         
         return jsonify({
-            'reservations': [reservation.to_dict() for reservation in reservations.items],
+            'reservations': [reservation.to_dict(fields, expand) for reservation in reservations.items],
             'pagination': {
                 'page': page,
                 'pages': reservations.pages,
@@ -366,6 +452,8 @@ def get_reservations():
             }
         }), 200
         
+    except pagination.InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -384,28 +472,38 @@ def create_reservation():
             if not data.get(field):
                 return jsonify({'error': f'Campo {field} é obrigatório'}), 400
         
-        # Verificar se o item existe e está disponível
-        item = RentalItem.query.filter_by(id=data['item_id'], tenant_id=tenant_id).first()
-        if not item:
-            return jsonify({'error': 'Item não encontrado'}), 404
+        # Quantidade negativa passaria pela checagem de estoque e liberaria unidades no período
+        quantity = data['quantity']
+        if not isinstance(quantity, int) or isinstance(quantity, bool) or quantity < 1:
+            return jsonify({'error': 'Quantidade deve ser um número inteiro positivo'}), 400
         
-        if not item.is_active:
-            return jsonify({'error': 'Item não está ativo'}), 400
+        start_date = datetime.fromisoformat(data['start_date'])
+        end_date = datetime.fromisoformat(data['end_date'])
         
-        # Verificar disponibilidade
-        quantity = data['quantity']
-        if quantity > item.available_quantity:
-            return jsonify({'error': 'Quantidade não disponível'}), 400
+        if end_date <= start_date:
+            return jsonify({'error': 'Data final deve ser posterior à data inicial'}), 400
         
         # Verificar se o cliente existe
         customer = Customer.query.filter_by(id=data['customer_id'], tenant_id=tenant_id).first()
         if not customer:
             return jsonify({'error': 'Cliente não encontrado'}), 404
         
-        # Calcular preços
-        start_date = datetime.fromisoformat(data['start_date'])
-        end_date = datetime.fromisoformat(data['end_date'])
+        # Bloquear o item até o commit para serializar reservas concorrentes
+        item = booking.lock_item(tenant_id, data['item_id'])
+        if not item:
+            db.session.rollback()
+            return jsonify({'error': 'Item não encontrado'}), 404
         
+        if not item.is_active:
+            db.session.rollback()
+            return jsonify({'error': 'Item não está ativo'}), 400
+        
+        # Verificar disponibilidade no período
+        if booking.free_units(item, start_date, end_date) < quantity:
+            db.session.rollback()
+            return jsonify({'error': 'Quantidade não disponível para o período'}), 400
+        
+        # Calcular preços
         # Lógica simples de cálculo de preço (pode ser melhorada)
         duration = end_date - start_date
         hours = duration.total_seconds() / 3600
@@ -422,6 +520,7 @@ def create_reservation():
             months = max(1, int(hours / 720))
             unit_price = item.monthly_price * Decimal(str(months))
         else:
+            db.session.rollback()
             return jsonify({'error': 'Não foi possível calcular o preço'}), 400
         
         total_price = unit_price * Decimal(str(quantity))
@@ -449,12 +548,9 @@ def create_reservation():
             final_amount=final_amount,
             notes=data.get('notes'),
             internal_notes=data.get('internal_notes'),
-            created_by=current_user_id
+            created_by=int(current_user_id)
         )
         
-        # Atualizar disponibilidade do item
-        item.available_quantity -= quantity
-        
         db.session.add(reservation)
         db.session.commit()
         
@@ -503,6 +599,7 @@ def confirm_reservation(reservation_id):
 
 @rental_bp.route('/calendar', methods=['GET'])
 @jwt_required()
+@response_cache.cached('calendar')
 def get_calendar():
     """Retorna eventos do calendário de reservas."""
     try:
@@ -517,22 +614,39 @@ def get_calendar():
         start_dt = datetime.fromisoformat(start_date)
         end_dt = datetime.fromisoformat(end_date)
         
-        reservations = Reservation.query.filter_by(tenant_id=tenant_id).filter(
+        # Projeção apenas das colunas emitidas, sem carregar objetos do ORM
+        rows = db.session.query(
+            Reservation.id,
+            Reservation.start_date,
+            Reservation.end_date,
+            Reservation.status,
+            Reservation.item_id,
+            Reservation.customer_id,
+            Reservation.reservation_code,
+            RentalItem.name.label('item_name'),
+            Customer.first_name,
+            Customer.last_name
+        ).join(
+            RentalItem, Reservation.item_id == RentalItem.id
+        ).join(
+            Customer, Reservation.customer_id == Customer.id
+        ).filter(
+            Reservation.tenant_id == tenant_id,
             Reservation.start_date <= end_dt,
             Reservation.end_date >= start_dt
         ).all()
         
         events = []
-        for reservation in reservations:
+        for row in rows:
             events.append({
-                'id': reservation.id,
-                'title': f"{reservation.item.name} - {reservation.customer.get_full_name()}",
-                'start': reservation.start_date.isoformat(),
-                'end': reservation.end_date.isoformat(),
-                'status': reservation.status,
-                'item_id': reservation.item_id,
-                'customer_id': reservation.customer_id,
-                'reservation_code': reservation.reservation_code
+                'id': row.id,
+                'title': f"{row.item_name} - {row.first_name} {row.last_name}",
+                'start': row.start_date.isoformat(),
+                'end': row.end_date.isoformat(),
+                'status': row.status,
+                'item_id': row.item_id,
+                'customer_id': row.customer_id,
+                'reservation_code': row.reservation_code
             })
         
         return jsonify({'events': events}), 200
@@ -544,27 +658,24 @@ def get_calendar():
 
 @rental_bp.route('/dashboard', methods=['GET'])
 @jwt_required()
+@response_cache.cached('dashboard', expires=60)
 def get_dashboard():
     """Retorna dados para o dashboard."""
     try:
         tenant_id = get_current_tenant_id()
         
-        # Estatísticas gerais
-        total_items = RentalItem.query.filter_by(tenant_id=tenant_id).count()
-        active_items = RentalItem.query.filter_by(tenant_id=tenant_id, is_active=True).count()
-        total_customers = Customer.query.filter_by(tenant_id=tenant_id).count()
+        # Estatísticas gerais e reservas por status (consultas agrupadas)
+        stats = dashboard.get_dashboard_stats(tenant_id)
         
-        # Reservas por status
-        reservations_stats = {}
-        for status in ReservationStatus:
-            count = Reservation.query.filter_by(
-                tenant_id=tenant_id, 
-                status=status.value
-            ).count()
-            reservations_stats[status.value] = count
+        reservation_options = (
+            joinedload(Reservation.item).joinedload(RentalItem.category),
+            joinedload(Reservation.customer)
+        )
         
         # Reservas recentes
-        recent_reservations = Reservation.query.filter_by(tenant_id=tenant_id).order_by(
+        recent_reservations = Reservation.query.filter_by(tenant_id=tenant_id).options(
+            *reservation_options
+        ).order_by(
             Reservation.created_at.desc()
         ).limit(5).all()
         
@@ -572,15 +683,12 @@ def get_dashboard():
         upcoming_reservations = Reservation.query.filter_by(tenant_id=tenant_id).filter(
             Reservation.start_date > datetime.utcnow(),
             Reservation.status.in_(['confirmed', 'pending'])
+        ).options(
+            *reservation_options
         ).order_by(Reservation.start_date).limit(5).all()
         
         dashboard_data = {
-            'stats': {
-                'total_items': total_items,
-                'active_items': active_items,
-                'total_customers': total_customers,
-                'reservations': reservations_stats
-            },
+            'stats': stats,
             'recent_reservations': [r.to_dict() for r in recent_reservations],
             'upcoming_reservations': [r.to_dict() for r in upcoming_reservations]
         }
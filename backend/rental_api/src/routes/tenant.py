@@ -4,6 +4,7 @@ from datetime import datetime
 
 from src.models.user import db, User
 from src.models.tenant import Tenant
+from src.services import lookups, pagination, passwords, response_cache, usage
 
 tenant_bp = Blueprint('tenant', __name__)
 
@@ -22,13 +23,14 @@ def require_admin():
 @tenant_bp.route('/', methods=['GET'])
 @jwt_required()
 @require_admin()
+@response_cache.cached('tenant')
 def get_tenant():
     """Retorna informações do tenant atual."""
     try:
         claims = get_jwt()
         tenant_id = claims.get('tenant_id')
         
-        tenant = Tenant.query.get(tenant_id)
+        tenant = lookups.get_tenant(tenant_id)
         if not tenant:
             return jsonify({'error': 'Tenant não encontrado'}), 404
         
@@ -79,13 +81,14 @@ def update_tenant():
 @tenant_bp.route('/settings', methods=['GET'])
 @jwt_required()
 @require_admin()
+@response_cache.cached('tenant_settings')
 def get_tenant_settings():
     """Retorna configurações específicas do tenant."""
     try:
         claims = get_jwt()
         tenant_id = claims.get('tenant_id')
         
-        tenant = Tenant.query.get(tenant_id)
+        tenant = lookups.get_tenant(tenant_id)
         if not tenant:
             return jsonify({'error': 'Tenant não encontrado'}), 404
         
@@ -136,6 +139,14 @@ def update_tenant_settings():
         
         data = request.get_json()
         
+        for section in ('notifications', 'branding', 'limits', 'localization', 'payments'):
+            if section in data and not isinstance(data[section], dict):
+                return jsonify({'error': f'Campo {section} deve ser um objeto'}), 400
+        
+        # O plano define os limites de requisições: só o operador muda (flask plans set)
+        if 'plan' in data.get('limits', {}):
+            return jsonify({'error': 'O plano só pode ser alterado pelo suporte'}), 403
+        
         # Atualizar notificações
         if 'notifications' in data:
             notifications = data['notifications']
@@ -204,46 +215,30 @@ def get_tenant_stats():
         claims = get_jwt()
         tenant_id = claims.get('tenant_id')
         
-        # Importar modelos aqui para evitar importação circular
-        from src.models.rental import RentalItem, Reservation, Customer
-        
-        # Contar usuários
-        users_count = User.query.filter_by(tenant_id=tenant_id).count()
-        
-        # Contar itens
-        items_count = RentalItem.query.filter_by(tenant_id=tenant_id).count()
-        active_items_count = RentalItem.query.filter_by(
-            tenant_id=tenant_id, 
-            is_active=True
-        ).count()
-        
-        # Contar reservas
-        reservations_count = Reservation.query.filter_by(tenant_id=tenant_id).count()
-        active_reservations_count = Reservation.query.filter_by(
-            tenant_id=tenant_id
-        ).filter(
-            Reservation.status.in_(['confirmed', 'active'])
-        ).count()
+        tenant = lookups.get_tenant(tenant_id)
+        if not tenant:
+            return jsonify({'error': 'Tenant não encontrado'}), 404
         
-        # Contar clientes
-        customers_count = Customer.query.filter_by(tenant_id=tenant_id).count()
+        # Contadores mantidos a cada escrita (tabela tenant_usage)
+        tenant_usage = usage.get_usage(tenant_id)
+        reservations = tenant_usage.reservations_by_status()
         
         stats = {
             'users': {
-                'total': users_count,
-                'limit': Tenant.query.get(tenant_id).max_users
+                'total': tenant_usage.users_count,
+                'limit': tenant.max_users
             },
             'items': {
-                'total': items_count,
-                'active': active_items_count,
-                'limit': Tenant.query.get(tenant_id).max_items
+                'total': tenant_usage.items_count,
+                'active': tenant_usage.active_items_count,
+                'limit': tenant.max_items
             },
             'reservations': {
-                'total': reservations_count,
-                'active': active_reservations_count
+                'total': sum(reservations.values()),
+                'active': reservations['confirmed'] + reservations['active']
             },
             'customers': {
-                'total': customers_count
+                'total': tenant_usage.customers_count
             }
         }
         
@@ -264,7 +259,19 @@ def get_tenant_users():
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         
-        users = User.query.filter_by(tenant_id=tenant_id).paginate(
+        query = User.query.filter_by(tenant_id=tenant_id)
+        
+        if pagination.wants_cursor(request.args):
+            cursor_page = pagination.keyset_paginate(
+                query, [User.id], request.args,
+                cache_key=pagination.cache_key_for('users', tenant_id, request.args)
+            )
+            return jsonify({
+                'users': [user.to_dict() for user in cursor_page.items],
+                'pagination': cursor_page.to_dict()
+            }), 200
+        
+        users = query.paginate(
             page=page, per_page=per_page, error_out=False
         )
         
@@ -278,6 +285,8 @@ def get_tenant_users():
             }
         }), 200
         
+    except pagination.InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -307,8 +316,8 @@ def create_tenant_user():
             return jsonify({'error': 'Email já está em uso neste tenant'}), 400
         
         # Verificar limite de usuários
-        tenant = Tenant.query.get(tenant_id)
-        current_users = User.query.filter_by(tenant_id=tenant_id).count()
+        tenant = lookups.get_tenant(tenant_id)
+        current_users = usage.get_usage(tenant_id).users_count
         if current_users >= tenant.max_users:
             return jsonify({'error': 'Limite de usuários atingido'}), 400
         
@@ -322,7 +331,7 @@ def create_tenant_user():
             phone=data.get('phone'),
             role=data.get('role', 'user')
         )
-        user.set_password(data['password'])
+        passwords.set_password(user, data['password'])
         
         db.session.add(user)
         db.session.commit()
@@ -332,6 +341,9 @@ def create_tenant_user():
             'user': user.to_dict()
         }), 201
         
+    except passwords.HashingBusy:
+        db.session.rollback()
+        return jsonify({'error': 'Servidor ocupado, tente novamente em instantes'}), 429, {'Retry-After': '1'}
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
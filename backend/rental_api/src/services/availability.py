@@ -0,0 +1,215 @@
+"""Motor de disponibilidade de itens baseado nas datas das reservas.
+
+Cada item mantém um índice de intervalos [início, fim) das reservas que
+ocupam unidades (pendentes, confirmadas e ativas). A consulta de unidades
+livres em um período é resolvida com busca binária + varredura (sweep-line)
+apenas sobre as reservas que podem se sobrepor ao período, então o custo
+não cresce com o histórico de reservas já encerradas.
+"""
+import threading
+import time
+from bisect import bisect_left
+from datetime import timedelta
+
+from flask import current_app
+from sqlalchemy import bindparam, event, inspect
+from sqlalchemy.orm import Session
+
+from src.models.user import db
+from src.models.rental import Reservation, ReservationStatus
+
+# Status de reserva que ocupam unidades do item
+BLOCKING_STATUSES = (
+    ReservationStatus.PENDING.value,
+    ReservationStatus.CONFIRMED.value,
+    ReservationStatus.ACTIVE.value,
+)
+
+DEFAULT_INDEX_TTL = 60  # segundos
+
+
+def blocking_filter():
+    """Filtro `status IN (...)` renderizado com literais.
+
+    Só com os valores literais no SQL o planejador consegue usar o índice
+    parcial ix_reservations_item_blocking (mesmos valores, mesma ordem).
+    """
+    return Reservation.status.in_(
+        bindparam('blocking_statuses', list(BLOCKING_STATUSES), expanding=True, literal_execute=True)
+    )
+
+
+class ItemIntervalIndex:
+    """Índice ordenado por data de início das reservas de um item."""
+
+    def __init__(self, intervals=()):
+        self._entries = []       # (start, end, quantity, reservation_id) ordenado
+        self._starts = []        # datas de início, paralelo a _entries
+        self._by_id = {}         # reservation_id -> entrada
+        self._max_duration = timedelta(0)
+
+        for reservation_id, start, end, quantity in sorted(intervals, key=lambda i: (i[1], i[0])):
+            entry = (start, end, quantity or 0, reservation_id)
+            self._entries.append(entry)
+            self._starts.append(start)
+            self._by_id[reservation_id] = entry
+            self._max_duration = max(self._max_duration, end - start)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, reservation_id, start, end, quantity):
+        """Adiciona (ou substitui) o intervalo de uma reserva."""
+        self.remove(reservation_id)
+        entry = (start, end, quantity or 0, reservation_id)
+        position = bisect_left(self._entries, entry)
+        self._entries.insert(position, entry)
+        self._starts.insert(position, start)
+        self._by_id[reservation_id] = entry
+        self._max_duration = max(self._max_duration, end - start)
+
+    def remove(self, reservation_id):
+        """Remove o intervalo de uma reserva, se presente."""
+        entry = self._by_id.pop(reservation_id, None)
+        if entry is None:
+            return False
+        position = bisect_left(self._entries, entry)
+        del self._entries[position]
+        del self._starts[position]
+        return True
+
+    def booked_units(self, start, end):
+        """Retorna o pico de unidades reservadas dentro de [start, end)."""
+        if end <= start or not self._entries:
+            return 0
+
+        # Só reservas que começam depois de (start - maior duração) podem sobrepor
+        lo = bisect_left(self._starts, start - self._max_duration)
+        hi = bisect_left(self._starts, end)
+
+        events = []
+        for entry_start, entry_end, quantity, _ in self._entries[lo:hi]:
+            if entry_end > start:
+                events.append((max(entry_start, start), quantity))
+                events.append((min(entry_end, end), -quantity))
+
+        # Fim antes de início no mesmo instante: intervalos semiabertos
+        events.sort(key=lambda ev: (ev[0], ev[1]))
+        peak = current = 0
+        for _, delta in events:
+            current += delta
+            if current > peak:
+                peak = current
+        return peak
+
+
+class AvailabilityEngine:
+    """Responde quantas unidades de um item estão livres em um período."""
+
+    def __init__(self):
+        self._indexes = {}  # item_id -> (ItemIntervalIndex, carregado_em)
+        self._lock = threading.RLock()
+
+    def _ttl(self):
+        try:
+            return current_app.config.get('AVAILABILITY_INDEX_TTL', DEFAULT_INDEX_TTL)
+        except RuntimeError:
+            return DEFAULT_INDEX_TTL
+
+    def _load(self, item_id):
+        rows = db.session.query(
+            Reservation.id, Reservation.start_date, Reservation.end_date, Reservation.quantity
+        ).filter(
+            Reservation.item_id == item_id,
+            blocking_filter()
+        ).all()
+        return ItemIntervalIndex(tuple(row) for row in rows)
+
+    def get_index(self, item_id):
+        """Retorna o índice do item, carregando-o do banco se necessário."""
+        with self._lock:
+            cached = self._indexes.get(item_id)
+            if cached and time.monotonic() - cached[1] < self._ttl():
+                return cached[0]
+
+        index = self._load(item_id)
+        with self._lock:
+            self._indexes[item_id] = (index, time.monotonic())
+        return index
+
+    def booked_units(self, item_id, start, end):
+        index = self.get_index(item_id)
+        with self._lock:
+            return index.booked_units(start, end)
+
+    def free_units(self, item, start, end):
+        """Retorna quantas unidades do item estão livres em [start, end)."""
+        capacity = item.total_quantity or 0
+        return max(0, capacity - self.booked_units(item.id, start, end))
+
+    def is_available(self, item, start, end, quantity=1):
+        return self.free_units(item, start, end) >= quantity
+
+    def apply(self, reservation_id, item_id, start, end, quantity, status, deleted=False):
+        """Atualiza o índice já carregado com o estado gravado de uma reserva."""
+        with self._lock:
+            cached = self._indexes.get(item_id)
+            if not cached:
+                return
+            index = cached[0]
+            if deleted or status not in BLOCKING_STATUSES:
+                index.remove(reservation_id)
+            else:
+                index.add(reservation_id, start, end, quantity)
+
+    def invalidate(self, item_id=None):
+        """Descarta o índice de um item (ou de todos)."""
+        with self._lock:
+            if item_id is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(item_id, None)
+
+
+availability = AvailabilityEngine()
+
+
+# ===== SINCRONIZAÇÃO COM A SESSÃO =====
+
+_PENDING_KEY = 'availability_pending'
+
+
+def _snapshot(reservation, deleted=False):
+    return (
+        reservation.id, reservation.item_id, reservation.start_date,
+        reservation.end_date, reservation.quantity, reservation.status, deleted
+    )
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_reservation_changes(session, flush_context):
+    # Por (reserva, item): uma reserva movida de item sai do índice do item antigo
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for obj in session.new.union(session.dirty):
+        if isinstance(obj, Reservation):
+            for old_item_id in inspect(obj).attrs.item_id.history.deleted:
+                if old_item_id is not None and old_item_id != obj.item_id:
+                    pending[obj.id, old_item_id] = (obj.id, old_item_id, None, None, None, None, True)
+            pending[obj.id, obj.item_id] = _snapshot(obj)
+    for obj in session.deleted:
+        if isinstance(obj, Reservation):
+            pending[obj.id, obj.item_id] = _snapshot(obj, deleted=True)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_reservation_changes(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    for snapshot in pending.values():
+        availability.apply(*snapshot)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_reservation_changes(session):
+    session.info.pop(_PENDING_KEY, None)
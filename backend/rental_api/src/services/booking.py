@@ -0,0 +1,53 @@
+"""Caminho de reserva seguro para requisições concorrentes.
+
+A verificação de disponibilidade e a gravação da reserva acontecem na mesma
+transação, com o item bloqueado até o commit. No PostgreSQL (e demais bancos
+com bloqueio por linha) usamos SELECT ... FOR UPDATE na linha do item, então
+reservas de itens diferentes não disputam o mesmo lock. O SQLite não tem
+bloqueio por linha: a primeira escrita da transação obtém o lock de escrita
+do banco, que serializa as reservas inclusive entre processos.
+"""
+from sqlalchemy import update
+
+from src.models.user import db
+from src.models.rental import RentalItem, Reservation
+from src.services.availability import ItemIntervalIndex, blocking_filter
+
+
+def _supports_row_locks():
+    return db.session.get_bind().dialect.name != 'sqlite'
+
+
+def lock_item(tenant_id, item_id):
+    """Carrega o item bloqueando reservas concorrentes até o fim da transação."""
+    query = RentalItem.query.filter_by(id=item_id, tenant_id=tenant_id).populate_existing()
+
+    if _supports_row_locks():
+        return query.with_for_update().first()
+
+    db.session.execute(
+        update(RentalItem)
+        .where(RentalItem.id == item_id, RentalItem.tenant_id == tenant_id)
+        .values(id=RentalItem.id)
+        .execution_options(synchronize_session=False)
+    )
+    return query.first()
+
+
+def booked_units(item_id, start, end):
+    """Pico de unidades reservadas em [start, end), lido direto do banco."""
+    rows = db.session.query(
+        Reservation.id, Reservation.start_date, Reservation.end_date, Reservation.quantity
+    ).filter(
+        Reservation.item_id == item_id,
+        blocking_filter(),
+        Reservation.start_date < end,
+        Reservation.end_date > start
+    ).all()
+    return ItemIntervalIndex(tuple(row) for row in rows).booked_units(start, end)
+
+
+def free_units(item, start, end):
+    """Unidades livres do item em [start, end); use com o item bloqueado."""
+    capacity = item.total_quantity or 0
+    return max(0, capacity - booked_units(item.id, start, end))
@@ -0,0 +1,13 @@
+"""Contadores do dashboard lidos da tabela de uso do tenant."""
+from src.services import usage
+
+
+def get_dashboard_stats(tenant_id):
+    """Contadores do dashboard: uma leitura de tenant_usage por requisição."""
+    tenant_usage = usage.get_usage(tenant_id)
+    return {
+        'total_items': tenant_usage.items_count,
+        'active_items': tenant_usage.active_items_count,
+        'total_customers': tenant_usage.customers_count,
+        'reservations': tenant_usage.reservations_by_status()
+    }
@@ -0,0 +1,204 @@
+"""Verificações de saúde em camadas (GET /api/health/live e /api/health/ready).
+
+- live: o processo responde; sem nenhum I/O.
+- ready: banco, Redis e saturação do pool (e réplicas de leitura, só
+  informadas). Banco e Redis são testados por
+  uma thread por worker a cada HEALTH_PROBE_INTERVAL segundos e a rota só lê
+  o último resultado, então rajadas de health checks (Docker, balanceador,
+  orquestrador) não chegam ao banco. O pool é lido na hora: são contadores em
+  memória, e um pool esgotado precisa tirar o worker do balanceamento (503)
+  sem esperar a próxima rodada.
+
+O Redis só é testado se algum serviço o usa, e só derruba a prontidão se for
+indispensável: a revogação de tokens falha fechada sem ele, enquanto cache de
+respostas, invalidação de caches e limite de requisições têm alternativa local.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+from src.models.user import db
+from src.utils.db_routing import router
+
+logger = logging.getLogger(__name__)
+
+
+class HealthProber:
+    def __init__(self):
+        self.app = None
+        self.interval = 2.0
+        self.max_saturation = 1.0
+        self.max_overflow = 10
+        self.redis = None
+        self.redis_critical = False
+        self._snapshot = None
+        self._prober_pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.interval = app.config.get('HEALTH_PROBE_INTERVAL', self.interval)
+        self.max_saturation = app.config.get('HEALTH_POOL_MAX_SATURATION', self.max_saturation)
+        # O pool não expõe max_overflow: vale o configurado (10 é o padrão do QueuePool)
+        self.max_overflow = (app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}).get('max_overflow', 10)
+        self._snapshot = None
+
+        self.redis_critical = app.config.get('TOKEN_REVOCATION_BACKEND') == 'redis'
+        uses_redis = self.redis_critical or app.config.get('CACHE_REDIS_INVALIDATION') or 'redis' in (
+            app.config.get('RESPONSE_CACHE_BACKEND'), app.config.get('RATE_LIMIT_BACKEND'))
+        self.redis = None
+        if uses_redis:
+            try:
+                import redis
+                self.redis = redis.Redis.from_url(app.config['REDIS_URL'], socket_timeout=1,
+                                                  socket_connect_timeout=1)
+            except ImportError:
+                logger.warning('Redis configurado, mas o pacote redis não está instalado')
+
+    # ----- Sondas -----
+
+    def pool_status(self):
+        """Conexões do pool em uso contra a capacidade (pool_size + max_overflow, ou sem limite)."""
+        pool = db.engine.pool
+        if not hasattr(pool, 'checkedout'):
+            # SQLite em memória e afins: sem limite de conexões
+            return {'status': 'ok'}
+        checked_out = pool.checkedout()
+        if self.max_overflow < 0:
+            # max_overflow=-1: o pool cresce sem limite, nunca se esgota
+            return {'status': 'ok', 'checked_out': checked_out, 'capacity': None}
+        capacity = pool.size() + self.max_overflow
+        saturation = checked_out / capacity if capacity else 0.0
+        return {
+            'status': 'exhausted' if saturation >= self.max_saturation else 'ok',
+            'checked_out': checked_out,
+            'capacity': capacity,
+            'saturation': round(saturation, 3),
+        }
+
+    def _probe_database(self):
+        # Com o pool esgotado o connect() esperaria pool_timeout: não adianta testar
+        if self.pool_status()['status'] == 'exhausted':
+            return {'status': 'skipped', 'reason': 'pool esgotado'}
+        started = time.perf_counter()
+        try:
+            with db.engine.connect() as connection:
+                connection.execute(db.text('SELECT 1'))
+        except Exception as e:
+            return {'status': 'unhealthy', 'error': str(e)}
+        return {'status': 'ok', 'latency_ms': round((time.perf_counter() - started) * 1000, 2)}
+
+    def _probe_replicas(self):
+        # Réplicas de leitura (src/utils/db_routing.py): só informadas, não derrubam a
+        # prontidão; o roteador deixa de mandar leituras às que falharem
+        results = {}
+        for key in router.replicas:
+            started = time.perf_counter()
+            try:
+                with db.engines[key].connect() as connection:
+                    connection.execute(db.text('SELECT 1'))
+            except Exception as e:
+                results[key] = {'status': 'unhealthy', 'error': str(e)}
+                continue
+            results[key] = {'status': 'ok', 'latency_ms': round((time.perf_counter() - started) * 1000, 2)}
+        return results
+
+    def replica_ok(self, key):
+        """A réplica respondeu na última sondagem (ou ainda não foi sondada)."""
+        snapshot = self._snapshot
+        if snapshot is None or key not in snapshot.get('replicas', {}):
+            return True
+        return snapshot['replicas'][key]['status'] == 'ok'
+
+    def _probe_redis(self):
+        if self.redis is None:
+            return {'status': 'disabled'}
+        started = time.perf_counter()
+        try:
+            self.redis.ping()
+        except Exception as e:
+            return {'status': 'unhealthy', 'error': str(e), 'critical': self.redis_critical}
+        return {'status': 'ok', 'latency_ms': round((time.perf_counter() - started) * 1000, 2),
+                'critical': self.redis_critical}
+
+    def probe(self):
+        """Testa banco, Redis e réplicas e guarda o resultado."""
+        with self.app.app_context():
+            snapshot = {
+                'database': self._probe_database(),
+                'redis': self._probe_redis(),
+                'checked_at': time.time(),
+            }
+            if router.replicas:
+                snapshot['replicas'] = self._probe_replicas()
+        self._snapshot = snapshot
+        return snapshot
+
+    # ----- Thread de sondagem -----
+
+    def _ensure_prober(self):
+        """Inicia (uma vez por processo, após o fork) a thread de sondagem."""
+        if self._prober_pid == os.getpid():
+            return
+        with self._lock:
+            if self._prober_pid == os.getpid():
+                return
+            self._prober_pid = os.getpid()
+            self._snapshot = None  # resultado herdado do master não vale para este worker
+            threading.Thread(target=self._run, name='health-prober', daemon=True).start()
+
+    def _run(self):
+        # A primeira sondagem é feita por snapshot(), que iniciou esta thread
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.probe()
+            except Exception as e:
+                logger.warning('Falha na sondagem de saúde: %s', e)
+
+    def snapshot(self):
+        """Último resultado das sondas; na primeira chamada do processo, espera uma."""
+        self._ensure_prober()
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot or self.probe()
+        return snapshot
+
+    # ----- Respostas -----
+
+    def readiness(self):
+        """(corpo, status HTTP) de /api/health/ready."""
+        snapshot = self.snapshot()
+        age = time.time() - snapshot['checked_at']
+        checks = {
+            'database': snapshot['database'],
+            'redis': snapshot['redis'],
+            'pool': self.pool_status(),
+        }
+        if 'replicas' in snapshot:
+            checks['replicas'] = snapshot['replicas']
+        problems = []
+        if age > max(3 * self.interval, 10):
+            problems.append('stale')  # thread de sondagem parada
+        if checks['database']['status'] != 'ok':
+            problems.append('database')
+        if checks['redis']['status'] == 'unhealthy' and self.redis_critical:
+            problems.append('redis')
+        if checks['pool']['status'] == 'exhausted':
+            problems.append('pool')
+
+        body = {
+            'status': 'unavailable' if problems else 'ready',
+            'checked_at': datetime.utcfromtimestamp(snapshot['checked_at']).isoformat(),
+            'age_seconds': round(age, 3),
+            'checks': checks,
+        }
+        if problems:
+            body['problems'] = problems
+        return body, 503 if problems else 200
+
+
+prober = HealthProber()
@@ -0,0 +1,129 @@
+"""Cache por worker dos dados de tenant e categorias.
+
+Tenant, lista de categorias e o mapa subdomínio/domínio -> tenant (usado no
+login) são lidos em quase toda requisição e mudam raramente. Ficam em caches LRU (src/utils/cache.py) por LOOKUP_CACHE_TTL
+segundos, chaveados pelo tenant, e são descartados no after_commit de
+qualquer sessão que grave um Tenant ou uma Category, inclusive nos outros
+workers quando CACHE_REDIS_INVALIDATION está ativo.
+
+O tenant devolvido é um CachedTenant (namedtuple com as colunas), não um
+objeto do ORM: não pode ser gravado nem entrar numa sessão por cascade.
+Rotas que alteram o tenant devem carregá-lo com Tenant.query.get.
+"""
+from collections import namedtuple
+
+from sqlalchemy import event, or_
+from sqlalchemy.orm import Session
+
+from src.models.user import db
+from src.models.tenant import Tenant
+from src.models.rental import Category
+from src.utils.cache import caches
+
+TENANTS = 'tenants'
+CATEGORIES = 'categories'
+TENANT_ROUTES = 'tenant_routes'
+
+tenant_cache = caches.create(TENANTS)
+category_cache = caches.create(CATEGORIES)
+route_cache = caches.create(TENANT_ROUTES)
+
+_TENANT_COLUMNS = tuple(column.key for column in Tenant.__table__.columns)
+
+
+class CachedTenant(namedtuple('CachedTenant', _TENANT_COLUMNS)):
+    """Colunas de um Tenant em cache, somente leitura."""
+    __slots__ = ()
+
+    to_dict = Tenant.to_dict
+
+
+def _load_tenant(tenant_id):
+    tenant = db.session.get(Tenant, tenant_id)
+    if tenant is None:
+        return None
+    return {key: getattr(tenant, key) for key in _TENANT_COLUMNS}
+
+
+def get_tenant(tenant_id):
+    """Tenant (somente leitura) ou None se não existir."""
+    if tenant_id is None:
+        return None
+    caches.ensure_listener()
+    values = tenant_cache.get_or_load(tenant_id, lambda: _load_tenant(tenant_id))
+    return CachedTenant(**values) if values is not None else None
+
+
+def get_categories(tenant_id):
+    """Categorias do tenant já serializadas (to_dict)."""
+    caches.ensure_listener()
+    return category_cache.get_or_load(tenant_id, lambda: [
+        category.to_dict()
+        for category in Category.query.filter_by(tenant_id=tenant_id).order_by(Category.id)
+    ])
+
+
+def _load_route(name):
+    row = db.session.query(Tenant.id).filter(
+        or_(Tenant.subdomain == name, Tenant.domain == name)
+    ).first()
+    return row[0] if row else None
+
+
+def resolve_tenant_id(host):
+    """Tenant de um host: domínio próprio ou subdomínio ('acme.exemplo.com' -> 'acme').
+
+    Aceita também o subdomínio sozinho. Retorna None se nenhum tenant
+    corresponder (hosts desconhecidos também ficam em cache).
+    """
+    if not host:
+        return None
+    host = host.split(':', 1)[0].strip().lower().rstrip('.')
+    candidates = [host]
+    label = host.split('.', 1)[0]
+    if label != host:
+        candidates.append(label)
+
+    caches.ensure_listener()
+    for name in candidates:
+        tenant_id = route_cache.get_or_load(name, lambda: _load_route(name))
+        if tenant_id is not None:
+            return tenant_id
+    return None
+
+
+def invalidate_tenant(tenant_id):
+    caches.invalidate(TENANTS, tenant_id)
+
+
+def stats():
+    return caches.stats()
+
+
+# ----- Invalidação no commit -----
+
+_PENDING_KEY = 'lookup_invalidations'
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changes(session, flush_context):
+    changes = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Tenant):
+            changes.add((TENANTS, obj.id))
+            changes.add((TENANT_ROUTES, None))  # subdomínio/domínio podem ter mudado
+        elif isinstance(obj, Category):
+            changes.add((CATEGORIES, obj.tenant_id))
+    if changes:
+        session.info.setdefault(_PENDING_KEY, set()).update(changes)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_changes(session):
+    for name, key in session.info.pop(_PENDING_KEY, ()):
+        caches.invalidate(name, key)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,155 @@
+"""Métricas da API no formato de exposição do Prometheus (GET /api/metrics).
+
+- rental_http_request_duration_seconds: histograma por endpoint do Flask
+  (blueprint.função), método e status.
+- rental_http_requests_in_flight: requisições em andamento.
+- rental_db_pool_checked_out / rental_db_pool_overflow: conexões do pool do
+  SQLAlchemy em uso e além de pool_size, atualizadas a cada checkout/checkin
+  (inclusive em workers ociosos ou travados) e no scrape.
+- rental_cache_requests_total: acertos/falhas dos caches de tenant e
+  categorias (src/services/lookups.py) e do cache de respostas (X-Cache).
+- rental_tenant_requests_total: requisições por tenant.
+
+Os rótulos só recebem valores de conjuntos fechados: endpoints registrados
+(rotas inexistentes viram 'unmatched'), códigos de status e até
+METRICS_MAX_TENANTS tenants por processo (os demais somam em 'other').
+
+Com PROMETHEUS_MULTIPROC_DIR definido (gunicorn.conf.py) cada worker grava
+suas métricas em arquivos mmap nesse diretório e qualquer worker que
+atender o scrape agrega os de todos.
+"""
+import os
+import threading
+import time
+
+from flask import g, request
+from flask_jwt_extended import get_jwt
+from sqlalchemy import event
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+
+from src.models.user import db
+from src.services import lookups
+
+REQUEST_LATENCY = Histogram(
+    'rental_http_request_duration_seconds', 'Latência das requisições HTTP',
+    ['endpoint', 'method', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+IN_FLIGHT = Gauge('rental_http_requests_in_flight', 'Requisições em andamento', multiprocess_mode='livesum')
+POOL_CHECKED_OUT = Gauge('rental_db_pool_checked_out', 'Conexões do pool em uso', multiprocess_mode='livesum')
+POOL_OVERFLOW = Gauge('rental_db_pool_overflow', 'Conexões abertas além de pool_size', multiprocess_mode='livesum')
+CACHE_REQUESTS = Counter('rental_cache_requests', 'Consultas aos caches', ['cache', 'result'])
+TENANT_REQUESTS = Counter('rental_tenant_requests', 'Requisições por tenant', ['tenant'])
+
+CACHE_SYNC_INTERVAL = 1.0  # segundos entre leituras dos contadores dos caches
+
+
+class _Tracker:
+    """Estado por processo: tenants com rótulo próprio e últimos contadores dos caches."""
+
+    def __init__(self):
+        self.max_tenants = 100
+        self.tenants = set()
+        self.cache_counts = {}
+        self.next_cache_sync = 0.0
+        self.lock = threading.Lock()
+
+    def tenant_label(self, tenant_id):
+        label = str(tenant_id)
+        if label in self.tenants:
+            return label
+        with self.lock:
+            if len(self.tenants) < self.max_tenants:
+                self.tenants.add(label)
+                return label
+        return 'other'
+
+    def sync_caches(self):
+        now = time.monotonic()
+        if now < self.next_cache_sync:
+            return
+        with self.lock:
+            if now < self.next_cache_sync:
+                return
+            self.next_cache_sync = now + CACHE_SYNC_INTERVAL
+            for name, stats in lookups.stats().items():
+                for result in ('hits', 'misses'):
+                    current = stats[result]
+                    previous = self.cache_counts.get((name, result), 0)
+                    # Contadores zerados (caches.configure) recomeçam do zero
+                    delta = current - previous if current >= previous else current
+                    if delta:
+                        CACHE_REQUESTS.labels(name, result).inc(delta)
+                    self.cache_counts[(name, result)] = current
+
+
+tracker = _Tracker()
+
+
+def _request_tenant():
+    try:
+        return get_jwt().get('tenant_id')
+    except RuntimeError:
+        # Rota sem JWT (ou token recusado)
+        return None
+
+
+def _record_pool(pool, returning=0):
+    if hasattr(pool, 'checkedout'):
+        # No checkin a conexão ainda conta como em uso até voltar ao pool
+        POOL_CHECKED_OUT.set(pool.checkedout() - returning)
+        POOL_OVERFLOW.set(max(0, pool.overflow()))
+
+
+def init_app(app):
+    tracker.max_tenants = app.config.get('METRICS_MAX_TENANTS', tracker.max_tenants)
+
+    # Eventos do pool do primário; continuam valendo no pool recriado por dispose()
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'checkout', lambda *args: _record_pool(engine.pool))
+    event.listen(engine, 'checkin', lambda *args: _record_pool(engine.pool, returning=1))
+
+    @app.before_request
+    def start_metrics():
+        g.metrics_started = time.perf_counter()
+        IN_FLIGHT.inc()
+
+    @app.after_request
+    def record_metrics(response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        IN_FLIGHT.dec()
+        REQUEST_LATENCY.labels(request.endpoint or 'unmatched', request.method,
+                               str(response.status_code)).observe(time.perf_counter() - started)
+
+        tenant_id = _request_tenant()
+        if tenant_id is not None:
+            TENANT_REQUESTS.labels(tracker.tenant_label(tenant_id)).inc()
+        cache_result = response.headers.get('X-Cache')
+        if cache_result:
+            CACHE_REQUESTS.labels('response', 'hits' if cache_result == 'HIT' else 'misses').inc()
+        tracker.sync_caches()
+        return response
+
+    @app.teardown_request
+    def finish_metrics(exc):
+        # Só chega aqui com metrics_started se o after_request não rodou
+        if g.pop('metrics_started', None) is not None:
+            IN_FLIGHT.dec()
+
+
+def exposition():
+    """(corpo, content type) da exposição de todas as métricas."""
+    _record_pool(db.engine.pool)
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
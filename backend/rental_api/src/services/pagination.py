@@ -0,0 +1,135 @@
+"""Paginação por cursor (keyset) para as listagens.
+
+Modo opcional, ativado por ``?limit=`` ou ``?cursor=``: em vez de OFFSET, a
+consulta busca a partir da última chave de ordenação vista, usando a
+comparação de tuplas ``(chave, id) > (valor, último_id)``. Com um índice em
+``(tenant_id, chave, id)`` o custo é o mesmo na primeira página e na
+décima milésima. O total só é calculado com ``include_total=true`` e fica
+em cache por alguns segundos.
+"""
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import undefer
+
+from src.utils.cache import LRUCache
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+TOTAL_CACHE_TTL = 30  # segundos
+TOTAL_CACHE_SIZE = 1024
+
+# Parâmetros que não alteram o conjunto filtrado
+NON_FILTER_ARGS = ('cursor', 'limit', 'include_total', 'fields', 'expand', 'page', 'per_page')
+
+_total_cache = LRUCache('pagination_totals', maxsize=TOTAL_CACHE_SIZE, ttl=TOTAL_CACHE_TTL)
+
+
+class InvalidCursor(ValueError):
+    """Cursor malformado ou de outra ordenação."""
+
+
+def wants_cursor(args):
+    """Indica se a requisição pediu paginação por cursor."""
+    return 'cursor' in args or 'limit' in args
+
+
+def encode_cursor(values):
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, columns):
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor('Cursor inválido')
+
+    if not isinstance(payload, list) or len(payload) != len(columns):
+        raise InvalidCursor('Cursor inválido')
+
+    return [_cursor_value(column, value) for column, value in zip(columns, payload)]
+
+
+def _cursor_value(column, value):
+    """Valor do cursor no tipo da coluna; outro tipo chegaria ao banco (DataError no PostgreSQL)."""
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        try:
+            return datetime.fromisoformat(value)
+        except (ValueError, TypeError):
+            raise InvalidCursor('Cursor inválido')
+    if isinstance(value, bool):
+        raise InvalidCursor('Cursor inválido')
+    if python_type is int and isinstance(value, int):
+        return value
+    if python_type is str and isinstance(value, str):
+        return value
+    raise InvalidCursor('Cursor inválido')
+
+
+def _cached_total(query, cache_key):
+    if cache_key is None:
+        return query.order_by(None).count()
+    return _total_cache.get_or_load(cache_key, lambda: query.order_by(None).count())
+
+
+def cache_key_for(endpoint, tenant_id, args):
+    """Chave do cache de totais: endpoint, tenant e filtros normalizados."""
+    filters = tuple(sorted(
+        (key, value) for key, value in args.items(multi=True) if key not in NON_FILTER_ARGS
+    ))
+    return (endpoint, tenant_id, filters)
+
+
+class KeysetPage:
+    """Uma página da paginação por cursor."""
+
+    def __init__(self, items, limit, next_cursor, total=None):
+        self.items = items
+        self.limit = limit
+        self.next_cursor = next_cursor
+        self.total = total
+
+    def to_dict(self):
+        data = {
+            'limit': self.limit,
+            'next_cursor': self.next_cursor,
+            'has_more': self.next_cursor is not None
+        }
+        if self.total is not None:
+            data['total'] = self.total
+        return data
+
+
+def keyset_paginate(query, columns, args, descending=False, cache_key=None):
+    """Pagina `query` ordenando por `columns` (a última deve ser única, ex.: id)."""
+    limit = min(max(args.get('limit', DEFAULT_LIMIT, type=int) or DEFAULT_LIMIT, 1), MAX_LIMIT)
+    cursor = args.get('cursor')
+    include_total = args.get('include_total', '').lower() in ('1', 'true', 'yes')
+
+    total = _cached_total(query, cache_key) if include_total else None
+
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        key = tuple_(*columns)
+        bound = tuple_(*values)
+        query = query.filter(key < bound if descending else key > bound)
+
+    # As chaves de ordenação precisam estar carregadas para montar o próximo cursor
+    order = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.options(*(undefer(column) for column in columns)).order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+
+    return KeysetPage(rows, limit, next_cursor, total)
@@ -0,0 +1,126 @@
+"""Hash e verificação de senhas fora da thread da requisição.
+
+O cálculo do hash (custo definido por PASSWORD_HASH_METHOD) roda em um pool
+de PASSWORD_HASH_WORKERS threads por worker do gunicorn; scrypt e PBKDF2
+liberam o GIL, então as demais threads seguem atendendo requisições. No
+máximo workers + PASSWORD_HASH_QUEUE_DEPTH operações ficam em andamento ou
+na fila; além disso a chamada falha na hora com HashingBusy, que as rotas
+devolvem como 429. Com PASSWORD_HASH_WORKERS=0 o hash é calculado na
+própria thread da requisição, com o mesmo limite de concorrência.
+
+No login, um hash gravado com parâmetros diferentes da política atual é
+recalculado com a senha recebida e salvo no commit da requisição.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash, check_password_hash
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+
+
+def expand_method(method):
+    """Método como o werkzeug o grava no hash ('scrypt' -> 'scrypt:32768:8:1').
+
+    Parâmetros omitidos ganham os padrões do werkzeug; sem isso um método
+    curto nunca bateria com o hash gravado e todo login refaria o hash.
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt' and not args:
+        args = ['32768', '8', '1']
+    elif name == 'pbkdf2':
+        args = [args[0] if args else 'sha256', args[1] if len(args) > 1 else str(DEFAULT_PBKDF2_ITERATIONS)]
+    return ':'.join([name] + [str(int(arg)) if arg.isdigit() else arg for arg in args])
+
+
+class HashingBusy(Exception):
+    """Pool de hashing saturado."""
+
+
+class PasswordHasher:
+    def __init__(self):
+        self.method = DEFAULT_METHOD
+        self.workers = 2
+        self.queue_depth = 1
+        self.timeout = 10
+        self._executor = None
+        self._slots = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.method = app.config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', self.workers)
+        self.queue_depth = app.config.get('PASSWORD_HASH_QUEUE_DEPTH', self.queue_depth)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', self.timeout)
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False)
+            self._executor = None
+            self._pid = None
+
+    def _pool(self):
+        # Criado sob demanda em cada processo: threads não sobrevivem ao
+        # fork dos workers (preload_app)
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._slots = threading.BoundedSemaphore(self.workers + self.queue_depth) \
+                        if self.workers + self.queue_depth > 0 else None
+                    self._executor = None
+                    if self.workers:
+                        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='password-hash')
+                    self._pid = os.getpid()
+        return self._executor, self._slots
+
+    def _run(self, fn, *args):
+        executor, slots = self._pool()
+        if slots is None or not slots.acquire(blocking=False):
+            raise HashingBusy()
+        if executor is None:
+            try:
+                return fn(*args)
+            finally:
+                slots.release()
+
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            slots.release()
+            raise
+        # A vaga só é devolvida quando o hash termina: se a requisição desistir
+        # por timeout, o cálculo continua ocupando o pool até o fim
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise HashingBusy()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        if not password_hash:
+            return False
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        return expand_method(password_hash.split('$', 1)[0]) != expand_method(self.method)
+
+
+hasher = PasswordHasher()
+
+
+def set_password(user, password):
+    """Define a senha do usuário (equivale a User.set_password)."""
+    user.password_hash = hasher.hash(password)
+
+
+def check_password(user, password):
+    """Verifica a senha e atualiza o hash se a política de custo mudou."""
+    if not hasher.verify(user.password_hash, password):
+        return False
+    if hasher.needs_rehash(user.password_hash):
+        user.password_hash = hasher.hash(password)
+    return True
@@ -0,0 +1,157 @@
+"""Permissões embutidas no access token.
+
+No login/refresh o papel do usuário e suas permissões (um bitmask, claim
+``perms``) vão para as claims do JWT, junto com a versão de permissões do
+tenant (claim ``pv``). O require_permission autoriza só pelas claims; o
+usuário só é lido do banco quando a versão do tenant avançou depois da
+emissão do token, isto é, quando algum usuário do tenant teve papel,
+permissões ou ativação alterados.
+
+Cada processo guarda a versão de cada tenant por PERMISSION_VERSION_TTL
+segundos: mudanças feitas no próprio processo valem na hora, as feitas em
+outros workers em até TTL segundos.
+"""
+import json
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session
+
+from src.models.user import db, User
+from src.models.tenant import Tenant
+from src.services import lookups
+
+# Posição de cada permissão no bitmask: só acrescente ao final
+PERMISSIONS = (
+    'manage_categories',
+    'manage_items',
+    'manage_customers',
+    'manage_reservations',
+)
+_BITS = {name: 1 << position for position, name in enumerate(PERMISSIONS)}
+
+DEFAULT_VERSION_TTL = 5  # segundos
+
+# Atributos do usuário que mudam o resultado de uma autorização
+_TRACKED_ATTRS = ('role', 'permissions', 'is_active', 'tenant_id')
+
+
+def parse_permissions(raw):
+    """Lista de permissões da coluna JSON `User.permissions`."""
+    try:
+        permissions = json.loads(raw) if raw else []
+    except (json.JSONDecodeError, TypeError):
+        return []
+    return permissions if isinstance(permissions, list) else []
+
+
+def encode(names):
+    mask = 0
+    for name in names:
+        mask |= _BITS.get(name, 0)
+    return mask
+
+
+def decode(mask):
+    return [name for name in PERMISSIONS if mask & _BITS[name]]
+
+
+def token_claims(user, tenant):
+    """Claims adicionais do access token do usuário."""
+    claims = {'tenant_id': user.tenant_id, 'role': user.role}
+    names = parse_permissions(user.permissions)
+    # Permissões fora do bitmask: sem 'pv', o token é sempre conferido no banco
+    if all(name in _BITS for name in names):
+        claims['perms'] = encode(names)
+        claims['pv'] = tenant.permissions_version or 0
+    return claims
+
+
+class _VersionCache:
+    """Versão de permissões por tenant, relida do banco a cada TTL."""
+
+    def __init__(self):
+        self._versions = {}   # tenant_id -> (versão, lida em)
+        self._lock = threading.Lock()
+
+    def _ttl(self):
+        try:
+            return current_app.config.get('PERMISSION_VERSION_TTL', DEFAULT_VERSION_TTL)
+        except RuntimeError:
+            return DEFAULT_VERSION_TTL
+
+    def get(self, tenant_id):
+        with self._lock:
+            cached = self._versions.get(tenant_id)
+        if cached and time.monotonic() - cached[1] < self._ttl():
+            return cached[0]
+
+        version = db.session.query(Tenant.permissions_version).filter_by(id=tenant_id).scalar() or 0
+        with self._lock:
+            self._versions[tenant_id] = (version, time.monotonic())
+        return version
+
+    def invalidate(self, tenant_id):
+        with self._lock:
+            self._versions.pop(tenant_id, None)
+
+
+versions = _VersionCache()
+
+
+def claims_current(claims):
+    """Indica se as claims de permissão do token ainda valem."""
+    if 'pv' not in claims or claims.get('tenant_id') is None:
+        return False
+    return claims['pv'] >= versions.get(claims['tenant_id'])
+
+
+def claims_allow(claims, permission):
+    if claims.get('role') == 'admin':
+        return True
+    return bool(claims.get('perms', 0) & _BITS.get(permission, 0))
+
+
+# ----- Versão de permissões -----
+
+def _changed_tenants(session):
+    tenant_ids = set()
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            tenant_ids.add(obj.tenant_id)
+    for obj in session.dirty:
+        if isinstance(obj, User) and session.is_modified(obj):
+            state = inspect(obj)
+            if any(state.attrs[attr].history.has_changes() for attr in _TRACKED_ATTRS):
+                tenant_ids.add(obj.tenant_id)
+                tenant_ids.update(state.attrs.tenant_id.history.deleted)
+    return {tenant_id for tenant_id in tenant_ids if tenant_id is not None}
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_versions(session, flush_context):
+    tenant_ids = _changed_tenants(session)
+    if not tenant_ids:
+        return
+
+    table = Tenant.__table__
+    session.connection().execute(
+        update(table).where(table.c.id.in_(tenant_ids)).values(
+            permissions_version=table.c.permissions_version + 1
+        )
+    )
+    session.info.setdefault('permission_versions', set()).update(tenant_ids)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_versions(session):
+    for tenant_id in session.info.pop('permission_versions', ()):
+        versions.invalidate(tenant_id)
+        lookups.invalidate_tenant(tenant_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_versions(session):
+    session.info.pop('permission_versions', None)
@@ -0,0 +1,155 @@
+"""Perfis amostrados de requisições (pyinstrument, formato speedscope).
+
+Desligado por padrão (PROFILING_ENABLED): sem ele nenhum hook é
+registrado e as requisições não pagam nada. Ligado, é perfilada uma a cada
+PROFILING_SAMPLE_RATE requisições (0 = nenhuma por amostragem) e toda
+requisição de um admin com o cabeçalho PROFILING_HEADER (X-Profile: 1).
+
+Cada perfil é gravado em PROFILING_DIR como JSON do speedscope
+(https://www.speedscope.app) com tenant, endpoint e duração no nome do
+arquivo; além de PROFILING_MAX_FILES arquivos os mais antigos são apagados.
+A listagem e o download ficam em /api/profiles (src/routes/profiling.py).
+"""
+import logging
+import os
+import re
+import threading
+import time
+
+from flask import g, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+
+logger = logging.getLogger(__name__)
+
+SUFFIX = '.speedscope.json'
+# <ms desde a época>-<pid>-t<tenant>-<endpoint>-<duração>ms.speedscope.json
+_NAME = re.compile(r'^(?P<ts>\d+)-(?P<pid>\d+)-t(?P<tenant>\w*)-(?P<endpoint>[\w.]+)-(?P<duration>\d+)ms'
+                   + re.escape(SUFFIX) + '$')
+_UNSAFE = re.compile(r'[^\w.]')
+
+
+class RequestProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.directory = None
+        self.sample_rate = 100
+        self.header = 'X-Profile'
+        self.interval = 0.001
+        self.max_files = 200
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.enabled = app.config.get('PROFILING_ENABLED', False)
+        if not self.enabled:
+            return
+        try:
+            import pyinstrument  # noqa: F401
+        except ImportError:
+            logger.warning("PROFILING_ENABLED, mas o pacote pyinstrument não está instalado")
+            self.enabled = False
+            return
+        self.directory = app.config.get('PROFILING_DIR')
+        self.sample_rate = app.config.get('PROFILING_SAMPLE_RATE', self.sample_rate)
+        self.header = app.config.get('PROFILING_HEADER', self.header)
+        self.interval = app.config.get('PROFILING_INTERVAL', self.interval)
+        self.max_files = app.config.get('PROFILING_MAX_FILES', self.max_files)
+        os.makedirs(self.directory, exist_ok=True)
+
+        app.before_request(_start_profile)
+        app.teardown_request(_finish_profile)
+
+    def sampled(self):
+        if not self.sample_rate:
+            return False
+        with self._lock:
+            self._counter += 1
+            return self._counter % self.sample_rate == 0
+
+    # ----- Arquivos -----
+
+    def save(self, profile, tenant_id, endpoint, duration):
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        endpoint = _UNSAFE.sub('_', endpoint)
+        tenant = tenant_id if tenant_id is not None else ''
+        name = f"{int(time.time() * 1000)}-{os.getpid()}-t{tenant}-{endpoint}-{int(duration * 1000)}ms{SUFFIX}"
+        path = os.path.join(self.directory, name)
+        with open(path + '.tmp', 'w') as handle:
+            handle.write(SpeedscopeRenderer().render(profile))
+        os.replace(path + '.tmp', path)
+        self._rotate()
+
+    def _rotate(self):
+        names = sorted(name for name in os.listdir(self.directory) if name.endswith(SUFFIX))
+        for name in names[:max(0, len(names) - self.max_files)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass  # outro worker já apagou
+
+    def list(self, tenant_id=None, endpoint=None):
+        """Perfis mais recentes primeiro, filtrados por tenant e endpoint."""
+        profiles = []
+        for name in sorted(os.listdir(self.directory), reverse=True):
+            match = _NAME.match(name)
+            if not match:
+                continue
+            if tenant_id is not None and match['tenant'] != str(tenant_id):
+                continue
+            if endpoint and match['endpoint'] != endpoint:
+                continue
+            profiles.append({
+                'name': name,
+                'endpoint': match['endpoint'],
+                'duration_ms': int(match['duration']),
+                'created_at': int(match['ts']) / 1000,
+                'pid': int(match['pid']),
+            })
+        return profiles
+
+    def path(self, name, tenant_id):
+        """Caminho do perfil, ou None se não existir ou for de outro tenant."""
+        match = _NAME.match(name)
+        if not match or match['tenant'] != str(tenant_id):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.exists(path) else None
+
+
+profiler = RequestProfiler()
+
+
+def _requested_by_admin():
+    if request.headers.get(profiler.header) != '1':
+        return False
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt().get('role') == 'admin'
+    except Exception:
+        return False
+
+
+def _start_profile():
+    if not (profiler.sampled() or _requested_by_admin()):
+        return
+    from pyinstrument import Profiler
+
+    # Só a thread desta requisição é amostrada
+    g.profile = Profiler(interval=profiler.interval, async_mode='disabled')
+    g.profile.start()
+
+
+def _finish_profile(exc):
+    profile = g.pop('profile', None)
+    if profile is None:
+        return
+    try:
+        session = profile.stop()
+        try:
+            tenant_id = get_jwt().get('tenant_id')
+        except RuntimeError:
+            tenant_id = None
+        profiler.save(session, tenant_id, request.endpoint or 'unmatched', session.duration)
+    except Exception as e:
+        logger.error('Falha ao gravar perfil de %s: %s', request.path, e)
@@ -0,0 +1,66 @@
+"""Projeção de listas: parâmetros fields/expand e as opções de carga do ORM.
+
+Contrato dos endpoints de listagem (itens, clientes, reservas):
+
+- ``fields=id,name,category.name``: apenas esses campos são serializados;
+  campos com ponto se aplicam ao relacionamento incorporado.
+- ``expand=item,item.category``: relacionamentos a incorporar. Quando
+  ``fields`` é informado sem ``expand``, nada é incorporado.
+- Sem nenhum dos dois, a resposta mantém o formato completo de sempre.
+
+As opções de carga espelham a projeção: load_only nas colunas pedidas e
+joinedload (com suas próprias colunas) para cada relacionamento incorporado.
+"""
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, load_only
+
+from src.models.rental import split_paths
+
+
+def _parse_list(value):
+    if value is None:
+        return None
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def from_request(args):
+    """Lê fields e expand da query string; retorna (fields, expand)."""
+    fields = _parse_list(args.get('fields'))
+    expand = _parse_list(args.get('expand'))
+    if fields is not None and expand is None:
+        expand = []
+    return fields, expand
+
+
+def loader_options(model, fields=None, expand=None):
+    """Opções de carga para serializar `model` com to_dict(fields, expand)."""
+    options = []
+    own_fields, nested_fields = split_paths(fields) if fields is not None else (None, {})
+
+    if own_fields is not None:
+        column_names = {attr.key for attr in inspect(model).column_attrs}
+        needed = {'id'}
+        for name in own_fields:
+            if name in column_names:
+                needed.add(name)
+            needed.update(model.COMPUTED_COLUMNS.get(name, ()))
+        options.append(load_only(*(getattr(model, name) for name in sorted(needed))))
+
+    if expand is None:
+        relations = {name: None for name in model.DEFAULT_EXPAND}
+    else:
+        own_expand, nested_expand = split_paths(expand)
+        relations = {
+            name: nested_expand.get(name, set())
+            for name in own_expand | set(nested_expand)
+            if name in model.RELATIONS
+        }
+
+    for name, sub_expand in relations.items():
+        relationship = getattr(model, name)
+        target = relationship.property.mapper.class_
+        sub_options = loader_options(target, nested_fields.get(name), sub_expand)
+        loader = joinedload(relationship)
+        options.append(loader.options(*sub_options) if sub_options else loader)
+
+    return options
@@ -0,0 +1,260 @@
+"""Limite de requisições por tenant e por usuário (token bucket).
+
+Cada requisição autenticada consome uma ficha do balde do usuário e uma do
+balde do tenant; sem token válido consome do balde do IP. O balde do
+usuário vem primeiro e uma requisição recusada devolve as fichas já
+tiradas, então um usuário acima do próprio limite não gasta a cota que o
+tenant divide com os colegas. Taxa e rajada de
+cada balde vêm do plano do tenant (Tenant.plan, ver PLANS), que só o
+operador altera (`flask plans set <tenant> <plano>`). Sem ficha, a
+requisição é recusada com 429 e Retry-After antes de chegar à rota, então
+um tenant abusivo gasta só o custo de verificar o token.
+
+Com RATE_LIMIT_BACKEND='local' cada worker tem seus próprios baldes (o
+limite efetivo é multiplicado pelo número de workers). Com 'redis' o balde
+de cada chave é global: o worker retira do Redis um lote de fichas
+(RATE_LIMIT_LEASE_FRACTION da rajada) e atende as requisições seguintes da
+memória, indo ao Redis uma vez por lote. Fichas não usadas em
+RATE_LIMIT_LEASE_TTL segundos são descartadas. Se o Redis cair, o worker
+volta aos baldes locais até ele voltar.
+"""
+import logging
+import math
+import threading
+import time
+
+import click
+from flask import g, jsonify, request
+from flask.cli import AppGroup
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+from sqlalchemy import or_
+
+from src.models.user import db
+from src.models.tenant import Tenant
+from src.services import lookups
+from src.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# (fichas por segundo, rajada) de cada balde por plano
+PLANS = {
+    'basic': {'tenant': (20, 100), 'user': (10, 50)},
+    'pro': {'tenant': (100, 500), 'user': (30, 150)},
+    'enterprise': {'tenant': (500, 2000), 'user': (100, 500)},
+}
+DEFAULT_PLAN = 'basic'
+
+KEY_PREFIX = 'rental:rl'
+
+# Balde global no Redis: devolve {fichas concedidas, fichas restantes}. Usa
+# o relógio do Redis para não depender do relógio de cada host
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local want = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local granted = math.min(want, math.floor(tokens))
+tokens = tokens - granted
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {granted, tostring(tokens)}
+"""
+
+
+class RateLimited(Exception):
+    def __init__(self, limit, retry_after):
+        super().__init__(retry_after)
+        self.limit = limit
+        self.retry_after = retry_after
+
+
+class _Bucket:
+    """Balde local; no modo redis guarda só as fichas retiradas do Redis."""
+    __slots__ = ('tokens', 'updated')
+
+    def __init__(self, tokens, updated):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class RateLimiter:
+    def __init__(self):
+        self.enabled = False
+        self.store = None
+        self.lease_fraction = 0.05
+        self.lease_ttl = 1.0
+        self.anonymous = (5, 20)
+        self._script = None
+        self._buckets = self._new_buckets(10000)
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.enabled = app.config.get('RATE_LIMIT_ENABLED', True)
+        self.lease_fraction = app.config.get('RATE_LIMIT_LEASE_FRACTION', self.lease_fraction)
+        self.lease_ttl = app.config.get('RATE_LIMIT_LEASE_TTL', self.lease_ttl)
+        self.anonymous = (app.config.get('RATE_LIMIT_ANONYMOUS_RATE', self.anonymous[0]),
+                          app.config.get('RATE_LIMIT_ANONYMOUS_BURST', self.anonymous[1]))
+        self.store = self._script = None
+        if app.config.get('RATE_LIMIT_BACKEND', 'local') == 'redis':
+            import redis
+            self.store = redis.Redis.from_url(app.config['REDIS_URL'], socket_timeout=1)
+            self._script = self.store.register_script(_TAKE_SCRIPT)
+        with self._lock:
+            self._buckets = self._new_buckets(app.config.get('RATE_LIMIT_MAX_BUCKETS', 10000))
+
+        if self.enabled:
+            app.before_request(_check_request)
+            app.after_request(_add_headers)
+
+    # ----- Baldes -----
+
+    def _new_buckets(self, maxsize):
+        # Um balde parado pelo tempo de reencher a rajada está cheio: descartá-lo
+        # não muda nada. O limite de tamanho segura a memória com muitos IPs
+        refill = max(burst / rate for rate, burst in [self.anonymous] + [
+            limit for plan in PLANS.values() for limit in plan.values()])
+        return LRUCache('rate_limit', maxsize=maxsize, ttl=max(refill, self.lease_ttl) + 1)
+
+    def _take_local(self, key, rate, burst, now):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _Bucket(burst, now)
+        self._buckets.set(key, bucket)
+        bucket.tokens = min(burst, bucket.tokens + (now - bucket.updated) * rate)
+        bucket.updated = now
+        if bucket.tokens < 1:
+            return (1 - bucket.tokens) / rate, 0
+        bucket.tokens -= 1
+        return 0, int(bucket.tokens)
+
+    def _take_leased(self, key, rate, burst, now):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None and bucket.tokens >= 1 and now - bucket.updated < self.lease_ttl:
+                bucket.tokens -= 1
+                return 0, int(bucket.tokens)
+
+        # Fora do lock: as demais chaves seguem atendidas da memória
+        want = max(1, int(burst * self.lease_fraction))
+        granted, remaining = self._script(keys=[f'{KEY_PREFIX}:{key}'], args=[rate, burst, want])
+        remaining = float(remaining)
+        if not granted:
+            return (1 - remaining) / rate, 0
+        with self._lock:
+            self._buckets.set(key, _Bucket(granted - 1, now))
+        return 0, int(remaining) + granted - 1
+
+    def _refund(self, key, burst):
+        # A ficha volta para o balde local ou para o lote retirado do Redis
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.tokens = min(burst, bucket.tokens + 1)
+
+    def _take(self, key, rate, burst, now):
+        if self._script is not None:
+            try:
+                return self._take_leased(key, rate, burst, now)
+            except Exception as e:
+                logger.error('Limite global indisponível, usando o local: %s', e)
+        with self._lock:
+            return self._take_local(key, rate, burst, now)
+
+    def take(self, limits):
+        """Consome uma ficha de cada balde [(chave, taxa, rajada)], em ordem.
+
+        Retorna (rajada, restantes) do balde mais apertado ou levanta
+        RateLimited no primeiro balde vazio: os seguintes não são cobrados e
+        os anteriores recebem a ficha de volta.
+        """
+        now = time.monotonic()
+        tightest = None
+        taken = []
+        for key, rate, burst in limits:
+            wait, remaining = self._take(key, rate, burst, now)
+            if wait:
+                for taken_key, taken_burst in taken:
+                    self._refund(taken_key, taken_burst)
+                raise RateLimited(burst, wait)
+            taken.append((key, burst))
+            if tightest is None or remaining < tightest[1]:
+                tightest = (burst, remaining)
+        return tightest
+
+
+limiter = RateLimiter()
+
+
+def plan_limits(plan):
+    return PLANS.get(plan) or PLANS[DEFAULT_PLAN]
+
+
+def _request_limits():
+    try:
+        verify_jwt_in_request(optional=True)
+        claims = get_jwt()
+    except Exception:
+        # Token inválido: a rota responde 401; aqui conta como anônimo
+        claims = {}
+
+    if not claims.get('sub'):
+        rate, burst = limiter.anonymous
+        return [(f'ip:{request.remote_addr}', rate, burst)]
+
+    tenant_id = claims.get('tenant_id')
+    tenant = lookups.get_tenant(tenant_id) if tenant_id is not None else None
+    limits = plan_limits(tenant.plan if tenant is not None else None)
+    # Usuário antes do tenant: quem já estourou o próprio limite não chega à cota comum
+    user_rate, user_burst = limits['user']
+    buckets = [(f"user:{claims['sub']}", user_rate, user_burst)]
+    if tenant_id is not None:
+        tenant_rate, tenant_burst = limits['tenant']
+        buckets.append((f'tenant:{tenant_id}', tenant_rate, tenant_burst))
+    return buckets
+
+
+def _check_request():
+    if not request.path.startswith('/api/') or request.path.startswith(('/api/health', '/api/metrics')) \
+            or request.method == 'OPTIONS':
+        return None
+    try:
+        g.rate_limit = limiter.take(_request_limits())
+    except RateLimited as e:
+        retry_after = max(1, math.ceil(e.retry_after))
+        g.rate_limit = (e.limit, 0)
+        return jsonify({'error': 'Limite de requisições excedido, tente novamente em instantes'}), 429, \
+            {'Retry-After': str(retry_after)}
+    return None
+
+
+def _add_headers(response):
+    limit = g.get('rate_limit')
+    if limit is not None:
+        response.headers['X-RateLimit-Limit'] = str(limit[0])
+        response.headers['X-RateLimit-Remaining'] = str(limit[1])
+    return response
+
+
+plans_cli = AppGroup('plans', help='Planos dos tenants (limites de requisições).')
+
+
+@plans_cli.command('set')
+@click.argument('tenant')
+@click.argument('plan', type=click.Choice(sorted(PLANS)))
+def set_plan_command(tenant, plan):
+    """Muda o plano de um tenant (id, subdomínio ou domínio)."""
+    criteria = [Tenant.subdomain == tenant, Tenant.domain == tenant]
+    if tenant.isdigit():
+        criteria.append(Tenant.id == int(tenant))
+    found = Tenant.query.filter(or_(*criteria)).first()
+    if found is None:
+        raise click.ClickException(f'Tenant não encontrado: {tenant}')
+
+    previous, found.plan = found.plan, plan
+    db.session.commit()
+    click.echo(f'tenant {found.id} ({found.subdomain}): {previous} -> {plan}')
@@ -0,0 +1,232 @@
+"""Cache de respostas HTTP por tenant.
+
+O decorator ``cached(namespace)`` guarda o corpo das respostas 200 de rotas
+GET. A chave combina tenant, namespace da rota, query string normalizada e
+a "geração de dados" do tenant: um contador incrementado no after_commit de
+toda sessão que gravou algo do tenant servido pelas rotas em cache
+(CACHED_MODELS); usuários não entram, senão cada login (last_login)
+invalidaria o tenant inteiro. Invalidar é, portanto, um INCR; as
+respostas das gerações anteriores deixam de ser lidas e expiram pelo TTL.
+
+Backends (RESPONSE_CACHE_BACKEND):
+- 'redis': compartilhado entre workers (REDIS_URL);
+- 'local': LocalRedis em memória, para testes e processo único;
+- vazio: desligado.
+
+Em um miss, só uma requisição por chave recalcula a resposta (lock SET NX);
+as demais aguardam o valor por até RESPONSE_CACHE_LOCK_TIMEOUT segundos.
+Falhas do Redis não derrubam a requisição: a rota é executada sem cache.
+
+As respostas levam ETag derivado da chave, então um GET condicional
+(If-None-Match) é respondido com 304 sem consultar o banco nem serializar
+o corpo. Com o cache desligado o ETag é calculado sobre o corpo.
+"""
+import functools
+import hashlib
+import json
+import logging
+import time
+
+from flask import current_app, make_response, request, Response
+from flask_jwt_extended import get_jwt
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.models.tenant import Tenant
+from src.models.rental import Category, RentalItem, Customer, Reservation
+from src.utils.cache import LocalRedis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'rental:resp'
+LOCK_POLL_INTERVAL = 0.025  # segundos
+
+
+def init_app(app):
+    backend = app.config.get('RESPONSE_CACHE_BACKEND')
+    store = None
+    if backend == 'redis':
+        try:
+            import redis
+            store = redis.Redis.from_url(app.config['REDIS_URL'], socket_timeout=1)
+        except ImportError:
+            logger.warning("RESPONSE_CACHE_BACKEND='redis', mas o pacote redis não está instalado")
+    elif backend == 'local':
+        store = LocalRedis()
+    app.extensions['response_cache'] = store
+
+
+def _store():
+    try:
+        return current_app.extensions.get('response_cache')
+    except RuntimeError:
+        return None
+
+
+def _generation_key(tenant_id):
+    return f"{KEY_PREFIX}:gen:{tenant_id}"
+
+
+def generation(store, tenant_id):
+    """Geração atual dos dados do tenant."""
+    value = store.get(_generation_key(tenant_id))
+    if value is None:
+        # Começa de um valor único para não reaproveitar respostas de um
+        # contador que foi perdido (restart/eviction do Redis)
+        store.set(_generation_key(tenant_id), time.time_ns(), nx=True)
+        value = store.get(_generation_key(tenant_id))
+    return int(value)
+
+
+def bump(tenant_ids):
+    store = _store()
+    if store is None:
+        return
+    for tenant_id in tenant_ids:
+        try:
+            store.incr(_generation_key(tenant_id))
+        except Exception as e:
+            logger.warning('Falha ao invalidar cache de respostas do tenant %s: %s', tenant_id, e)
+
+
+def _args_digest():
+    args = sorted((key, value) for key, values in request.args.lists() for value in values)
+    return hashlib.sha1(json.dumps(args).encode()).hexdigest()
+
+
+def _cached_response(payload, status):
+    mimetype, body = payload.split(b'\n', 1)
+    response = Response(body, status=200, mimetype=mimetype.decode())
+    response.headers['X-Cache'] = status
+    return response
+
+
+def _save(store, key, response):
+    try:
+        store.set(key, response.mimetype.encode() + b'\n' + response.get_data(),
+                  ex=current_app.config.get('RESPONSE_CACHE_TTL', 30))
+    except Exception as e:
+        logger.warning('Falha ao gravar no cache de respostas: %s', e)
+
+
+def _release(store, lock_key):
+    try:
+        store.delete(lock_key)
+    except Exception:
+        pass  # o lock expira sozinho
+
+
+def _validated(response, etag=None):
+    """Acrescenta o ETag e os cabeçalhos de revalidação a uma resposta 200."""
+    if response.status_code != 200:
+        return response
+    if etag:
+        response.set_etag(etag)
+    else:
+        # Sem contador de geração: ETag pelo conteúdo (economiza só a banda)
+        response.add_etag()
+        response.make_conditional(request)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Authorization')
+    return response
+
+
+def _not_modified(etag):
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Authorization')
+    return response
+
+
+def cached(namespace, expires=None):
+    """Decorator de rotas GET já autenticadas (use abaixo de @jwt_required).
+
+    ``expires`` (segundos) limita a validade de respostas que dependem do
+    relógio além dos dados, como "próximas reservas" no dashboard.
+
+    Respostas 200 levam um ETag derivado da mesma chave do cache; um
+    If-None-Match igual é respondido com 304 sem executar a rota.
+    """
+    def decorator(f):
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            store = _store()
+            tenant_id = get_jwt().get('tenant_id')
+            if tenant_id is None:
+                return f(*args, **kwargs)
+            if store is None:
+                return _validated(make_response(f(*args, **kwargs)))
+
+            locked = False
+            try:
+                version = generation(store, tenant_id)
+                if expires:
+                    version = f"{version}.{int(time.time() // expires)}"
+                key = f"{KEY_PREFIX}:{tenant_id}:{version}:{namespace}:{_args_digest()}"
+                etag = hashlib.sha1(key.encode()).hexdigest()
+                if request.if_none_match.contains_weak(etag):
+                    return _not_modified(etag)
+
+                payload = store.get(key)
+                if payload is not None:
+                    return _validated(_cached_response(payload, 'HIT'), etag)
+
+                lock_timeout = current_app.config.get('RESPONSE_CACHE_LOCK_TIMEOUT', 5)
+                locked = store.set(f"{key}:lock", 1, ex=lock_timeout, nx=True)
+                if not locked:
+                    # Outra requisição está calculando esta resposta
+                    deadline = time.monotonic() + lock_timeout
+                    while time.monotonic() < deadline:
+                        time.sleep(LOCK_POLL_INTERVAL)
+                        payload = store.get(key)
+                        if payload is not None:
+                            return _validated(_cached_response(payload, 'HIT'), etag)
+            except Exception as e:
+                logger.warning('Cache de respostas indisponível: %s', e)
+                return _validated(make_response(f(*args, **kwargs)))
+
+            try:
+                response = make_response(f(*args, **kwargs))
+                response.headers['X-Cache'] = 'MISS'
+                if response.status_code == 200 and not response.direct_passthrough:
+                    _save(store, key, response)
+                return _validated(response, etag)
+            finally:
+                if locked:
+                    _release(store, f"{key}:lock")
+        return wrapper
+    return decorator
+
+
+# ----- Geração de dados por tenant -----
+
+_PENDING_KEY = 'response_cache_tenants'
+
+# Modelos cujos dados aparecem nas respostas das rotas com @cached
+CACHED_MODELS = (Tenant, Category, RentalItem, Customer, Reservation)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_tenants(session, flush_context):
+    tenant_ids = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, CACHED_MODELS):
+            continue
+        tenant_id = obj.id if isinstance(obj, Tenant) else obj.tenant_id
+        if tenant_id is not None:
+            tenant_ids.add(tenant_id)
+    if tenant_ids:
+        session.info.setdefault(_PENDING_KEY, set()).update(tenant_ids)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_generations(session):
+    tenant_ids = session.info.pop(_PENDING_KEY, None)
+    if tenant_ids:
+        bump(tenant_ids)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_tenants(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,137 @@
+"""Revogação de tokens JWT (logout) por jti.
+
+Cada token revogado é gravado no store (Redis, ou LocalRedis em processo
+único) com expiração igual ao tempo de vida restante do token, e registrado
+no conjunto ordenado ``rental:revoked:log`` com o instante da revogação.
+
+Cada worker mantém um filtro de Bloom com os jtis revogados. A verificação
+de cada requisição (token_in_blocklist_loader) consulta só o filtro: se o
+jti com certeza não está nele, o token vale sem ida ao Redis. Um "talvez"
+(revogado de fato ou falso positivo) é confirmado no store.
+
+A cada REVOCATION_SYNC_INTERVAL segundos o worker busca no log as
+revogações feitas pelos outros workers desde a última busca (uma consulta
+por intervalo, não por requisição); um logout leva até esse intervalo para
+valer nos demais workers. O filtro é reconstruído do log quando atinge a
+capacidade ou a cada REVOCATION_REBUILD_INTERVAL, descartando tokens já
+expirados.
+
+Se o store estiver fora do ar, a sincronização é adiada (o filtro atual
+continua valendo) e um "talvez" não confirmado recusa o token.
+"""
+import logging
+import threading
+import time
+
+from src.utils.bloom import BloomFilter
+from src.utils.cache import LocalRedis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'rental:revoked'
+LOG_KEY = f'{KEY_PREFIX}:log'
+CLOCK_SKEW = 5  # segundos de sobreposição entre buscas (relógios dos hosts)
+
+
+class TokenBlocklist:
+    def __init__(self):
+        self.store = None
+        self.capacity = 100_000
+        self.error_rate = 0.001
+        self.sync_interval = 2
+        self.rebuild_interval = 3600
+        self.max_lifetime = 30 * 24 * 3600
+        self._bloom = None
+        self._synced_until = 0.0
+        self._next_sync = 0.0
+        self._next_rebuild = 0.0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        backend = app.config.get('TOKEN_REVOCATION_BACKEND', 'local')
+        if backend == 'redis':
+            import redis
+            self.store = redis.Redis.from_url(app.config['REDIS_URL'], socket_timeout=1)
+        else:
+            self.store = LocalRedis()
+        self.capacity = app.config.get('REVOCATION_BLOOM_CAPACITY', self.capacity)
+        self.error_rate = app.config.get('REVOCATION_BLOOM_ERROR_RATE', self.error_rate)
+        self.sync_interval = app.config.get('REVOCATION_SYNC_INTERVAL', self.sync_interval)
+        self.rebuild_interval = app.config.get('REVOCATION_REBUILD_INTERVAL', self.rebuild_interval)
+        lifetimes = [app.config.get('JWT_ACCESS_TOKEN_EXPIRES'), app.config.get('JWT_REFRESH_TOKEN_EXPIRES')]
+        self.max_lifetime = max(int(value.total_seconds()) for value in lifetimes if value)
+        self._bloom = None
+
+    # ----- Escrita -----
+
+    def revoke(self, jti, expires_at):
+        """Revoga o token até sua expiração (timestamp 'exp' do JWT)."""
+        now = time.time()
+        ttl = max(1, int(expires_at - now))
+        self.store.set(f'{KEY_PREFIX}:{jti}', 1, ex=ttl)
+        self.store.zadd(LOG_KEY, {jti: now})
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    # ----- Leitura -----
+
+    def _rebuild(self, now):
+        # Log mais antigo que o maior tempo de vida de um token não serve mais
+        self.store.zremrangebyscore(LOG_KEY, '-inf', now - self.max_lifetime)
+        entries = self.store.zrangebyscore(LOG_KEY, '-inf', '+inf', withscores=True)
+        bloom = BloomFilter(max(self.capacity, 2 * len(entries)), self.error_rate)
+        for jti, _ in entries:
+            bloom.add(jti)
+        self._bloom = bloom
+        self._synced_until = entries[-1][1] if entries else now - self.max_lifetime
+        self._next_rebuild = now + self.rebuild_interval
+
+    def _pull(self):
+        # Busca com sobreposição: revogações gravadas por um host com relógio
+        # atrasado não se perdem e repetir um jti no filtro é inofensivo
+        entries = self.store.zrangebyscore(LOG_KEY, self._synced_until - CLOCK_SKEW, '+inf', withscores=True)
+        for jti, _ in entries:
+            if jti not in self._bloom:
+                self._bloom.add(jti)
+        if entries:
+            self._synced_until = max(self._synced_until, entries[-1][1])
+
+    def _sync(self):
+        now = time.time()
+        if self._bloom is not None and now < self._next_sync:
+            return
+        with self._lock:
+            if self._bloom is not None and now < self._next_sync:
+                return
+            try:
+                if self._bloom is None or self._bloom.full or now >= self._next_rebuild:
+                    self._rebuild(now)
+                else:
+                    self._pull()
+            except Exception as e:
+                # Sem o log, segue com o filtro que tiver (vazio no início) e
+                # tenta de novo no próximo intervalo
+                logger.error('Falha ao sincronizar tokens revogados: %s', e)
+                if self._bloom is None:
+                    self._bloom = BloomFilter(self.capacity, self.error_rate)
+            self._next_sync = now + self.sync_interval
+
+    def is_revoked(self, jti):
+        self._sync()
+        if jti not in self._bloom:
+            return False
+        return bool(self.store.exists(f'{KEY_PREFIX}:{jti}'))
+
+
+blocklist = TokenBlocklist()
+
+
+def token_in_blocklist(jwt_header, jwt_payload):
+    """Callback do flask_jwt_extended (token_in_blocklist_loader)."""
+    try:
+        return blocklist.is_revoked(jwt_payload['jti'])
+    except Exception as e:
+        # Sem como confirmar, o token é recusado
+        logger.error('Verificação de token revogado indisponível: %s', e)
+        return True
@@ -0,0 +1,201 @@
+"""Busca textual de itens e clientes.
+
+Substitui o ``LIKE '%termo%'`` (que não usa índice nenhum) por:
+
+- PostgreSQL: coluna ``search_vector`` (tsvector gerado pelo próprio banco,
+  com pesos) em um índice GIN ``(tenant_id, search_vector)`` e um índice
+  trigram (pg_trgm) para buscas por trecho no meio da palavra. O ranking
+  soma ``ts_rank`` e ``similarity``.
+- SQLite: tabela virtual FTS5 por entidade, mantida por triggers, com o
+  tenant como um token próprio (``t<id>``) para que o filtro de tenant
+  também seja resolvido pelo índice. O ranking é o ``bm25``.
+
+A última palavra digitada é tratada como prefixo (``mesa red`` encontra
+``Mesa redonda``), então a busca serve para type-ahead; as anteriores,
+já completas, casam a palavra inteira. No SQLite a busca casa só início de
+palavra (``adeira`` não encontra ``Furadeira``); trechos no meio da palavra
+continuam valendo no PostgreSQL, pelo índice trigram. Os objetos de banco são
+criados junto com as tabelas (create_all) e pela migração 0003; a
+sincronização nas escritas é feita pelo banco (coluna gerada/triggers),
+inclusive em inserts em massa. Banco sem esses objetos (criado por
+create_all antes deles, ainda sem a migração 0003) cai no ``LIKE '%termo%'``
+até que eles apareçam (verificado de novo a cada ``INDEX_RECHECK_TTL``).
+"""
+import re
+import threading
+import time
+
+from sqlalchemy import DDL, Integer, bindparam, column, event, func, inspect, literal_column, or_, select, table
+
+from src.models.rental import RentalItem, Customer
+
+
+class SearchSpec:
+    """Colunas pesquisáveis de um modelo e os objetos de busca derivados delas."""
+
+    def __init__(self, model, primary, secondary, trigram):
+        self.model = model
+        self.table = model.__tablename__
+        self.primary = primary        # peso alto (nome, código)
+        self.secondary = secondary    # peso baixo (descrição, contatos)
+        self.trigram = trigram        # expressão SQL com índice pg_trgm
+        self.fts_table = f'{self.table}_fts'
+
+    @property
+    def columns(self):
+        return self.primary + self.secondary
+
+    # ----- PostgreSQL -----
+
+    def postgresql_ddl(self):
+        def vector(columns, weight):
+            return ' || '.join(
+                f"setweight(to_tsvector('simple', coalesce({name}, '')), '{weight}')" for name in columns
+            )
+
+        return [
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            "CREATE EXTENSION IF NOT EXISTS btree_gin",
+            f"ALTER TABLE {self.table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({vector(self.primary, 'A')} || {vector(self.secondary, 'B')}) STORED",
+            f"CREATE INDEX IF NOT EXISTS ix_{self.table}_search ON {self.table} "
+            f"USING gin (tenant_id, search_vector)",
+            f"CREATE INDEX IF NOT EXISTS ix_{self.table}_trgm ON {self.table} "
+            f"USING gin (tenant_id, ({self.trigram}) gin_trgm_ops)",
+        ]
+
+    # ----- SQLite -----
+
+    def sqlite_ddl(self):
+        names = ', '.join(self.columns)
+        new_values = ', '.join(f'new.{name}' for name in self.columns)
+        insert = (f"INSERT INTO {self.fts_table}(rowid, tenant, {names}) "
+                  f"VALUES (new.id, 't' || new.tenant_id, {new_values});")
+        delete = f"DELETE FROM {self.fts_table} WHERE rowid = old.id;"
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.fts_table} USING fts5("
+            f"tenant, {names}, tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3')",
+            f"CREATE TRIGGER IF NOT EXISTS {self.fts_table}_ai AFTER INSERT ON {self.table} "
+            f"BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.fts_table}_ad AFTER DELETE ON {self.table} "
+            f"BEGIN {delete} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.fts_table}_au AFTER UPDATE OF tenant_id, {names} "
+            f"ON {self.table} BEGIN {delete} {insert} END",
+        ]
+
+
+SPECS = {
+    RentalItem: SearchSpec(
+        RentalItem,
+        primary=('name', 'sku', 'barcode'),
+        secondary=('description',),
+        trigram='name'
+    ),
+    Customer: SearchSpec(
+        Customer,
+        primary=('first_name', 'last_name'),
+        secondary=('email', 'document_number', 'phone'),
+        trigram="coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || coalesce(email, '')"
+    ),
+}
+
+
+def tokenize(term):
+    """Palavras da busca, em minúsculas (apenas letras, dígitos e _)."""
+    return re.findall(r'\w+', (term or '').lower())
+
+
+def _apply_postgresql(query, spec, term, tokens, ranked):
+    vector = literal_column(f'{spec.table}.search_vector')
+    trigram = literal_column(f'({spec.trigram})')
+    ts_query = func.to_tsquery('simple', ' & '.join(tokens[:-1] + [f'{tokens[-1]}:*']))
+
+    query = query.filter(or_(vector.op('@@')(ts_query), trigram.icontains(term, autoescape=True)))
+    if ranked:
+        rank = func.ts_rank(vector, ts_query) + func.similarity(trigram, term)
+        query = query.order_by(rank.desc(), spec.model.id)
+    return query
+
+
+def _apply_sqlite(query, spec, tenant_id, tokens, ranked):
+    fts = table(spec.fts_table, column('rowid', Integer), column(spec.fts_table))
+    words = ' AND '.join([f'"{token}"' for token in tokens[:-1]] + [f'"{tokens[-1]}"*'])
+    expression = f'tenant : t{int(tenant_id)} AND {{{" ".join(spec.columns)}}} : ({words})'
+
+    # bm25 com peso 0 para o tenant e maior para as colunas principais
+    weights = [0.0] + [10.0] * len(spec.primary) + [1.0] * len(spec.secondary)
+    rank = func.bm25(literal_column(spec.fts_table), *weights)
+    # MATERIALIZED: o MATCH roda uma vez; sem isso o SQLite pode inverter o
+    # join (no COUNT da paginação) e repetir a busca para cada item do tenant
+    matches = select(fts.c.rowid.label('id'), rank.label('rank')).where(
+        fts.c[spec.fts_table].match(bindparam('search_expression', expression))
+    ).cte(f'{spec.fts_table}_matches').prefix_with('MATERIALIZED')
+
+    query = query.join(matches, matches.c.id == spec.model.id)
+    if ranked:
+        query = query.order_by(matches.c.rank, spec.model.id)
+    return query
+
+
+# Banco sem os objetos de busca é verificado de novo depois desse tempo: a
+# migração 0003 pode ser aplicada com os workers no ar
+INDEX_RECHECK_TTL = 60  # segundos
+
+_indexed = {}   # (engine, tabela) -> (tem índice?, válido até)
+_indexed_lock = threading.Lock()
+
+
+def _is_indexed(engine, spec):
+    """O banco tem os objetos de busca (FTS / search_vector)? Resultado positivo fica em cache por engine."""
+    key = (engine, spec.table)
+    cached = _indexed.get(key)
+    if cached is None or cached[1] < time.monotonic():
+        with _indexed_lock:
+            cached = _indexed.get(key)
+            if cached is None or cached[1] < time.monotonic():
+                inspector = inspect(engine)
+                if engine.dialect.name == 'postgresql':
+                    found = any(col['name'] == 'search_vector' for col in inspector.get_columns(spec.table))
+                else:
+                    found = inspector.has_table(spec.fts_table)
+                expires = float('inf') if found else time.monotonic() + INDEX_RECHECK_TTL
+                cached = _indexed[key] = (found, expires)
+    return cached[0]
+
+
+def _apply_contains(query, spec, term):
+    """Busca por trecho, sem índice."""
+    return query.filter(or_(*(getattr(spec.model, name).contains(term, autoescape=True) for name in spec.columns)))
+
+
+def apply(query, model, tenant_id, term, ranked=True):
+    """Filtra `query` pela busca `term`; com `ranked`, ordena por relevância.
+
+    A paginação por cursor ordena por id, então deve chamar com ranked=False.
+    """
+    tokens = tokenize(term)
+    if not tokens:
+        return query
+
+    spec = SPECS[model]
+    engine = query.session.get_bind()
+    if engine.dialect.name in ('postgresql', 'sqlite') and _is_indexed(engine, spec):
+        if engine.dialect.name == 'postgresql':
+            return _apply_postgresql(query, spec, term.strip(), tokens, ranked)
+        return _apply_sqlite(query, spec, tenant_id, tokens, ranked)
+
+    # Outros bancos, ou banco ainda sem a migração 0003
+    return _apply_contains(query, spec, term)
+
+
+def _register_ddl(spec):
+    target = spec.model.__table__
+    for statement in spec.postgresql_ddl():
+        event.listen(target, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+    for statement in spec.sqlite_ddl():
+        event.listen(target, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    event.listen(target, 'after_drop', DDL(f'DROP TABLE IF EXISTS {spec.fts_table}').execute_if(dialect='sqlite'))
+
+
+for _spec in SPECS.values():
+    _register_ddl(_spec)
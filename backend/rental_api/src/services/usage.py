@@ -0,0 +1,223 @@
+"""Contadores de uso por tenant (tabela tenant_usage).
+
+Os contadores são ajustados na mesma transação de cada inserção, remoção ou
+mudança de status/ativação de usuários, itens, clientes e reservas, então os
+endpoints de estatísticas leem uma única linha em vez de fazer COUNT(*). Os
+flushes só acumulam as diferenças; um UPDATE por tenant roda logo antes do
+commit, para que o lock da linha do tenant dure só até o commit e não
+serialize transações inteiras (reservas de itens diferentes, por exemplo).
+O comando `flask usage reconcile` recalcula tudo do zero e reporta a deriva.
+"""
+import logging
+from collections import defaultdict, namedtuple
+from datetime import datetime
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event, func, inspect, insert, select, update
+from sqlalchemy.orm import Session
+
+from src.models.user import db, User
+from src.models.tenant import Tenant, TenantUsage
+from src.models.rental import RentalItem, Customer, Reservation, ReservationStatus
+from src.utils import db_routing
+
+logger = logging.getLogger(__name__)
+
+
+def _status_column(status):
+    column = f'reservations_{status or ReservationStatus.PENDING.value}'
+    return column if column in TenantUsage.COUNTER_COLUMNS else None
+
+
+def _committed_value(obj, attr):
+    """Valor do atributo antes das alterações pendentes na sessão."""
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(obj, attr)
+
+
+def _counters_for(obj, committed=False):
+    """Contadores que uma linha representa (ex.: item ativo = itens + ativos)."""
+    value = (lambda attr: _committed_value(obj, attr)) if committed else (lambda attr: getattr(obj, attr))
+
+    if isinstance(obj, User):
+        return ['users_count']
+    if isinstance(obj, Customer):
+        return ['customers_count']
+    if isinstance(obj, RentalItem):
+        # Mesmo critério de count_from_scratch (is_active IS TRUE): NULL não é ativo
+        return ['items_count', 'active_items_count'] if value('is_active') is True else ['items_count']
+    if isinstance(obj, Reservation):
+        column = _status_column(value('status'))
+        return [column] if column else []
+    return []
+
+
+_TRACKED = (User, Customer, RentalItem, Reservation)
+
+_PENDING_KEY = 'usage_pending'
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_usage_deltas(session, flush_context):
+    new_tenants = [obj.id for obj in session.new if isinstance(obj, Tenant)]
+    deltas = session.info.get(_PENDING_KEY) or defaultdict(lambda: defaultdict(int))
+
+    for obj in session.new:
+        if isinstance(obj, _TRACKED) and obj.tenant_id:
+            for column in _counters_for(obj):
+                deltas[obj.tenant_id][column] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, _TRACKED):
+            tenant_id = _committed_value(obj, 'tenant_id')
+            for column in _counters_for(obj, committed=True):
+                deltas[tenant_id][column] -= 1
+
+    for obj in session.dirty:
+        if isinstance(obj, (RentalItem, Reservation)) and session.is_modified(obj):
+            before = _counters_for(obj, committed=True)
+            after = _counters_for(obj)
+            if before != after:
+                for column in before:
+                    deltas[obj.tenant_id][column] -= 1
+                for column in after:
+                    deltas[obj.tenant_id][column] += 1
+
+    if deltas:
+        session.info[_PENDING_KEY] = deltas
+    # A linha do tenant novo nasce já: ninguém mais a disputa
+    for tenant_id in new_tenants:
+        session.connection().execute(insert(TenantUsage.__table__).values(
+            tenant_id=tenant_id,
+            **{column: 0 for column in TenantUsage.COUNTER_COLUMNS}
+        ))
+
+
+@event.listens_for(Session, 'before_commit')
+def _apply_usage_deltas(session):
+    session.flush()  # alterações ainda não enviadas também entram na conta
+    deltas = session.info.pop(_PENDING_KEY, None)
+    if not deltas:
+        return
+
+    connection = session.connection()
+    table = TenantUsage.__table__
+    for tenant_id, changes in deltas.items():
+        values = {column: table.c[column] + delta for column, delta in changes.items() if delta}
+        if values:
+            connection.execute(update(table).where(table.c.tenant_id == tenant_id).values(**values))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_usage_deltas(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def count_from_scratch(tenant_id):
+    """Recalcula os contadores do tenant com duas consultas agrupadas."""
+    def count(model, *criteria):
+        return select(func.count(model.id)).where(model.tenant_id == tenant_id, *criteria).scalar_subquery()
+
+    row = db.session.execute(select(
+        count(User),
+        count(RentalItem),
+        count(RentalItem, RentalItem.is_active.is_(True)),
+        count(Customer)
+    )).one()
+
+    counts = {column: 0 for column in TenantUsage.COUNTER_COLUMNS}
+    counts.update({
+        'users_count': row[0],
+        'items_count': row[1],
+        'active_items_count': row[2],
+        'customers_count': row[3]
+    })
+
+    rows = db.session.query(Reservation.status, func.count(Reservation.id)).filter(
+        Reservation.tenant_id == tenant_id
+    ).group_by(Reservation.status).all()
+    for status, total in rows:
+        column = _status_column(status)
+        if column:
+            counts[column] += total
+    return counts
+
+
+class UsageCounts(namedtuple('UsageCounts', ('tenant_id', 'reconciled_at') + TenantUsage.COUNTER_COLUMNS)):
+    """Contadores calculados de um tenant sem linha em tenant_usage, somente leitura."""
+    __slots__ = ()
+
+    reservations_by_status = TenantUsage.reservations_by_status
+    to_dict = TenantUsage.to_dict
+
+
+def get_usage(tenant_id):
+    """Retorna a linha de uso do tenant (só leitura).
+
+    A linha nasce com o tenant (_apply_usage_deltas); tenants anteriores à
+    tabela a recebem da migração ou de `flask usage reconcile`. Se ainda
+    faltar, os contadores são calculados na hora e devolvidos num
+    UsageCounts (fora do ORM): leituras (dashboard, estatísticas) não gravam.
+    Se a linha falta numa réplica, a requisição passa a ler do primário.
+    """
+    usage = db.session.get(TenantUsage, tenant_id)
+    if usage is None and db_routing.use_primary():
+        # Numa réplica a linha pode só não ter chegado: quem decide é o primário
+        usage = db.session.get(TenantUsage, tenant_id)
+    if usage:
+        return usage
+
+    logger.warning('Tenant %s sem linha em tenant_usage; rode `flask usage reconcile`', tenant_id)
+    return UsageCounts(tenant_id=tenant_id, reconciled_at=None, **count_from_scratch(tenant_id))
+
+
+def reconcile(tenant_id, fix=True):
+    """Compara os contadores com os dados reais; retorna {coluna: (gravado, real)} divergentes."""
+    actual = count_from_scratch(tenant_id)
+    usage = db.session.get(TenantUsage, tenant_id)
+
+    if usage is None:
+        drift = {column: (None, value) for column, value in actual.items()}
+        usage = TenantUsage(tenant_id=tenant_id)
+        if fix:
+            db.session.add(usage)
+    else:
+        drift = {
+            column: (getattr(usage, column), value)
+            for column, value in actual.items()
+            if getattr(usage, column) != value
+        }
+
+    if fix:
+        for column, value in actual.items():
+            setattr(usage, column, value)
+        usage.reconciled_at = datetime.utcnow()
+        db.session.commit()
+    return drift
+
+
+usage_cli = AppGroup('usage', help='Contadores de uso por tenant.')
+
+
+@usage_cli.command('reconcile')
+@click.option('--tenant-id', type=int, help='Reconciliar apenas este tenant.')
+@click.option('--dry-run', is_flag=True, help='Apenas reportar a deriva, sem corrigir.')
+def reconcile_command(tenant_id, dry_run):
+    """Reconstrói os contadores de uso e reporta a deriva encontrada."""
+    tenant_ids = [tenant_id] if tenant_id else [row[0] for row in db.session.query(Tenant.id).order_by(Tenant.id)]
+
+    drifted = 0
+    for current_id in tenant_ids:
+        drift = reconcile(current_id, fix=not dry_run)
+        if drift:
+            drifted += 1
+            details = ', '.join(f'{column}: {stored} -> {actual}' for column, (stored, actual) in drift.items())
+            click.echo(f'tenant {current_id}: {details}')
+
+    action = 'reportados' if dry_run else 'corrigidos'
+    click.echo(f'{len(tenant_ids)} tenants verificados, {drifted} com deriva ({action}).')
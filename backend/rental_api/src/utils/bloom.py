@@ -0,0 +1,44 @@
+"""Filtro de Bloom em memória.
+
+Responde "com certeza não contém" ou "talvez contenha", com taxa de falsos
+positivos próxima de ``error_rate`` enquanto houver até ``capacity`` itens.
+Não permite remoção: para descartar itens, crie um novo filtro.
+"""
+import hashlib
+import math
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # Hashing duplo (Kirsch-Mitzenmacher) sobre um único digest
+        digest = hashlib.blake2b(item.encode() if isinstance(item, str) else item, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, item):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        # Para no primeiro bit zerado: o caso comum (item ausente) raramente
+        # calcula todas as posições
+        bits = self._bits
+        for position in self._positions(item):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def full(self):
+        return self.count >= self.capacity
@@ -0,0 +1,236 @@
+"""Cache em memória (LRU + TTL) por processo, com invalidação opcional via Redis.
+
+Cada worker tem sua própria cópia. Quando um processo invalida uma chave,
+a invalidação é publicada no canal Redis ``CACHE_INVALIDATION_CHANNEL`` (se
+``CACHE_REDIS_INVALIDATION`` estiver ativo) e os demais workers descartam a
+mesma chave; sem Redis, a coerência entre workers fica limitada ao TTL.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+CACHE_INVALIDATION_CHANNEL = 'rental:cache:invalidate'
+
+
+class LRUCache:
+    """Dicionário limitado em tamanho e idade, com contadores de acerto."""
+
+    def __init__(self, name, maxsize=1024, ttl=60):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()   # chave -> (valor, expira em)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and entry[1] > now:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not _MISSING:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key, loader):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None
+            }
+
+
+class CacheRegistry:
+    """Caches nomeados do processo e a propagação de invalidações."""
+
+    def __init__(self):
+        self._caches = {}
+        self._redis = None
+        self._listener_pid = None
+        self._lock = threading.Lock()
+
+    def create(self, name, maxsize=1024, ttl=60):
+        cache = LRUCache(name, maxsize, ttl)
+        self._caches[name] = cache
+        return cache
+
+    def configure(self, app):
+        """Aplica tamanho/TTL da configuração e liga a invalidação via Redis."""
+        for cache in self._caches.values():
+            cache.clear()  # entradas de outra aplicação/banco no mesmo processo
+            cache.maxsize = app.config.get('LOOKUP_CACHE_SIZE', cache.maxsize)
+            cache.ttl = app.config.get('LOOKUP_CACHE_TTL', cache.ttl)
+        if app.config.get('CACHE_REDIS_INVALIDATION'):
+            try:
+                import redis
+                self._redis = redis.Redis.from_url(app.config['REDIS_URL'], socket_timeout=1)
+            except ImportError:
+                logger.warning('CACHE_REDIS_INVALIDATION ativo, mas o pacote redis não está instalado')
+
+    def invalidate(self, name, key=None, broadcast=True):
+        """Descarta uma chave do cache (ou todas, com key=None)."""
+        cache = self._caches.get(name)
+        if cache and key is None:
+            cache.clear()
+        elif cache:
+            cache.delete(key)
+        if broadcast and self._redis is not None:
+            try:
+                self._redis.publish(CACHE_INVALIDATION_CHANNEL, json.dumps([name, key]))
+            except Exception as e:
+                logger.warning('Falha ao publicar invalidação de cache: %s', e)
+
+    def ensure_listener(self):
+        """Inicia (uma vez por processo, após o fork) a escuta de invalidações."""
+        if self._redis is None or self._listener_pid == os.getpid():
+            return
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+            threading.Thread(target=self._listen, name='cache-invalidation', daemon=True).start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+                for message in pubsub.listen():
+                    name, key = json.loads(message['data'])
+                    self.invalidate(name, tuple(key) if isinstance(key, list) else key, broadcast=False)
+            except Exception as e:
+                # Sem Redis as entradas expiram pelo TTL; limpa tudo por segurança
+                logger.warning('Escuta de invalidação de cache interrompida: %s', e)
+                for cache in self._caches.values():
+                    cache.clear()
+                time.sleep(5)
+
+    def stats(self):
+        return {name: cache.stats() for name, cache in self._caches.items()}
+
+
+caches = CacheRegistry()
+
+
+class LocalRedis:
+    """Subconjunto em memória da API do redis-py (strings e conjuntos ordenados).
+
+    Usado nos testes e em instalações de processo único, onde não há Redis.
+    Não é compartilhado entre processos.
+    """
+
+    def __init__(self):
+        self._data = {}   # chave -> (valor em bytes, expira em | None)
+        self._zsets = {}
+        self._lock = threading.Lock()
+
+    def _live(self, name):
+        entry = self._data.get(name)
+        if entry and entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[name]
+            return None
+        return entry
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode()
+
+    def get(self, name):
+        with self._lock:
+            entry = self._live(name)
+            return entry[0] if entry else None
+
+    def set(self, name, value, ex=None, nx=False):
+        with self._lock:
+            if nx and self._live(name):
+                return None
+            self._data[name] = (self._encode(value), time.monotonic() + ex if ex else None)
+            return True
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            entry = self._live(name)
+            value = int(entry[0]) + amount if entry else amount
+            self._data[name] = (self._encode(value), entry[1] if entry else None)
+            return value
+
+    def delete(self, *names):
+        with self._lock:
+            return sum(1 for name in names if self._data.pop(name, None) is not None)
+
+    def exists(self, *names):
+        with self._lock:
+            return sum(1 for name in names if self._live(name))
+
+    # Conjuntos ordenados: membro -> score, sem expiração
+    def zadd(self, name, mapping):
+        with self._lock:
+            zset = self._zsets.setdefault(name, {})
+            added = sum(1 for member in mapping if self._encode(member) not in zset)
+            zset.update({self._encode(member): float(score) for member, score in mapping.items()})
+            return added
+
+    def zrangebyscore(self, name, min, max, withscores=False):
+        low, high = float(min), float(max)
+        with self._lock:
+            items = sorted((score, member) for member, score in self._zsets.get(name, {}).items()
+                           if low <= score <= high)
+        return [(member, score) for score, member in items] if withscores else [member for _, member in items]
+
+    def zremrangebyscore(self, name, min, max):
+        low, high = float(min), float(max)
+        with self._lock:
+            zset = self._zsets.get(name, {})
+            removed = [member for member, score in zset.items() if low <= score <= high]
+            for member in removed:
+                del zset[member]
+            return len(removed)
+
+    def flushdb(self):
+        with self._lock:
+            self._data.clear()
+            self._zsets.clear()
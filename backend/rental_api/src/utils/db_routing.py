@@ -0,0 +1,146 @@
+"""Leituras em réplicas com read-your-writes por tenant.
+
+Com DATABASE_REPLICA_URLS (URLs separadas por vírgula) cada réplica vira um
+bind do Flask-SQLAlchemy (replica_0, replica_1, ...) e as requisições GET/HEAD
+dos blueprints de DB_REPLICA_BLUEPRINTS (rental e tenant) leem de uma delas,
+em rodízio. Todo o resto vai ao primário:
+
+- outros métodos, outros blueprints e código fora de requisição;
+- qualquer escrita (flush) e, na mesma requisição, as leituras depois dela;
+- o tenant que escreveu nos últimos DB_REPLICA_STICKY_SECONDS segundos, para
+  que ele veja as próprias alterações enquanto a réplica não as recebeu. A
+  marca fica em Redis com DB_REPLICA_STICKY_BACKEND='redis' (vale para todos
+  os workers) ou na memória do worker com 'local';
+- réplicas que a última sondagem de saúde (src/services/health.py) achou
+  fora do ar.
+
+A rota é decidida na primeira consulta depois da verificação do JWT, quando
+o tenant já é conhecido, e vai no cabeçalho X-DB-Route.
+"""
+import itertools
+import logging
+import math
+import threading
+
+from flask import g, has_request_context, request
+from flask_jwt_extended import get_jwt
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+REPLICA_PREFIX = 'replica_'
+
+
+class ReplicaRouter:
+    def __init__(self):
+        self.replicas = []
+        self.blueprints = ('rental', 'tenant')
+        self.sticky_seconds = 5
+        self.store = None
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.replicas = sorted(key for key in app.config.get('SQLALCHEMY_BINDS') or {}
+                               if key.startswith(REPLICA_PREFIX))
+        self.blueprints = tuple(app.config.get('DB_REPLICA_BLUEPRINTS', self.blueprints))
+        self.sticky_seconds = app.config.get('DB_REPLICA_STICKY_SECONDS', self.sticky_seconds)
+        self.store = None
+        if not self.replicas:
+            return
+        if app.config.get('DB_REPLICA_STICKY_BACKEND', 'local') == 'redis':
+            import redis
+            self.store = redis.Redis.from_url(app.config['REDIS_URL'], socket_timeout=1)
+        else:
+            from src.utils.cache import LocalRedis
+            self.store = LocalRedis()
+        app.after_request(_add_route_header)
+
+    # ----- Read-your-writes -----
+
+    def mark_write(self, tenant_id):
+        try:
+            self.store.set(f'db:sticky:{tenant_id}', 1, ex=max(1, math.ceil(self.sticky_seconds)))
+        except Exception as e:
+            logger.warning('Falha ao marcar escrita do tenant %s: %s', tenant_id, e)
+
+    def is_sticky(self, tenant_id):
+        try:
+            return bool(self.store.exists(f'db:sticky:{tenant_id}'))
+        except Exception as e:
+            # Sem como saber se o tenant escreveu há pouco: lê do primário
+            logger.warning('Falha ao consultar escrita recente do tenant %s: %s', tenant_id, e)
+            return True
+
+    # ----- Escolha da réplica -----
+
+    def pick(self):
+        from src.services.health import prober
+
+        healthy = [key for key in self.replicas if prober.replica_ok(key)]
+        if not healthy:
+            return None
+        with self._lock:
+            turn = next(self._turn)
+        return healthy[turn % len(healthy)]
+
+    def route(self):
+        """Bind de réplica para a requisição atual, ou None para o primário."""
+        if 'db_route' in g:
+            return g.db_route
+        if request.method not in ('GET', 'HEAD') or request.blueprint not in self.blueprints:
+            g.db_route = None
+            return None
+        try:
+            tenant_id = get_jwt().get('tenant_id')
+        except RuntimeError:
+            # JWT ainda não verificado (consultas do próprio flask_jwt_extended)
+            return None
+        g.db_route = None if tenant_id is None or self.is_sticky(tenant_id) else self.pick()
+        return g.db_route
+
+
+router = ReplicaRouter()
+
+
+def use_primary():
+    """Manda ao primário o resto da requisição; True se ela estava lendo de uma réplica.
+
+    Para leituras cuja ausência na réplica pode ser só atraso da replicação.
+    """
+    if not has_request_context() or not g.get('db_route'):
+        return False
+    g.db_route = None
+    return True
+
+
+class RoutingSession(Session):
+    """Session que manda as leituras elegíveis da requisição para uma réplica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and router.replicas and not self._flushing and has_request_context() \
+                and not g.get('db_wrote') and not getattr(clause, 'is_dml', False):
+            key = router.route()
+            if key is not None:
+                return self._db.engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _remember_write(session, flush_context):
+    if not router.replicas or not has_request_context() or g.get('db_wrote'):
+        return
+    g.db_wrote = True
+    try:
+        tenant_id = get_jwt().get('tenant_id')
+    except RuntimeError:
+        return
+    if tenant_id is not None:
+        router.mark_write(tenant_id)
+
+
+def _add_route_header(response):
+    route = g.get('db_route')
+    response.headers['X-DB-Route'] = route if route and not g.get('db_wrote') else 'primary'
+    return response
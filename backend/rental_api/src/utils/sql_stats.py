@@ -0,0 +1,136 @@
+"""Consultas SQL por requisição e detecção de N+1.
+
+Cada requisição recebe o cabeçalho X-Query-Count com o número de comandos
+enviados ao banco, para acompanhar endpoints sensíveis como o dashboard.
+Também são medidos o tempo gasto no banco e quantas vezes cada comando se
+repetiu, agrupando comandos que só diferem nos valores (fingerprint).
+
+- Fora de produção (SQL_SERVER_TIMING) a resposta leva o cabeçalho
+  Server-Timing com o tempo no banco e o total, visível no DevTools.
+- Um fingerprint executado mais de SQL_REPEAT_THRESHOLD vezes na mesma
+  requisição gera um aviso no log: quase sempre é um N+1 (uma consulta por
+  linha de uma listagem).
+
+capture() registra as consultas de um trecho de código, para testes que
+verificam o número de consultas de uma rota.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPEAT_THRESHOLD = 5
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%\(\w+\)s|%s")
+_PARAMETER_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+_captures = []
+_captures_lock = threading.Lock()
+
+
+def fingerprint(statement):
+    """Comando sem valores: literais, parâmetros e listas IN (?, ?, ...) viram '?'."""
+    statement = _LITERALS.sub('?', statement)
+    statement = _SPACES.sub(' ', statement).strip()
+    return _PARAMETER_LISTS.sub('(?)', statement)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        g.sql_query_count = g.get('sql_query_count', 0) + 1
+        # Agrupado pelo texto exato; o fingerprint só é calculado no fim
+        statements = g.get('sql_statements')
+        if statements is None:
+            statements = g.sql_statements = Counter()
+        statements[statement] += 1
+    if _captures:
+        with _captures_lock:
+            for captured in _captures:
+                captured.append(statement)
+    if context is not None:
+        context.sql_stats_started = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _time_query(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, 'sql_stats_started', None)
+    if started is not None and has_request_context():
+        g.sql_time = g.get('sql_time', 0.0) + time.perf_counter() - started
+
+
+def get_query_count():
+    """Retorna quantas consultas a requisição atual executou até agora."""
+    return g.get('sql_query_count', 0) if has_request_context() else 0
+
+
+def get_query_time():
+    """Segundos gastos no banco pela requisição atual até agora."""
+    return g.get('sql_time', 0.0) if has_request_context() else 0.0
+
+
+def repeated_statements(statements, threshold):
+    """[(fingerprint, execuções)] dos comandos executados mais de threshold vezes."""
+    counts = Counter()
+    for statement, count in statements.items():
+        counts[fingerprint(statement)] += count
+    return [(key, count) for key, count in counts.most_common() if count > threshold]
+
+
+class CapturedQueries(list):
+    """Comandos executados dentro de capture(), na ordem."""
+
+    @property
+    def count(self):
+        return len(self)
+
+    def repeated(self, threshold=DEFAULT_REPEAT_THRESHOLD):
+        return repeated_statements(Counter(self), threshold)
+
+
+@contextmanager
+def capture():
+    """Registra os comandos SQL executados no bloco (em qualquer thread)."""
+    captured = CapturedQueries()
+    with _captures_lock:
+        _captures.append(captured)
+    try:
+        yield captured
+    finally:
+        with _captures_lock:
+            _captures.remove(captured)
+
+
+def init_app(app):
+    server_timing = app.config.get('SQL_SERVER_TIMING', False)
+    threshold = app.config.get('SQL_REPEAT_THRESHOLD', DEFAULT_REPEAT_THRESHOLD)
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def add_query_count_header(response):
+        response.headers['X-Query-Count'] = str(get_query_count())
+        if server_timing and 'request_started' in g:
+            total = (time.perf_counter() - g.request_started) * 1000
+            response.headers['Server-Timing'] = (
+                f'db;dur={get_query_time() * 1000:.1f};desc="{get_query_count()} queries", '
+                f'app;dur={total:.1f}'
+            )
+
+        statements = g.get('sql_statements')
+        if threshold and statements and get_query_count() > threshold:
+            for key, count in repeated_statements(statements, threshold):
+                logger.warning('Possível N+1 em %s %s: %d execuções de %s',
+                               request.method, request.path, count, key[:300])
+        return response
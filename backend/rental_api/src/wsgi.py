@@ -0,0 +1,15 @@
+"""Ponto de entrada WSGI para servidores de produção (gunicorn, uwsgi).
+
+    gunicorn --config gunicorn.conf.py src.wsgi:app
+
+Usa a configuração de produção por padrão (sem debugger nem reloader);
+FLASK_ENV pode escolher outra.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main import create_app
+
+app = create_app(os.environ.get('FLASK_ENV', 'production'))
@@ -1,14 +1,27 @@
 // Configuração da API
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000/api';
 
+// Host da página como tenant (subdomínio ou domínio próprio); localhost e IPs
+// não identificam tenant nenhum
+function tenantHost() {
+  const host = window.location.hostname;
+  if (host === 'localhost' || host.includes(':') || /^\d{1,3}(\.\d{1,3}){3}$/.test(host)) {
+    return undefined;
+  }
+  return host;
+}
+
 class ApiClient {
   constructor() {
     this.baseURL = API_BASE_URL;
     this.token = localStorage.getItem('access_token');
+    // Respostas GET com ETag, reaproveitadas quando o servidor responde 304
+    this.validated = new Map();
   }
 
   setToken(token) {
     this.token = token;
+    this.validated.clear();
     if (token) {
       localStorage.setItem('access_token', token);
     } else {
@@ -28,10 +41,19 @@ class ApiClient {
     return headers;
   }
 
+  getConditionalHeaders(url, options) {
+    const headers = this.getHeaders();
+    const cached = this.validated.get(url);
+    if (cached && (options.method || 'GET') === 'GET') {
+      headers['If-None-Match'] = cached.etag;
+    }
+    return headers;
+  }
+
   async request(endpoint, options = {}) {
     const url = `${this.baseURL}${endpoint}`;
     const config = {
-      headers: this.getHeaders(),
+      headers: this.getConditionalHeaders(url, options),
       ...options,
     };
 
@@ -43,9 +65,9 @@ class ApiClient {
         const refreshed = await this.refreshToken();
         if (refreshed) {
           // Tentar novamente com o novo token
-          config.headers = this.getHeaders();
+          config.headers = this.getConditionalHeaders(url, options);
           const retryResponse = await fetch(url, config);
-          return await this.handleResponse(retryResponse);
+          return await this.handleResponse(retryResponse, url);
         } else {
           // Falha na renovação, redirecionar para login
           this.logout();
@@ -53,20 +75,29 @@ class ApiClient {
         }
       }
 
-      return await this.handleResponse(response);
+      return await this.handleResponse(response, url);
     } catch (error) {
       console.error('API Error:', error);
       throw error;
     }
   }
 
-  async handleResponse(response) {
+  async handleResponse(response, url) {
+    if (response.status === 304 && this.validated.has(url)) {
+      return this.validated.get(url).data;
+    }
+
     const data = await response.json();
     
     if (!response.ok) {
       throw new Error(data.error || 'Erro na requisição');
     }
 
+    const etag = response.headers.get('ETag');
+    if (etag) {
+      this.validated.set(url, { etag, data });
+    }
+
     return data;
   }
 
@@ -96,6 +127,18 @@ class ApiClient {
   }
 
   logout() {
+    // Revoga os tokens de acesso e de refresh no servidor, sem aguardar
+    const refreshToken = localStorage.getItem('refresh_token');
+    for (const token of [this.token, refreshToken]) {
+      if (token) {
+        fetch(`${this.baseURL}/auth/logout`, {
+          method: 'POST',
+          headers: { Authorization: `Bearer ${token}` },
+          keepalive: true,
+        }).catch(() => {});
+      }
+    }
+
     this.setToken(null);
     localStorage.removeItem('refresh_token');
     localStorage.removeItem('user');
@@ -105,9 +148,10 @@ class ApiClient {
 
   // Métodos de autenticação
   async login(email, password) {
+    // O host do SPA (subdomínio ou domínio próprio) identifica o tenant
     const response = await this.request('/auth/login', {
       method: 'POST',
-      body: JSON.stringify({ email, password }),
+      body: JSON.stringify({ email, password, tenant: tenantHost() }),
     });
 
     if (response.access_token) {
@@ -8,8 +8,7 @@ import {
   Eye,
   Package,
   DollarSign,
-  Clock,
-  AlertCircle
+  Clock
 } from 'lucide-react';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
@@ -71,7 +70,6 @@ const Items = () => {
     weekly_price: '',
     monthly_price: '',
     total_quantity: 1,
-    available_quantity: 1,
     min_rental_hours: 1,
     max_rental_days: '',
     requires_deposit: false,
@@ -149,7 +147,6 @@ const Items = () => {
       weekly_price: '',
       monthly_price: '',
       total_quantity: 1,
-      available_quantity: 1,
       min_rental_hours: 1,
       max_rental_days: '',
       requires_deposit: false,
@@ -171,7 +168,6 @@ const Items = () => {
       weekly_price: item.weekly_price || '',
       monthly_price: item.monthly_price || '',
       total_quantity: item.total_quantity || 1,
-      available_quantity: item.available_quantity || 1,
       min_rental_hours: item.min_rental_hours || 1,
       max_rental_days: item.max_rental_days || '',
       requires_deposit: item.requires_deposit || false,
@@ -331,7 +327,7 @@ const Items = () => {
                   </div>
                 </div>
 
-                <div className="grid grid-cols-3 gap-4">
+                <div className="grid grid-cols-2 gap-4">
                   <div className="space-y-2">
                     <Label htmlFor="total_quantity">Quantidade Total</Label>
                     <Input
@@ -341,15 +337,6 @@ const Items = () => {
                       onChange={(e) => setFormData({...formData, total_quantity: parseInt(e.target.value)})}
                     />
                   </div>
-                  <div className="space-y-2">
-                    <Label htmlFor="available_quantity">Quantidade Disponível</Label>
-                    <Input
-                      id="available_quantity"
-                      type="number"
-                      value={formData.available_quantity}
-                      onChange={(e) => setFormData({...formData, available_quantity: parseInt(e.target.value)})}
-                    />
-                  </div>
                   <div className="space-y-2">
                     <Label htmlFor="min_rental_hours">Mín. Horas Locação</Label>
                     <Input
@@ -517,15 +504,9 @@ const Items = () => {
                     </TableCell>
                     <TableCell>
                       <div className="text-sm">
-                        <span className="font-medium">{item.available_quantity}</span>
-                        <span className="text-gray-500">/{item.total_quantity}</span>
+                        <span className="font-medium">{item.total_quantity}</span>
+                        <span className="text-gray-500"> un.</span>
                       </div>
-                      {item.available_quantity === 0 && (
-                        <div className="flex items-center text-red-600 text-xs mt-1">
-                          <AlertCircle className="h-3 w-3 mr-1" />
-                          Esgotado
-                        </div>
-                      )}
                     </TableCell>
                     <TableCell>
                       {getStatusBadge(item.status, item.is_active)}
@@ -256,9 +256,9 @@ const Reservations = () => {
                           <SelectValue placeholder="Selecione um item" />
                         </SelectTrigger>
                         <SelectContent>
-                          {items.filter(item => item.is_active && item.available_quantity > 0).map((item) => (
+                          {items.filter(item => item.is_active).map((item) => (
                             <SelectItem key={item.id} value={item.id.toString()}>
-                              {item.name} - Disponível: {item.available_quantity}
+                              {item.name} - Estoque: {item.total_quantity}
                             </SelectItem>
                           ))}
                         </SelectContent>
@@ -83,6 +83,1114 @@ class RentalSaaSTester:
             self.log_test("Database Creation", False, str(e))
             return False
     
+    def create_in_process_client(self):
+        """Create an in-memory app and register a tenant; returns (app, client, headers, tenant_id)."""
+        from src.main import create_app
+        
+        app = create_app('testing')
+        client = app.test_client()
+        response = client.post('/api/auth/register', json={
+            "username": "inprocess",
+            "email": "inprocess@example.com",
+            "password": "TestPassword123!",
+            "tenant_name": "In-Process Company",
+            "subdomain": "inprocess"
+        })
+        data = response.get_json()
+        headers = {'Authorization': f"Bearer {data['access_token']}"}
+        return app, client, headers, data['tenant']['id']
+    
+    def seed_reservations(self, app, tenant_id, count, start_date):
+        """Insert `count` reservations, each with its own item and customer."""
+        from src.models.user import db
+        from src.models.rental import RentalItem, Customer, Reservation
+        
+        with app.app_context():
+            offset = Reservation.query.count()
+            for number in range(offset, offset + count):
+                item = RentalItem(tenant_id=tenant_id, name=f"Item {number}", daily_price=10)
+                customer = Customer(tenant_id=tenant_id, first_name="Customer", last_name=str(number),
+                                    email=f"customer{number}@example.com")
+                db.session.add_all([item, customer])
+                db.session.flush()
+                db.session.add(Reservation(
+                    tenant_id=tenant_id, item_id=item.id, customer_id=customer.id,
+                    reservation_code=f"RES-T{number:06d}",
+                    start_date=start_date, end_date=start_date + timedelta(days=1),
+                    unit_price=10, total_price=10, final_amount=10
+                ))
+            db.session.commit()
+    
+    def assert_query_budget(self, client, url, budget, headers=None):
+        """GET `url` and raise AssertionError if it runs more than `budget` SQL statements."""
+        from src.utils import sql_stats
+        
+        with sql_stats.capture() as queries:
+            response = client.get(url, headers=headers)
+        assert response.status_code == 200, f"{url}: HTTP {response.status_code}"
+        repeated = "; ".join(f"{count}x {statement[:80]}" for statement, count in queries.repeated(1))
+        assert queries.count <= budget, f"{url}: {queries.count} queries (budget {budget}). Repeated: {repeated}"
+        return queries.count
+    
+    def test_calendar_query_count(self):
+        """Test that the calendar runs a constant number of queries regardless of event volume."""
+        try:
+            app, client, headers, tenant_id = self.create_in_process_client()
+            start_date = datetime(2030, 1, 10)
+            url = "/api/rental/calendar?start_date=2030-01-01T00:00:00&end_date=2030-02-01T00:00:00"
+            
+            counts = []
+            for batch in (5, 200):
+                self.seed_reservations(app, tenant_id, batch, start_date)
+                response = client.get(url, headers=headers)
+                if response.status_code != 200:
+                    self.log_test("Calendar Query Count", False, f"HTTP {response.status_code}: {response.get_data(as_text=True)}")
+                    return False
+                counts.append((len(response.get_json()['events']), int(response.headers['X-Query-Count'])))
+            
+            (small_events, small_queries), (large_events, large_queries) = counts
+            if small_queries == large_queries:
+                self.log_test("Calendar Query Count", True,
+                              f"{small_queries} queries for {small_events} and {large_events} events")
+                return True
+            self.log_test("Calendar Query Count", False,
+                          f"{small_queries} queries for {small_events} events, {large_queries} for {large_events}")
+            return False
+            
+        except Exception as e:
+            self.log_test("Calendar Query Count", False, str(e))
+            return False
+
+    def test_reservation_quantity(self):
+        """Test that reservations need a positive integer quantity and never oversell the item."""
+        try:
+            app, client, headers, tenant_id = self.create_in_process_client()
+            item = client.post('/api/rental/items', json={"name": "Mixer", "daily_price": 10, "total_quantity": 2},
+                               headers=headers).get_json()['item']
+            customer = client.post('/api/rental/customers', json={
+                "first_name": "Quantity", "last_name": "Test", "email": "quantity@example.com"
+            }, headers=headers).get_json()['customer']
+            start_date = datetime(2030, 1, 10)
+
+            def book(quantity):
+                return client.post('/api/rental/reservations', json={
+                    "item_id": item['id'], "customer_id": customer['id'], "quantity": quantity,
+                    "start_date": start_date.isoformat(), "end_date": (start_date + timedelta(days=2)).isoformat()
+                }, headers=headers).status_code
+
+            invalid = {quantity: book(quantity) for quantity in (-3, "2", 1.5, True)}
+            valid = [book(2), book(1)]
+            if set(invalid.values()) != {400} or valid != [201, 400]:
+                self.log_test("Reservation Quantity", False, f"Invalid {invalid}, then {valid}")
+                return False
+
+            self.log_test("Reservation Quantity", True, "Non-positive and non-integer quantities rejected")
+            return True
+
+        except Exception as e:
+            self.log_test("Reservation Quantity", False, str(e))
+            return False
+
+    def test_availability_index(self):
+        """Test that a reservation moved to another item leaves the old item's availability index."""
+        try:
+            from src.models.user import db
+            from src.models.rental import Reservation
+
+            app, client, headers, tenant_id = self.create_in_process_client()
+            items = [client.post('/api/rental/items', json={"name": name, "daily_price": 10, "total_quantity": 1},
+                                 headers=headers).get_json()['item'] for name in ('Tent', 'Canopy')]
+            customer = client.post('/api/rental/customers', json={
+                "first_name": "Index", "last_name": "Test", "email": "index@example.com"
+            }, headers=headers).get_json()['customer']
+            period = {"start_date": "2030-03-01T00:00:00", "end_date": "2030-03-03T00:00:00"}
+            created = client.post('/api/rental/reservations', json={
+                "item_id": items[0]['id'], "customer_id": customer['id'], "quantity": 1, **period
+            }, headers=headers).get_json()['reservation']
+
+            def free():
+                # Carrega (ou lê do cache) o índice de cada item
+                return [client.get(f"/api/rental/items/{item['id']}/availability", query_string=period,
+                                   headers=headers).get_json()['available_quantity'] for item in items]
+
+            before = free()
+            with app.app_context():
+                db.session.get(Reservation, created['id']).item_id = items[1]['id']
+                db.session.commit()
+            after = free()
+            if before != [0, 1] or after != [1, 0]:
+                self.log_test("Availability Index", False, f"Free units before {before}, after the move {after}")
+                return False
+            if 'available_quantity' in items[0]:
+                self.log_test("Availability Index", False, "Items still expose a stored available_quantity")
+                return False
+
+            self.log_test("Availability Index", True, "Moved reservation leaves the old item's index")
+            return True
+
+        except Exception as e:
+            self.log_test("Availability Index", False, str(e))
+            return False
+
+    def test_cursor_pagination(self):
+        """Test that tampered keyset cursors get a 400 and the cached totals stay bounded."""
+        try:
+            from src.services import pagination
+
+            app, client, headers, tenant_id = self.create_in_process_client()
+            statuses = [
+                client.get(path, query_string={'cursor': pagination.encode_cursor(values)}, headers=headers).status_code
+                for path, values in (('/api/rental/items', ["x"]), ('/api/rental/items', [True]),
+                                     ('/api/rental/customers', [1.5]),
+                                     ('/api/rental/reservations', ["2030-01-01T00:00:00", "7"]))
+            ]
+            if set(statuses) != {400}:
+                self.log_test("Cursor Pagination", False, f"Tampered cursors returned {statuses}")
+                return False
+
+            cache = pagination._total_cache
+            for key in range(pagination.TOTAL_CACHE_SIZE + 10):
+                cache.set(('bound-check', key), key)
+            if len(cache._data) > pagination.TOTAL_CACHE_SIZE or cache.get(('bound-check', 0)) is not None:
+                self.log_test("Cursor Pagination", False, "Totals cache is not a bounded LRU")
+                return False
+
+            self.log_test("Cursor Pagination", True, "Tampered cursors rejected, totals cache bounded")
+            return True
+
+        except Exception as e:
+            self.log_test("Cursor Pagination", False, str(e))
+            return False
+
+    def test_search_index(self):
+        """Test prefix search ranking and that the search index follows updates."""
+        try:
+            app, client, headers, tenant_id = self.create_in_process_client()
+            for name, description in [("Mesa redonda", "Acompanha 8 cadeiras"),
+                                      ("Cadeira Tiffany", "Cadeira de acrílico")]:
+                client.post('/api/rental/items', json={"name": name, "description": description,
+                                                       "daily_price": 10}, headers=headers)
+
+            def names(term):
+                response = client.get(f"/api/rental/items?search={term}", headers=headers)
+                return [item['name'] for item in response.get_json()['items']]
+
+            if names("cad") != ["Cadeira Tiffany", "Mesa redonda"]:
+                self.log_test("Search Index", False, f"Unexpected ranking for 'cad': {names('cad')}")
+                return False
+
+            item_id = client.get("/api/rental/items?search=tiffany", headers=headers).get_json()['items'][0]['id']
+            client.put(f"/api/rental/items/{item_id}", json={"name": "Banqueta alta"}, headers=headers)
+            if names("tiffany") or names("banq") != ["Banqueta alta"]:
+                self.log_test("Search Index", False, "Index not updated after rename")
+                return False
+
+            # Banco sem a tabela FTS (create_all anterior à busca): volta ao LIKE por trecho
+            from src.models.user import db
+            from src.models.rental import RentalItem
+            app, client, headers, tenant_id = self.create_in_process_client()
+            with app.app_context():
+                for statement in ("DROP TRIGGER rental_items_fts_ai", "DROP TRIGGER rental_items_fts_ad",
+                                  "DROP TRIGGER rental_items_fts_au", "DROP TABLE rental_items_fts"):
+                    db.session.execute(db.text(statement))
+                db.session.commit()
+            client.post('/api/rental/items', json={"name": "Furadeira", "daily_price": 10}, headers=headers)
+            from src.services import search
+            recheck_ttl, search.INDEX_RECHECK_TTL = search.INDEX_RECHECK_TTL, 0
+            try:
+                response = client.get("/api/rental/items?search=adeira", headers=headers)
+                if response.status_code != 200 or [item['name'] for item in response.get_json()['items']] != ["Furadeira"]:
+                    self.log_test("Search Index", False, f"No fallback without FTS: HTTP {response.status_code}")
+                    return False
+
+                # Migração aplicada com o processo no ar: a busca passa a usar o FTS
+                with app.app_context():
+                    for statement in search.SPECS[RentalItem].sqlite_ddl():
+                        db.session.execute(db.text(statement))
+                    db.session.commit()
+                client.post('/api/rental/items', json={"name": "Parafusadeira", "daily_price": 10}, headers=headers)
+                if names("adeira") or names("parafus") != ["Parafusadeira"]:
+                    self.log_test("Search Index", False, "FTS created later not picked up after a negative check")
+                    return False
+            finally:
+                search.INDEX_RECHECK_TTL = recheck_ttl
+
+            self.log_test("Search Index", True, "Prefix search ranked and kept in sync, LIKE without FTS")
+            return True
+
+        except Exception as e:
+            self.log_test("Search Index", False, str(e))
+            return False
+
+    def test_lookup_cache(self):
+        """Test that cached tenant and category lookups are invalidated on commit."""
+        try:
+            app, client, headers, tenant_id = self.create_in_process_client()
+
+            client.get("/api/rental/categories", headers=headers)
+            client.post("/api/rental/categories", json={"name": "Tendas"}, headers=headers)
+            categories = client.get("/api/rental/categories", headers=headers).get_json()
+            if [category['name'] for category in categories] != ["Tendas"]:
+                self.log_test("Lookup Cache", False, f"Stale categories after create: {categories}")
+                return False
+
+            client.get("/api/tenants/settings", headers=headers)
+            client.put("/api/tenants/settings", json={"branding": {"primary_color": "#123456"}}, headers=headers)
+            settings = client.get("/api/tenants/settings", headers=headers).get_json()
+            if settings['branding']['primary_color'] != "#123456":
+                self.log_test("Lookup Cache", False, "Stale tenant settings after update")
+                return False
+
+            from sqlalchemy.orm.exc import UnmappedInstanceError
+            from src.models.user import db
+            from src.services import lookups
+            with app.app_context():
+                cached = lookups.get_tenant(tenant_id)
+                try:
+                    db.session.add(cached)
+                    self.log_test("Lookup Cache", False, "Cached tenant can be added to a session")
+                    return False
+                except UnmappedInstanceError:
+                    pass
+
+            client.get("/api/tenants/", headers=headers)
+            stats = client.get("/api/health/cache").get_json()['caches']
+            if stats['tenants']['hits'] < 1 or stats['categories']['misses'] < 2:
+                self.log_test("Lookup Cache", False, f"Unexpected counters: {stats}")
+                return False
+
+            self.log_test("Lookup Cache", True, f"Tenant cache: {stats['tenants']['hits']} hits, "
+                                                f"{stats['tenants']['misses']} misses")
+            return True
+
+        except Exception as e:
+            self.log_test("Lookup Cache", False, str(e))
+            return False
+
+    def test_response_cache(self):
+        """Test that cached GET responses are served until a commit bumps the tenant generation."""
+        try:
+            app, client, headers, tenant_id = self.create_in_process_client()
+            url = "/api/rental/items?per_page=5&page=1"
+
+            first = client.get(url, headers=headers)
+            second = client.get("/api/rental/items?page=1&per_page=5", headers=headers)
+            if (first.headers.get('X-Cache'), second.headers.get('X-Cache')) != ('MISS', 'HIT') \
+                    or first.get_data() != second.get_data():
+                self.log_test("Response Cache", False,
+                              f"Expected MISS then HIT, got {first.headers.get('X-Cache')}, {second.headers.get('X-Cache')}")
+                return False
+
+            client.post('/api/rental/items', json={"name": "Gerador", "daily_price": 50}, headers=headers)
+            third = client.get(url, headers=headers)
+            if third.headers.get('X-Cache') != 'MISS' or third.get_json()['pagination']['total'] != 1:
+                self.log_test("Response Cache", False, "Cached response served after a write")
+                return False
+
+            # Login grava last_login do usuário, que nenhuma rota em cache mostra
+            client.post('/api/auth/login', json={"email": "inprocess@example.com", "password": "TestPassword123!",
+                                                 "tenant": "inprocess"})
+            fourth = client.get(url, headers=headers)
+            if fourth.headers.get('X-Cache') != 'HIT':
+                self.log_test("Response Cache", False, "Login invalidated the tenant's cached responses")
+                return False
+
+            self.log_test("Response Cache", True, "Hit on repeat, invalidated by commit, kept across logins")
+            return True
+
+        except Exception as e:
+            self.log_test("Response Cache", False, str(e))
+            return False
+
+    def test_conditional_get(self):
+        """Test that read endpoints answer If-None-Match with 304 until the tenant data changes."""
+        try:
+            app, client, headers, tenant_id = self.create_in_process_client()
+
+            for url in ("/api/rental/items", "/api/rental/categories", "/api/rental/dashboard", "/api/tenants/"):
+                response = client.get(url, headers=headers)
+                etag = response.headers.get('ETag')
+                revalidated = client.get(url, headers={**headers, 'If-None-Match': etag})
+                if not etag or revalidated.status_code != 304 or revalidated.get_data():
+                    self.log_test("Conditional GET", False, f"{url}: expected 304, got {revalidated.status_code}")
+                    return False
+
+            client.post('/api/rental/categories', json={"name": "Som"}, headers=headers)
+            response = client.get("/api/rental/categories", headers={**headers, 'If-None-Match': etag})
+            if response.status_code != 200:
+                self.log_test("Conditional GET", False, "Stale validator accepted after a write")
+                return False
+
+            self.log_test("Conditional GET", True, "304 on matching ETag, 200 after a write")
+            return True
+
+        except Exception as e:
+            self.log_test("Conditional GET", False, str(e))
+            return False
+
+    def test_password_hashing(self):
+        """Test that login upgrades outdated password hashes and sheds load with 429 when saturated."""
+        try:
+            from werkzeug.security import generate_password_hash
+            from src.models.user import db, User
+            from src.services import passwords
+
+            app, client, headers, tenant_id = self.create_in_process_client()
+            credentials = {"email": "inprocess@example.com", "password": "TestPassword123!"}
+            with app.app_context():
+                user = User.query.filter_by(email=credentials['email']).first()
+                user.password_hash = generate_password_hash(credentials['password'], 'pbkdf2:sha256:1000')
+                db.session.commit()
+
+            response = client.post('/api/auth/login', json=credentials)
+            with app.app_context():
+                stored = User.query.filter_by(email=credentials['email']).first().password_hash
+            if response.status_code != 200 or passwords.hasher.needs_rehash(stored):
+                self.log_test("Password Hashing", False, f"Hash not upgraded on login: {stored.split('$')[0]}")
+                return False
+
+            # Subdomínio repetido é recusado antes de calcular o hash
+            hashed = []
+            hash_password = passwords.hasher.hash
+            passwords.hasher.hash = lambda password: hashed.append(1) or hash_password(password)
+            try:
+                duplicate = client.post('/api/auth/register', json={
+                    "username": "again", "email": "again@example.com", "password": "TestPassword123!",
+                    "tenant_name": "Again", "subdomain": "inprocess"
+                })
+            finally:
+                passwords.hasher.hash = hash_password
+            if duplicate.status_code != 400 or hashed:
+                self.log_test("Password Hashing", False, f"Duplicate subdomain: HTTP {duplicate.status_code}, "
+                                                         f"{len(hashed)} hashes")
+                return False
+
+            # Métodos curtos valem como os parâmetros que o werkzeug grava no hash
+            from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS
+            short = passwords.PasswordHasher()
+            current = {}
+            for method, stored_method in (('scrypt', 'scrypt:32768:8:1'),
+                                          ('pbkdf2', f'pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}'),
+                                          ('pbkdf2:sha256', f'pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}')):
+                short.method = method
+                current[method] = not short.needs_rehash(f'{stored_method}$salt$hash')
+            short.method = 'scrypt'
+            if not all(current.values()) or not short.needs_rehash('pbkdf2:sha256:1000$salt$hash'):
+                self.log_test("Password Hashing", False, f"Short methods matching stored hashes: {current}")
+                return False
+
+            app.config.update(PASSWORD_HASH_WORKERS=0, PASSWORD_HASH_QUEUE_DEPTH=0)
+            passwords.hasher.init_app(app)
+            try:
+                response = client.post('/api/auth/login', json=credentials)
+            finally:
+                app.config.from_object('src.config.TestingConfig')
+                passwords.hasher.init_app(app)
+            if response.status_code != 429 or 'Retry-After' not in response.headers:
+                self.log_test("Password Hashing", False, f"Expected 429 when saturated, got {response.status_code}")
+                return False
+
+            # Hash que estoura o timeout continua ocupando a vaga até terminar
+            import threading
+            release = threading.Event()
+            hasher = passwords.PasswordHasher()
+            hasher.workers, hasher.queue_depth, hasher.timeout = 1, 0, 0.05
+            try:
+                hasher._run(release.wait)
+            except passwords.HashingBusy:
+                pass
+            held = not hasher._slots.acquire(blocking=False)
+            if not held:
+                hasher._slots.release()
+            release.set()
+            hasher._executor.submit(lambda: None).result()  # fila de uma thread: o hash anterior terminou
+            freed = hasher._run(lambda: True)
+            hasher._executor.shutdown()
+            if not held or not freed:
+                self.log_test("Password Hashing", False, "Slot released before the timed-out hash finished")
+                return False
+
+            self.log_test("Password Hashing", True, "Outdated hash upgraded, saturation answered with 429")
+            return True
+
+        except Exception as e:
+            self.log_test("Password Hashing", False, str(e))
+            return False
+
+    def test_tenant_routed_login(self):
+        """Test that login resolves the tenant from the body or Host and checks at most one password hash."""
+        try:
+            from src.services import passwords
+
+            app, client, headers, tenant_id = self.create_in_process_client()
+            response = client.post('/api/auth/register', json={
+                "username": "second", "email": "inprocess@example.com", "password": "OtherPassword123!",
+                "tenant_name": "Second Company", "subdomain": "second"
+            })
+            second_id = response.get_json()['tenant']['id']
+            response = client.post('/api/auth/register', json={
+                "username": "solo", "email": "solo@example.com", "password": "TestPassword123!",
+                "tenant_name": "Solo Company", "subdomain": "solo"
+            })
+            solo_id = response.get_json()['tenant']['id']
+
+            verified = []
+            verify = passwords.hasher.verify
+            passwords.hasher.verify = lambda *args: verified.append(1) or verify(*args)
+            try:
+                def login(email, password, tenant=None, host=None):
+                    body = {"email": email, "password": password}
+                    if tenant:
+                        body['tenant'] = tenant
+                    del verified[:]
+                    response = client.post('/api/auth/login', json=body,
+                                           headers={'Host': host} if host else {})
+                    return response, len(verified)
+
+                # Sem tenant: só um email que existe em um único tenant entra
+                ambiguous = login("inprocess@example.com", "TestPassword123!")
+                unique = login("solo@example.com", "TestPassword123!")
+                # O SPA em localhost manda o próprio host como tenant: é ignorado
+                own_host = login("solo@example.com", "TestPassword123!", tenant="localhost", host="localhost:5000")
+                unknown_tenant = login("inprocess@example.com", "OtherPassword123!", tenant="missing",
+                                       host="second.rentalsaas.test")
+                wrong_password = login("inprocess@example.com", "WrongPassword123!", tenant="second")
+                by_body = login("inprocess@example.com", "TestPassword123!", tenant="inprocess")
+                by_host = login("inprocess@example.com", "OtherPassword123!", host="second.rentalsaas.test")
+            finally:
+                passwords.hasher.verify = verify
+
+            expected = {
+                'ambiguous': (401, 0), 'unique': (200, 1), 'own host': (200, 1), 'unknown tenant': (401, 0),
+                'wrong password': (401, 1), 'by body': (200, 1), 'by host': (200, 1),
+            }
+            actual = {
+                'ambiguous': ambiguous, 'unique': unique, 'own host': own_host, 'unknown tenant': unknown_tenant,
+                'wrong password': wrong_password, 'by body': by_body, 'by host': by_host,
+            }
+            actual = {name: (response.status_code, hashes) for name, (response, hashes) in actual.items()}
+            if actual != expected:
+                self.log_test("Tenant Routed Login", False, f"(status, hashes) {actual}")
+                return False
+            tenants = [response.get_json()['tenant']['id'] for response, _ in (unique, own_host, by_body, by_host)]
+            if tenants != [solo_id, solo_id, tenant_id, second_id]:
+                self.log_test("Tenant Routed Login", False, f"Logged into tenants {tenants}")
+                return False
+
+            self.log_test("Tenant Routed Login", True, "Tenant resolved from body and Host, one hash per login")
+            return True
+
+        except Exception as e:
+            self.log_test("Tenant Routed Login", False, str(e))
+            return False
+
+    def test_token_revocation(self):
+        """Test that logout revokes the access and refresh tokens it is called with."""
+        try:
+            app, client, headers, tenant_id = self.create_in_process_client()
+            login = client.post('/api/auth/login', json={"email": "inprocess@example.com",
+                                                         "password": "TestPassword123!"}).get_json()
+            access = {'Authorization': f"Bearer {login['access_token']}"}
+            refresh = {'Authorization': f"Bearer {login['refresh_token']}"}
+
+            if client.get('/api/auth/me', headers=access).status_code != 200:
+                self.log_test("Token Revocation", False, "Fresh token rejected")
+                return False
+
+            client.post('/api/auth/logout', headers=access)
+            client.post('/api/auth/logout', headers=refresh)
+            revoked_access = client.get('/api/auth/me', headers=access).status_code
+            revoked_refresh = client.post('/api/auth/refresh', headers=refresh).status_code
+            other_session = client.get('/api/auth/me', headers=headers).status_code
+
+            if (revoked_access, revoked_refresh, other_session) != (401, 401, 200):
+                self.log_test("Token Revocation", False,
+                              f"Got {revoked_access}/{revoked_refresh} for revoked tokens, {other_session} for another")
+                return False
+
+            self.log_test("Token Revocation", True, "Revoked tokens rejected, other sessions unaffected")
+            return True
+
+        except Exception as e:
+            self.log_test("Token Revocation", False, str(e))
+            return False
+
+    def test_rate_limit(self):
+        """Test that a tenant exhausting its request budget gets 429 without affecting other tenants."""
+        try:
+            from src.main import create_app
+            from src.services import rate_limit
+
+            app = create_app('testing')
+            app.config['RATE_LIMIT_ENABLED'] = True
+            rate_limit.limiter.init_app(app)
+            client = app.test_client()
+
+            tokens = {}
+            for subdomain in ('noisy', 'quiet'):
+                response = client.post('/api/auth/register', json={
+                    "username": subdomain, "email": f"{subdomain}@example.com", "password": "TestPassword123!",
+                    "tenant_name": f"{subdomain.title()} Company", "subdomain": subdomain
+                })
+                tokens[subdomain] = {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+            burst = rate_limit.PLANS['basic']['user'][1]
+            statuses = [client.get('/api/rental/items', headers=tokens['noisy']) for _ in range(burst + 10)]
+            limited = [response for response in statuses if response.status_code == 429]
+            quiet = client.get('/api/rental/items', headers=tokens['quiet'])
+
+            if not limited or not limited[0].headers.get('Retry-After'):
+                self.log_test("Rate Limit", False, f"{len(limited)} of {len(statuses)} requests limited")
+                return False
+            if quiet.status_code != 200 or quiet.headers.get('X-RateLimit-Limit') is None:
+                self.log_test("Rate Limit", False, f"Other tenant got {quiet.status_code}")
+                return False
+
+            # Atrás de proxy (PROXY_FIX_X_FOR) o balde anônimo é por cliente, não por proxy
+            from src.config import config, TestingConfig
+            config['proxy_test'] = type('ProxyTestConfig', (TestingConfig,), {'PROXY_FIX_X_FOR': 1})
+            proxied = create_app('proxy_test')
+            proxied.config['RATE_LIMIT_ENABLED'] = True
+            rate_limit.limiter.init_app(proxied)
+            proxied_client = proxied.test_client()
+            anonymous_burst = rate_limit.limiter.anonymous[1]
+            for _ in range(anonymous_burst + 1):
+                blocked = proxied_client.get('/api/auth/me', headers={'X-Forwarded-For': '203.0.113.1'})
+            other_client = proxied_client.get('/api/auth/me', headers={'X-Forwarded-For': '203.0.113.2'})
+            if blocked.status_code != 429 or other_client.status_code == 429:
+                self.log_test("Rate Limit", False, f"Anonymous behind proxy: {blocked.status_code}, "
+                                                   f"other client {other_client.status_code}")
+                return False
+
+            # Baldes por IP não crescem sem limite
+            bounded = rate_limit.RateLimiter()
+            bounded._buckets = bounded._new_buckets(100)
+            for number in range(1000):
+                bounded.take([(f'ip:198.51.{number // 256}.{number % 256}', 5, 20)])
+            if bounded._buckets.stats()['size'] > 100:
+                self.log_test("Rate Limit", False, f"{bounded._buckets.stats()['size']} buckets kept")
+                return False
+
+            # Usuário acima do próprio limite não gasta a cota do tenant, que os colegas dividem
+            rate_limit.limiter._buckets = rate_limit.limiter._new_buckets(10000)
+            client.post('/api/tenants/users', json={
+                "username": "coworker", "email": "coworker@noisy.example.com", "password": "TestPassword123!"
+            }, headers=tokens['noisy'])
+            response = client.post('/api/auth/login', json={
+                "email": "coworker@noisy.example.com", "password": "TestPassword123!", "tenant": "noisy"})
+            coworker_headers = {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+            for _ in range(rate_limit.PLANS['basic']['tenant'][1] * 2):
+                client.get('/api/rental/items', headers=tokens['noisy'])
+            coworker = client.get('/api/rental/items', headers=coworker_headers)
+            if coworker.status_code != 200:
+                self.log_test("Rate Limit", False, f"Coworker of a limited user got {coworker.status_code}")
+                return False
+
+            # Recusa pelo tenant devolve a ficha já tirada do balde do usuário
+            shared = rate_limit.RateLimiter()
+            try:
+                shared.take([('user:late', 1, 5), ('tenant:1', 1, 1)])
+                shared.take([('user:late', 1, 5), ('tenant:1', 1, 1)])
+            except rate_limit.RateLimited:
+                pass
+            late_tokens = shared._buckets.get('user:late').tokens
+            if late_tokens < 4:
+                self.log_test("Rate Limit", False, f"Refused user kept {late_tokens:.1f} of 4 tokens")
+                return False
+
+            # Plano (e com ele o limite) só muda pelo operador
+            null_limits = client.put('/api/tenants/settings', json={"limits": None}, headers=tokens['quiet'])
+            upgrade = client.put('/api/tenants/settings', json={"limits": {"plan": "enterprise"}},
+                                 headers=tokens['quiet'])
+            result = app.test_cli_runner().invoke(args=['plans', 'set', 'quiet', 'pro'])
+            plan = client.get('/api/tenants/', headers=tokens['quiet']).get_json()['plan']
+            if upgrade.status_code != 403 or result.exit_code or plan != 'pro' or null_limits.status_code != 400:
+                self.log_test("Rate Limit", False, f"Plan change: PUT {upgrade.status_code}, "
+                                                   f"CLI {result.output.strip()}, plan {plan}, "
+                                                   f"null limits {null_limits.status_code}")
+                return False
+
+            self.log_test("Rate Limit", True, f"{len(limited)} of {len(statuses)} requests limited, other tenant served")
+            return True
+
+        except Exception as e:
+            self.log_test("Rate Limit", False, str(e))
+            return False
+
+    def test_query_budgets(self):
+        """Test that list and dashboard routes stay within a fixed SQL query budget (no N+1)."""
+        try:
+            from src.services import response_cache
+
+            app, client, headers, tenant_id = self.create_in_process_client()
+            # Mede as rotas, não o cache de respostas
+            app.config['RESPONSE_CACHE_BACKEND'] = ''
+            response_cache.init_app(app)
+            client.post('/api/rental/categories', json={"name": "Mesas"}, headers=headers)
+            self.seed_reservations(app, tenant_id, 20, datetime(2030, 1, 10))
+
+            budgets = {
+                "/api/rental/items?expand=category": 3,
+                "/api/rental/reservations": 3,
+                "/api/rental/reservations?expand=item,customer,item.category": 3,
+                "/api/rental/customers": 3,
+                "/api/rental/calendar?start_date=2030-01-01T00:00:00&end_date=2030-02-01T00:00:00": 2,
+                "/api/rental/dashboard": 4,
+                "/api/rental/categories": 2,
+                "/api/tenants/users": 3,
+                "/api/auth/me": 2,
+            }
+            counts = [self.assert_query_budget(client, url, budget, headers) for url, budget in budgets.items()]
+
+            self.log_test("Query Budgets", True, f"{len(budgets)} routes within budget ({max(counts)} queries max)")
+            return True
+
+        except Exception as e:
+            self.log_test("Query Budgets", False, str(e))
+            return False
+
+    def test_metrics_endpoint(self):
+        """Test that /api/metrics exposes request histograms and per-tenant counters."""
+        try:
+            app, client, headers, tenant_id = self.create_in_process_client()
+            for _ in range(3):
+                client.get('/api/rental/items', headers=headers)
+            client.delete('/api/rental/calendar', headers=headers)
+
+            response = client.get('/api/metrics')
+            body = response.get_data(as_text=True)
+            expected = [
+                'rental_http_request_duration_seconds_count{endpoint="rental.get_items",method="GET",status="200"}',
+                'rental_http_request_duration_seconds_count{endpoint="unmatched",method="DELETE",status="405"}',
+                f'rental_tenant_requests_total{{tenant="{tenant_id}"}}',
+                'rental_db_pool_checked_out',
+            ]
+            missing = [line for line in expected if line not in body]
+            if response.status_code != 200 or missing:
+                self.log_test("Metrics Endpoint", False, f"HTTP {response.status_code}, missing {missing}")
+                return False
+
+            # Pool atualizado a cada checkout/checkin, sem depender de requisições
+            import tempfile
+            from src.config import config, TestingConfig
+            from src.main import create_app
+            from src.models.user import db
+            handle, path = tempfile.mkstemp(suffix='.db')
+            os.close(handle)
+            config['metrics_pool_test'] = type('MetricsPoolTestConfig', (TestingConfig,), {
+                'SQLALCHEMY_DATABASE_URI': f"sqlite:///{path}"
+            })
+            pooled = create_app('metrics_pool_test')
+
+            def checked_out():
+                from prometheus_client import REGISTRY
+                return REGISTRY.get_sample_value('rental_db_pool_checked_out')
+
+            with pooled.app_context():
+                held = [db.engine.connect() for _ in range(2)]
+                busy = checked_out()
+                for connection in held:
+                    connection.close()
+                idle = checked_out()
+            os.remove(path)
+            if busy != 2 or idle != 0:
+                self.log_test("Metrics Endpoint", False, f"Pool gauge: {busy} busy, {idle} idle")
+                return False
+
+            # Séries por tenant só com token quando ele é exigido (produção)
+            app.config['METRICS_REQUIRE_TOKEN'] = True
+            closed = client.get('/api/metrics')
+            app.config['METRICS_TOKEN'] = 'scrape-secret'
+            wrong = client.get('/api/metrics', headers={'Authorization': 'Bearer nope'})
+            scraped = client.get('/api/metrics', headers={'Authorization': 'Bearer scrape-secret'})
+            if (closed.status_code, wrong.status_code, scraped.status_code) != (403, 401, 200):
+                self.log_test("Metrics Endpoint", False, f"Token: {closed.status_code}, {wrong.status_code}, "
+                                                         f"{scraped.status_code}")
+                return False
+
+            self.log_test("Metrics Endpoint", True, "Latency, tenant and pool series exposed")
+            return True
+
+        except Exception as e:
+            self.log_test("Metrics Endpoint", False, str(e))
+            return False
+
+    def test_request_profiling(self):
+        """Test that admins can profile a request on demand and download it as speedscope JSON."""
+        try:
+            import tempfile
+            from src.main import create_app
+            from src.services import profiling
+
+            app = create_app('testing')
+            app.config.update(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=0, PROFILING_DIR=tempfile.mkdtemp())
+            profiling.profiler.init_app(app)
+            client = app.test_client()
+            data = client.post('/api/auth/register', json={
+                "username": "profiled", "email": "profiled@example.com", "password": "TestPassword123!",
+                "tenant_name": "Profiled Company", "subdomain": "profiled"
+            }).get_json()
+            headers = {'Authorization': f"Bearer {data['access_token']}"}
+
+            client.get('/api/rental/items', headers=headers)
+            client.get('/api/rental/dashboard', headers={**headers, 'X-Profile': '1'})
+            profiles = client.get('/api/profiles/', headers=headers).get_json()['profiles']
+            if [profile['endpoint'] for profile in profiles] != ['rental.get_dashboard']:
+                self.log_test("Request Profiling", False, f"Unexpected profiles: {profiles}")
+                return False
+
+            download = client.get(f"/api/profiles/{profiles[0]['name']}", headers=headers)
+            if download.status_code != 200 or 'speedscope' not in download.get_json()['$schema']:
+                self.log_test("Request Profiling", False, f"Download returned HTTP {download.status_code}")
+                return False
+
+            self.log_test("Request Profiling", True, "Only the requested dashboard call was profiled")
+            return True
+
+        except Exception as e:
+            self.log_test("Request Profiling", False, str(e))
+            return False
+
+    def test_lazy_startup(self):
+        """Test that importing src.main is cheap and production boot leaves the schema to migrations."""
+        try:
+            import subprocess
+            import tempfile
+
+            backend_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend', 'rental_api')
+            handle, path = tempfile.mkstemp(suffix='.db')
+            os.close(handle)
+            probe = (
+                "import sys; import src.main\n"
+                "eager = [m for m in ('flask_migrate', 'src.models.rental', 'src.routes.rental') if m in sys.modules]\n"
+                "print('eager:', eager, 'app' in vars(src.main))\n"
+                "from src.main import create_app, db\n"
+                "app = create_app('production')\n"
+                "with app.app_context(): print('tables:', db.inspect(db.engine).get_table_names())\n"
+            )
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}")
+            env.pop('SCHEMA_AUTO_CREATE', None)
+            result = subprocess.run([sys.executable, '-c', probe], cwd=backend_path, env=env,
+                                    capture_output=True, text=True, timeout=60)
+            os.remove(path)
+            if result.stdout.split() != ['eager:', '[]', 'False', 'tables:', '[]']:
+                self.log_test("Lazy Startup", False, result.stdout + result.stderr[-500:])
+                return False
+
+            self.log_test("Lazy Startup", True, "No models, blueprints or app at import; no DDL in production")
+            return True
+
+        except Exception as e:
+            self.log_test("Lazy Startup", False, str(e))
+            return False
+
+    def test_health_endpoints(self):
+        """Test that readiness is served from cached probes and turns 503 when the pool is exhausted."""
+        try:
+            import tempfile
+            from src.config import config, TestingConfig
+            from src.main import create_app
+            from src.models.user import db
+            from src.utils import sql_stats
+
+            handle, path = tempfile.mkstemp(suffix='.db')
+            os.close(handle)
+            # Banco em arquivo: o SQLite em memória não tem pool com limite
+            config['health_test'] = type('HealthTestConfig', (TestingConfig,), {
+                'SQLALCHEMY_DATABASE_URI': f"sqlite:///{path}", 'HEALTH_PROBE_INTERVAL': 60
+            })
+            app = create_app('health_test')
+            client = app.test_client()
+
+            live = client.get('/api/health/live')
+            ready = client.get('/api/health/ready')
+            if live.status_code != 200 or ready.status_code != 200 or ready.get_json()['status'] != 'ready':
+                self.log_test("Health Endpoints", False, f"live {live.status_code}, ready {ready.get_json()}")
+                return False
+
+            with sql_stats.capture() as queries:
+                for _ in range(50):
+                    client.get('/api/health/ready')
+                    client.get('/api/health')
+            if queries.count:
+                self.log_test("Health Endpoints", False, f"{queries.count} queries for 100 health checks")
+                return False
+
+            with app.app_context():
+                capacity = ready.get_json()['checks']['pool']['capacity']
+                connections = [db.engine.connect() for _ in range(capacity)]
+                exhausted = client.get('/api/health/ready')
+                for connection in connections:
+                    connection.close()
+                recovered = client.get('/api/health/ready')
+            if exhausted.status_code != 503 or 'pool' not in exhausted.get_json()['problems'] \
+                    or recovered.status_code != 200:
+                os.remove(path)
+                self.log_test("Health Endpoints", False,
+                              f"Exhausted pool: {exhausted.status_code}, released: {recovered.status_code}")
+                return False
+
+            # max_overflow=-1: o pool não tem limite, então não se esgota
+            config['health_unlimited_test'] = type('HealthUnlimitedTestConfig', (TestingConfig,), {
+                'SQLALCHEMY_DATABASE_URI': f"sqlite:///{path}", 'HEALTH_PROBE_INTERVAL': 60,
+                'SQLALCHEMY_ENGINE_OPTIONS': {'pool_size': 2, 'max_overflow': -1},
+            })
+            app = create_app('health_unlimited_test')
+            client = app.test_client()
+            with app.app_context():
+                connections = [db.engine.connect() for _ in range(4)]
+                unlimited = client.get('/api/health/ready')
+                for connection in connections:
+                    connection.close()
+            os.remove(path)
+            if unlimited.status_code != 200 or unlimited.get_json()['checks']['pool']['capacity'] is not None:
+                self.log_test("Health Endpoints", False,
+                              f"Unlimited overflow: {unlimited.status_code} {unlimited.get_json()['checks']['pool']}")
+                return False
+
+            self.log_test("Health Endpoints", True, f"No queries for 100 checks, 503 with {capacity} connections held")
+            return True
+
+        except Exception as e:
+            self.log_test("Health Endpoints", False, str(e))
+            return False
+
+    def test_read_replicas(self):
+        """Test that tenant GETs read from the replica and a tenant that just wrote reads from the primary."""
+        try:
+            import sqlite3
+            import tempfile
+            from src.config import config, TestingConfig
+            from src.main import create_app
+
+            paths = []
+            for _ in range(2):
+                handle, path = tempfile.mkstemp(suffix='.db')
+                os.close(handle)
+                paths.append(path)
+            primary, replica = paths
+            config['replica_test'] = type('ReplicaTestConfig', (TestingConfig,), {
+                'SQLALCHEMY_DATABASE_URI': f"sqlite:///{primary}",
+                'SQLALCHEMY_BINDS': {'replica_0': f"sqlite:///{replica}"},
+                'DB_REPLICA_STICKY_SECONDS': 1,
+                'RESPONSE_CACHE_BACKEND': '',
+            })
+            app = create_app('replica_test')
+            client = app.test_client()
+
+            tenants = {}
+            for name in ('alpha', 'beta'):
+                data = client.post('/api/auth/register', json={
+                    "username": name, "email": f"{name}@example.com", "password": "TestPassword123!",
+                    "tenant_name": f"{name.title()} Rentals", "subdomain": f"replica{name}"
+                }).get_json()
+                tenants[name] = {'Authorization': f"Bearer {data['access_token']}"}
+                client.post('/api/rental/items', json={"name": "Seeded", "daily_price": 10}, headers=tenants[name])
+
+            # "Replicação": a réplica recebe uma cópia do primário e depois fica para trás
+            with sqlite3.connect(primary) as source, sqlite3.connect(replica) as target:
+                source.backup(target)
+                # Linha de uso do alpha ainda não replicada
+                target.execute("DELETE FROM tenant_usage WHERE tenant_id = "
+                               "(SELECT id FROM tenants WHERE subdomain = 'replicaalpha')")
+            time.sleep(1.1)
+
+            def names(response):
+                return sorted(item['name'] for item in response.get_json()['items'])
+
+            routes = {
+                'other tenant': client.get('/api/rental/items', headers=tenants['beta']),
+                'tenant stats': client.get('/api/tenants/stats', headers=tenants['beta']),
+                'auth blueprint': client.get('/api/auth/me', headers=tenants['beta']),
+                'usage row missing on replica': client.get('/api/tenants/stats', headers=tenants['alpha']),
+            }
+            write = client.post('/api/rental/items', json={"name": "Fresh", "daily_price": 10},
+                                headers=tenants['alpha'])
+            routes['write'] = write
+            routes['after write'] = client.get('/api/rental/items', headers=tenants['alpha'])
+            routes['other tenant after write'] = client.get('/api/rental/items', headers=tenants['beta'])
+            time.sleep(1.1)
+            routes['window expired'] = client.get('/api/rental/items', headers=tenants['alpha'])
+            for path in paths:
+                os.remove(path)
+
+            expected = {
+                'other tenant': 'replica_0', 'tenant stats': 'replica_0', 'auth blueprint': 'primary',
+                'usage row missing on replica': 'primary',
+                'write': 'primary', 'after write': 'primary', 'other tenant after write': 'replica_0',
+                'window expired': 'replica_0',
+            }
+            actual = {name: response.headers.get('X-DB-Route') for name, response in routes.items()}
+            if actual != expected:
+                self.log_test("Read Replicas", False, f"Routes {actual}")
+                return False
+            stats = routes['usage row missing on replica'].get_json()
+            if routes['usage row missing on replica'].status_code != 200 or stats['items']['total'] != 1:
+                self.log_test("Read Replicas", False, f"Stats without replicated usage row: {stats}")
+                return False
+            # O primário tem o item novo; a réplica (cópia anterior) não
+            if names(routes['after write']) != ['Fresh', 'Seeded'] or names(routes['window expired']) != ['Seeded']:
+                self.log_test("Read Replicas", False, f"Primary {names(routes['after write'])}, "
+                                                      f"replica {names(routes['window expired'])}")
+                return False
+
+            self.log_test("Read Replicas", True, "GETs on the replica, read-your-writes for 1s after a write")
+            return True
+
+        except Exception as e:
+            self.log_test("Read Replicas", False, str(e))
+            return False
+
+    def test_usage_reads(self):
+        """Test that stats endpoints read a missing tenant_usage row from scratch without writing one."""
+        try:
+            from src.models.user import db
+            from src.models.tenant import TenantUsage
+            from src.utils import sql_stats
+
+            app, client, headers, tenant_id = self.create_in_process_client()
+            client.post('/api/rental/items', json={"name": "Counted", "daily_price": 10}, headers=headers)
+            with app.app_context():
+                db.session.query(TenantUsage).delete()
+                db.session.commit()
+
+            with sql_stats.capture() as queries:
+                dashboard = client.get('/api/rental/dashboard', headers=headers)
+                stats = client.get('/api/tenants/stats', headers=headers)
+            writes = [statement for statement in queries
+                      if statement.lstrip().split(None, 1)[0].upper() in ('INSERT', 'UPDATE', 'DELETE')]
+            with app.app_context():
+                rows = db.session.query(TenantUsage).count()
+            if dashboard.status_code != 200 or stats.status_code != 200 or writes or rows:
+                self.log_test("Usage Reads", False, f"HTTP {dashboard.status_code}/{stats.status_code}, "
+                                                    f"writes {writes}, rows {rows}")
+                return False
+            if dashboard.get_json()['stats']['total_items'] != 1 or stats.get_json()['items']['total'] != 1:
+                self.log_test("Usage Reads", False, f"Counters {dashboard.get_json()}")
+                return False
+
+            self.log_test("Usage Reads", True, "Counters computed without writing from GET")
+            return True
+
+        except Exception as e:
+            self.log_test("Usage Reads", False, str(e))
+            return False
+
+    def test_usage_counters(self):
+        """Test that usage deltas hit tenant_usage once at commit and match a recount."""
+        try:
+            from src.models.user import db
+            from src.models.rental import RentalItem
+            from src.services import usage
+            from src.utils import sql_stats
+
+            app, client, headers, tenant_id = self.create_in_process_client()
+            with app.app_context():
+                with sql_stats.capture() as flushed:
+                    unknown = RentalItem(tenant_id=tenant_id, name="Unknown", daily_price=10)
+                    db.session.add_all([RentalItem(tenant_id=tenant_id, name="Active", daily_price=10), unknown])
+                    db.session.flush()
+                    unknown.is_active = None
+                    db.session.flush()
+                with sql_stats.capture() as committed:
+                    db.session.commit()
+                drift = usage.reconcile(tenant_id, fix=False)
+                counts = usage.get_usage(tenant_id)
+                items, active = counts.items_count, counts.active_items_count
+
+            def usage_updates(statements):
+                return [s for s in statements if s.lstrip().upper().startswith('UPDATE TENANT_USAGE')]
+            if usage_updates(flushed) or len(usage_updates(committed)) != 1:
+                self.log_test("Usage Counters", False, f"{len(usage_updates(flushed))} updates on flush, "
+                                                       f"{len(usage_updates(committed))} on commit")
+                return False
+            if drift or (items, active) != (2, 1):
+                self.log_test("Usage Counters", False, f"Drift {drift}, items {items}, active {active}")
+                return False
+
+            self.log_test("Usage Counters", True, "One UPDATE per tenant at commit, NULL is_active not active")
+            return True
+
+        except Exception as e:
+            self.log_test("Usage Counters", False, str(e))
+            return False
+
+    def explain_plan(self, connection, statement, parameters):
+        """Return the query plan lines for a captured statement."""
+        if connection.dialect.name == 'postgresql':
+            rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).fetchall()
+        else:
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        return [str(row[-1]) for row in rows]
+
+    def test_query_plans(self):
+        """Test that the hot GET endpoints never fall back to full scans of the large tables."""
+        try:
+            from sqlalchemy import event
+            from src.models.user import db
+
+            app, client, headers, tenant_id = self.create_in_process_client()
+            self.seed_reservations(app, tenant_id, 50, datetime(2030, 1, 10))
+
+            urls = [
+                "/api/rental/items",
+                "/api/rental/items?limit=10",
+                "/api/rental/items?status=available&category_id=1",
+                "/api/rental/items/1",
+                "/api/rental/items/1/availability?start_date=2030-01-01T00:00:00&end_date=2030-02-01T00:00:00",
+                "/api/rental/customers",
+                "/api/rental/customers?limit=10",
+                "/api/rental/reservations",
+                "/api/rental/reservations?limit=10",
+                "/api/rental/reservations?status=pending",
+                "/api/rental/calendar?start_date=2030-01-01T00:00:00&end_date=2030-02-01T00:00:00",
+                "/api/rental/dashboard",
+                "/api/tenants/stats",
+                "/api/tenants/users?limit=10",
+            ]
+            large_tables = ('reservations', 'rental_items', 'customers', 'users')
+
+            with app.app_context():
+                engine = db.engine
+                statements = []
+
+                def capture(conn, cursor, statement, parameters, context, executemany):
+                    if statement.lstrip().upper().startswith('SELECT'):
+                        statements.append((statement, parameters))
+
+                failures = []
+                for url in urls:
+                    statements.clear()
+                    event.listen(engine, 'before_cursor_execute', capture)
+                    try:
+                        response = client.get(url, headers=headers)
+                    finally:
+                        event.remove(engine, 'before_cursor_execute', capture)
+                    if response.status_code != 200:
+                        failures.append(f"{url}: HTTP {response.status_code}")
+                        continue
+
+                    with engine.connect() as connection:
+                        for statement, parameters in statements:
+                            for line in self.explain_plan(connection, statement, parameters):
+                                if connection.dialect.name == 'postgresql':
+                                    full_scan = 'Seq Scan on' in line and any(f" {t} " in f"{line} " for t in large_tables)
+                                else:
+                                    full_scan = line.startswith('SCAN') and 'INDEX' not in line and \
+                                        line.split()[1] in large_tables
+                                if full_scan:
+                                    failures.append(f"{url}: {line.strip()}")
+
+            if failures:
+                self.log_test("Query Plans", False, "; ".join(failures))
+                return False
+            self.log_test("Query Plans", True, f"{len(urls)} endpoints use indexes on tenant tables")
+            return True
+
+        except Exception as e:
+            self.log_test("Query Plans", False, str(e))
+            return False
+
     def test_user_registration(self):
         """Test user and tenant registration."""
         try:
@@ -172,7 +1280,7 @@ class RentalSaaSTester:
             response = self.session.get(f"{self.base_url}/rental/categories")
             
             if response.status_code == 200:
-                categories = response.json().get('categories', [])
+                categories = response.json()
                 if len(categories) > 0:
                     self.log_test("Category Management", True, f"Created and retrieved {len(categories)} categories")
                     return True
@@ -196,7 +1304,7 @@ class RentalSaaSTester:
                 self.log_test("Item Management", False, "Could not get categories")
                 return False
             
-            categories = response.json().get('categories', [])
+            categories = response.json()
             if not categories:
                 self.log_test("Item Management", False, "No categories available")
                 return False
@@ -214,7 +1322,6 @@ class RentalSaaSTester:
                 "weekly_price": 300.00,
                 "monthly_price": 1000.00,
                 "total_quantity": 5,
-                "available_quantity": 5,
                 "is_active": True
             }
             
@@ -247,7 +1354,8 @@ class RentalSaaSTester:
         """Test customer creation and management."""
         try:
             customer_data = {
-                "full_name": "John Doe",
+                "first_name": "John",
+                "last_name": "Doe",
                 "email": "john.doe@example.com",
                 "phone": "+1234567890",
                 "address": "123 Main St, City, State",
@@ -403,6 +1511,27 @@ class RentalSaaSTester:
         # Backend tests (without server)
         self.test_backend_imports()
         self.test_database_creation()
+        self.test_calendar_query_count()
+        self.test_usage_reads()
+        self.test_usage_counters()
+        self.test_reservation_quantity()
+        self.test_availability_index()
+        self.test_cursor_pagination()
+        self.test_query_plans()
+        self.test_search_index()
+        self.test_lookup_cache()
+        self.test_response_cache()
+        self.test_conditional_get()
+        self.test_password_hashing()
+        self.test_tenant_routed_login()
+        self.test_token_revocation()
+        self.test_rate_limit()
+        self.test_query_budgets()
+        self.test_metrics_endpoint()
+        self.test_request_profiling()
+        self.test_lazy_startup()
+        self.test_health_endpoints()
+        self.test_read_replicas()
         
         # API tests (require running server)
         print("\n📡 Testing API Endpoints (requires running server)")